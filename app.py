@@ -1,40 +1,166 @@
 import json
 
-from flask import Flask, request, jsonify, make_response, Response, request
+from dotenv import load_dotenv
+
+# Load environment variables before the package reads its configuration
+load_dotenv()
+
+from flask import Blueprint, Flask, current_app, g, request, jsonify, make_response, Response, request, stream_with_context
 from flask_sqlalchemy import SQLAlchemy
-from movie_collection.db import db
+from werkzeug.middleware.proxy_fix import ProxyFix
+from movie_collection.db import USERS_DATABASE_URL, db
 from movie_collection.models.user_model import Users
 
 from movie_collection.models.movie_model import (
     Movie, 
-    find_movie_by_name,
-    find_movie_by_year,
-    find_movie_by_language,
-    find_movie_by_director,
-    find_movie_by_genre,
+    find_movies_by_names,
+    afind_movie_by_name,
+    afind_movie_by_year,
+    afind_movie_by_language,
+    afind_movie_by_director,
+    afind_movie_by_genre,
     add_movie_to_list,
     delete_movie_from_list,
+    delete_movies,
     clear_movie_list,
-    mark_movie_as_favorite,
-    list_favorite_movies
+    get_catalog_version,
+    get_movie_stats,
+    STATS_DIMENSIONS,
+    TMDB_BATCH_CONCURRENCY,
+    set_favorite,
+    set_favorites,
+    toggle_favorite,
+    toggle_favorites,
+    list_favorite_movies,
+    list_favorite_movie_rows,
+    random_movie_pool,
+    start_movie_pool
 )
 
-from movie_collection.utils.sql_utils import check_database_connection, check_table_exists
+from movie_collection.utils.concurrency_limiter import ConcurrencyLimiter, LimiterFullError
+from movie_collection.utils.event_loop import run_coroutine
+from movie_collection.utils.http_cache import conditional_get
+from movie_collection.utils.json_utils import dumps, json_response, rows_to_dicts
+from movie_collection.utils.maintenance import PURGE_INTERVAL_SECONDS, start_purge_scheduler
+from movie_collection.utils.rate_limiter import SlidingWindowLimiter
+from movie_collection.utils.session_utils import (
+    SESSION_TTL_SECONDS,
+    get_request_token,
+    issue_session_token,
+    login_required,
+    revoke_session_token,
+    verify_admin_token
+)
+from movie_collection.utils.readiness import ReadinessMonitor
+from movie_collection.utils.sql_utils import check_database_connection, check_pool_capacity, check_table_exists
+from movie_collection.utils.tmdb_client import TMDBUnavailableError, check_tmdb, tmdb_breaker, tmdb_flight
 
+from functools import partial, wraps
 import logging
-from dotenv import load_dotenv
-
-# Load environment variables
-load_dotenv()
+import math
+import os
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-app = Flask(__name__)
-app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite:///users.db'
-app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
-db.init_app(app)
+# Every route is registered on this blueprint; create_app() builds the application around it
+bp = Blueprint('api', __name__)
+
+def check_movies_database() -> None:
+    """
+    Check that the movies database answers and has the movies table.
+    """
+    check_database_connection()
+    check_table_exists("movies")
+
+# Dependency checks behind /api/ready, run in the background of each worker. Only the critical
+# ones decide readiness; TMDB is reported but not critical by default, so that a TMDB outage
+# does not take every worker out of rotation at once.
+readiness_monitor = ReadinessMonitor(
+    {'db_pool': check_pool_capacity, 'database': check_movies_database, 'tmdb': check_tmdb},
+    critical=[name for name in os.getenv('READY_CRITICAL_CHECKS', 'db_pool,database').split(',') if name],
+    interval=float(os.getenv('READY_CHECK_INTERVAL_SECONDS', '5'))
+)
+
+SEARCH_BATCH_MAX_NAMES = int(os.getenv('SEARCH_BATCH_MAX_NAMES', '1000'))
+
+# Each /movies/search-by-* route runs at most SEARCH_CONCURRENCY searches at once per worker;
+# up to SEARCH_QUEUE_SIZE more wait, each for at most SEARCH_QUEUE_TIMEOUT_SECONDS, and the
+# rest get a 503 at once
+search_limiters = {
+    route: ConcurrencyLimiter(
+        int(os.getenv('SEARCH_CONCURRENCY', '100')),
+        max_waiting=int(os.getenv('SEARCH_QUEUE_SIZE', '200')),
+        max_wait_seconds=float(os.getenv('SEARCH_QUEUE_TIMEOUT_SECONDS', '5'))
+    )
+    for route in ('name', 'year', 'language', 'director', 'genre')
+}
+
+def limit_concurrency(route: str):
+    """
+    Decorator for async search routes that must hold a slot of their limiter while they run.
+
+    The time spent waiting for the slot is reported in a Server-Timing header.
+    Requests that get no slot get a 503 response.
+
+    Args:
+        route (str): The key of the limiter in search_limiters.
+    """
+    def decorator(view):
+        @wraps(view)
+        async def wrapper(*args, **kwargs):
+            try:
+                async with search_limiters[route].slot() as waited:
+                    response = await view(*args, **kwargs)
+            except LimiterFullError as e:
+                logger.warning('Rejected request to %s: %s', request.path, str(e))
+                response = make_response(jsonify({'error': 'Too many searches in progress, try again later'}), 503)
+                response.headers['Retry-After'] = '1'
+                return response
+            response.headers['Server-Timing'] = f'queue;dur={waited * 1000:.1f}'
+            return response
+        return wrapper
+    return decorator
+
+
+CREATE_ACCOUNTS_MAX_BATCH = int(os.getenv('CREATE_ACCOUNTS_MAX_BATCH', '1000'))
+
+# Number of reverse proxies in front of the app whose X-Forwarded-For entries are trusted;
+# with 0, the client IP used for throttling is the address of the direct peer
+TRUSTED_PROXY_COUNT = int(os.getenv('TRUSTED_PROXY_COUNT', '0'))
+
+# Throttle credential checks per username and per client IP before any hashing or DB work;
+# a successful check clears the count of its username
+login_user_limiter = SlidingWindowLimiter(
+    int(os.getenv('LOGIN_USER_LIMIT', '5')),
+    float(os.getenv('LOGIN_USER_WINDOW_SECONDS', '60'))
+)
+login_ip_limiter = SlidingWindowLimiter(
+    int(os.getenv('LOGIN_IP_LIMIT', '30')),
+    float(os.getenv('LOGIN_IP_WINDOW_SECONDS', '60'))
+)
+
+def throttle_credential_check(username: str = None):
+    """
+    Record a credential check for the username and client IP of the current request.
+
+    Args:
+        username (str, optional): The username whose password is about to be checked; without
+            one, e.g. for an admin token, only the client IP limit applies.
+
+    Returns:
+        Response: A 429 response if either limit is exceeded, otherwise None.
+    """
+    retry_after = login_ip_limiter.hit(request.remote_addr or 'unknown')
+    if not retry_after and username is not None:
+        retry_after = login_user_limiter.hit(username)
+    if not retry_after:
+        return None
+    logger.warning('Too many credential checks for user %s from %s', username, request.remote_addr)
+    response = make_response(jsonify({'error': 'Too many attempts, try again later'}), 429)
+    response.headers['Retry-After'] = str(int(retry_after) + 1)
+    return response
 
 ##########################################################
 #
@@ -42,7 +168,7 @@ db.init_app(app)
 #
 ##########################################################
 
-@app.route('/api/health', methods=['GET'])
+@bp.route('/api/health', methods=['GET'])
 def healthcheck() -> Response:
     """
     Health check route to verify the service is running.
@@ -53,7 +179,7 @@ def healthcheck() -> Response:
     logger.info('Health check requested')
     return make_response(jsonify({'status': 'healthy'}), 200)
 
-@app.route('/api/db-check', methods=['GET'])
+@bp.route('/api/db-check', methods=['GET'])
 def db_check() -> Response:
     """
     Route to check if the database connection and movies table are functional.
@@ -61,18 +187,74 @@ def db_check() -> Response:
     Returns:
         JSON response indicating the database health status.
     Raises:
-        404 error if there is an issue with the database.
+        503 error if there is an issue with the database.
     """
     try:
-        app.logger.info("Checking database connection...")
+        current_app.logger.info("Checking database connection...")
         check_database_connection()
-        app.logger.info("Database connection is OK.")
-        app.logger.info("Checking if movies table exists...")
+        current_app.logger.info("Database connection is OK.")
+        current_app.logger.info("Checking if movies table exists...")
         check_table_exists("movies")
-        app.logger.info("movies table exists.")
+        current_app.logger.info("movies table exists.")
         return make_response(jsonify({'database_status': 'healthy'}), 200)
     except Exception as e:
-        return make_response(jsonify({'error': str(e)}), 404)
+        return make_response(jsonify({'error': str(e)}), 503)
+
+@bp.route('/api/ready', methods=['GET'])
+def ready() -> Response:
+    """
+    Readiness probe, answered from the last round of background dependency checks.
+
+    No check runs during the request, so probes are cheap however often they come.
+
+    Returns:
+        JSON Response: The result of every check, 200 if the critical ones passed, 503 otherwise.
+    """
+    is_ready, body = readiness_monitor.status()
+    return current_app.response_class(body, status=200 if is_ready else 503, mimetype='application/json')
+
+@bp.route('/api/login-limiter-stats', methods=['GET'])
+def login_limiter_stats() -> Response:
+    """
+    Route to expose the login throttling counters for monitoring.
+
+    Returns:
+        JSON Response: {"per_user": counters, "per_ip": counters}, 200
+    """
+    return make_response(jsonify({
+        'per_user': login_user_limiter.stats(),
+        'per_ip': login_ip_limiter.stats()
+    }), 200)
+
+@bp.route('/api/movie-pool-stats', methods=['GET'])
+def movie_pool_stats() -> Response:
+    """
+    Route to expose the random movie pool counters for monitoring.
+
+    Returns:
+        JSON Response: {"keys": {key: pooled movies}, "hits": int, "misses": int}, 200
+    """
+    return make_response(jsonify(random_movie_pool.stats()), 200)
+
+@bp.route('/api/search-stats', methods=['GET'])
+def search_stats() -> Response:
+    """
+    Route to expose the concurrency and queue time counters of the search routes for monitoring.
+
+    Returns:
+        JSON Response: {route: {"active": int, "waiting": int, "avg_queue_ms": float, ...}}, 200
+    """
+    return make_response(jsonify({route: limiter.stats() for route, limiter in search_limiters.items()}), 200)
+
+@bp.route('/api/tmdb-stats', methods=['GET'])
+def tmdb_stats() -> Response:
+    """
+    Route to expose the TMDB request coalescing and circuit breaker counters for monitoring.
+
+    Returns:
+        JSON Response: {"calls": int, "shared": int, "in_flight": int, "circuit": {...}}, 200
+    """
+    return make_response(jsonify(dict(tmdb_flight.stats(), circuit=tmdb_breaker.stats())), 200)
 
 ##########################################################
 #
@@ -80,7 +262,7 @@ def db_check() -> Response:
 #
 ##########################################################
 
-@app.route('/create-account', methods=['POST'])
+@bp.route('/create-account', methods=['POST'])
 def create_account():
     """
     Create a new user account with secure password storage.
@@ -118,7 +300,64 @@ def create_account():
         logger.error('Unexpected error during account creation: %s', str(e))
         return make_response(jsonify({'error': 'An error occurred while creating the account'}), 500)
 
-@app.route('/login', methods=['POST'])
+@bp.route('/create-accounts', methods=['POST'])
+def create_accounts():
+    """
+    Create many user accounts in one request. Reserved to administrators.
+
+    Expected Headers:
+        - X-Admin-Token: The configured ADMIN_TOKEN
+
+    Expected JSON Input:
+        - accounts (list): Objects with "username" and "password" keys
+
+    Returns:
+        JSON Response:
+            - success: {"status": "success", "created": count, "results": [{"username": ..., "status": ...}]}, 200
+            - error: {"error": error_message}, status_code
+
+    Raises:
+        400: If input validation fails or the batch is too large
+        401: If the admin token is missing or wrong
+        403: If no admin token is configured
+        429: If too many attempts were made from the client IP
+        500: If there is an issue adding the users to the database
+    """
+    logger.info('Creating accounts in bulk')
+    throttled = throttle_credential_check()
+    if throttled:
+        return throttled
+
+    try:
+        verify_admin_token()
+    except PermissionError as e:
+        logger.warning('Rejected bulk account creation from %s: %s', request.remote_addr, str(e))
+        return make_response(jsonify({'error': str(e)}), 403)
+    except ValueError as e:
+        logger.warning('Rejected bulk account creation from %s: %s', request.remote_addr, str(e))
+        return make_response(jsonify({'error': str(e)}), 401)
+
+    data = request.get_json()
+    accounts = data.get('accounts')
+
+    if not isinstance(accounts, list) or not all(isinstance(account, dict) for account in accounts):
+        logger.error('Missing or malformed accounts list in request')
+        return make_response(jsonify({'error': 'Invalid input, accounts must be a list of username/password objects'}), 400)
+
+    if len(accounts) > CREATE_ACCOUNTS_MAX_BATCH:
+        logger.error('Too many accounts in request: %d', len(accounts))
+        return make_response(jsonify({'error': f'At most {CREATE_ACCOUNTS_MAX_BATCH} accounts can be created per request'}), 400)
+
+    try:
+        results = Users.create_users((account.get('username'), account.get('password')) for account in accounts)
+        created = sum(1 for result in results if result['status'] == 'created')
+        logger.info('Bulk account creation finished: %d of %d created', created, len(results))
+        return make_response(jsonify({'status': 'success', 'created': created, 'results': results}), 200)
+    except Exception as e:
+        logger.error('Unexpected error during bulk account creation: %s', str(e))
+        return make_response(jsonify({'error': 'An error occurred while creating the accounts'}), 500)
+
+@bp.route('/login', methods=['POST'])
 def login():
     """
     Verify user credentials against stored password hash.
@@ -129,13 +368,15 @@ def login():
 
     Returns:
         JSON Response:
-            - success: {"status": "success", "message": "Login successful"}, 200
+            - success: {"status": "success", "message": "Login successful",
+                        "token": session_token, "expires_in": seconds}, 200
             - error: {"error": error_message}, status_code
 
     Raises:
         400: If input validation fails
         401: If authentication fails
         404: If user not found
+        429: If too many attempts were made for the username or from the client IP
     """
     logger.info('Processing login request')
     data = request.get_json()
@@ -145,11 +386,21 @@ def login():
     if not username or not password:
         logger.error('Missing username or password in login request')
         return make_response(jsonify({'error': 'Invalid input, both username and password are required'}), 400)
+
+    throttled = throttle_credential_check(username)
+    if throttled:
+        return throttled
     
     try:
         if Users.check_password(username, password):
+            login_user_limiter.reset(username)
             logger.info('Login successful for user: %s', username)
-            return make_response(jsonify({'status': 'success', 'message': 'Login successful'}), 200)
+            return make_response(jsonify({
+                'status': 'success',
+                'message': 'Login successful',
+                'token': issue_session_token(username, Users.get_session_generation(username)),
+                'expires_in': SESSION_TTL_SECONDS
+            }), 200)
         logger.warning('Failed login attempt for user: %s', username)
         return make_response(jsonify({'error': 'Invalid credentials'}), 401)
     except ValueError as e:
@@ -159,7 +410,37 @@ def login():
         logger.error('Unexpected error during login: %s', str(e))
         return make_response(jsonify({'error': 'An error occurred during login'}), 500)
 
-@app.route('/update-password', methods=['POST'])
+@bp.route('/logout', methods=['POST'])
+@login_required
+def logout():
+    """
+    End every session of the user the token sent with the request was issued to.
+
+    Expected Headers:
+        - Authorization: Bearer <token>
+
+    Returns:
+        JSON Response:
+            - success: {"status": "success", "message": "Logout successful"}, 200
+            - error: {"error": error_message}, status_code
+
+    Raises:
+        401: If the token is missing, invalid or already revoked
+        500: If there is an issue updating the user
+    """
+    logger.info('Processing logout request')
+    try:
+        revoke_session_token(get_request_token())
+        Users.end_sessions(g.username)
+        return make_response(jsonify({'status': 'success', 'message': 'Logout successful'}), 200)
+    except ValueError as e:
+        logger.error('Value error during logout: %s', str(e))
+        return make_response(jsonify({'error': str(e)}), 401)
+    except Exception as e:
+        logger.error('Unexpected error during logout: %s', str(e))
+        return make_response(jsonify({'error': 'An error occurred during logout'}), 500)
+
+@bp.route('/update-password', methods=['POST'])
 def update_password():
     """
     Update a user's password after verifying their current password.
@@ -178,6 +459,7 @@ def update_password():
         400: If input validation fails
         401: If old password is invalid
         404: If user not found
+        429: If too many attempts were made for the username or from the client IP
     """
     logger.info('Processing password update request')
     data = request.get_json()
@@ -188,9 +470,14 @@ def update_password():
     if not username or not old_password or not new_password:
         logger.error('Missing required fields in password update request')
         return make_response(jsonify({'error': 'Username, old password, and new password are required'}), 400)
+
+    throttled = throttle_credential_check(username)
+    if throttled:
+        return throttled
     
     try:
         if Users.check_password(username, old_password):
+            login_user_limiter.reset(username)
             Users.update_password(username, new_password)
             logger.info('Password updated successfully for user: %s', username)
             return make_response(jsonify({'status': 'success', 'message': 'Password updated successfully'}), 200)
@@ -209,8 +496,47 @@ def update_password():
 #
 ##########################################################
 
-@app.route('/movies/search-by-name', methods=['POST'])
-def search_by_name():
+def movie_response(movie: Movie) -> Response:
+    """
+    Build the success response shared by the movie search routes.
+
+    A movie served from the catalog while TMDB was unavailable is marked as stale, in the
+    body and with a Warning header.
+
+    Args:
+        movie (Movie): The movie found.
+
+    Returns:
+        JSON Response: {"status": "success", ...movie fields[, "stale": true]}, 200
+    """
+    payload = movie.to_dict()
+    payload['status'] = 'success'
+    if not movie.stale:
+        return json_response(payload)
+    payload['stale'] = True
+    response = json_response(payload)
+    response.headers['Warning'] = '110 - "Response is Stale"'
+    return response
+
+def tmdb_unavailable_response(error: TMDBUnavailableError) -> Response:
+    """
+    Build the error response of the movie search routes when TMDB cannot answer.
+
+    Args:
+        error (TMDBUnavailableError): The error raised by the search.
+
+    Returns:
+        JSON Response: {"error": error_message}, 503, with a Retry-After header.
+    """
+    logger.error('TMDB unavailable during movie search: %s', str(error))
+    response = make_response(jsonify({'error': 'The movie database is unavailable, try again later'}), 503)
+    response.headers['Retry-After'] = str(max(1, math.ceil(tmdb_breaker.retry_after())))
+    return response
+
+@bp.route('/movies/search-by-name', methods=['POST'])
+@login_required
+@limit_concurrency('name')
+async def search_by_name():
     """
     Search for a movie by name.
 
@@ -219,8 +545,10 @@ def search_by_name():
 
     Returns:
         JSON Response:
-            - success: Movie details, 200
-            - error: {"error": error_message}, status_code
+            - success: Movie details, 200, with "stale": true if served from the catalog
+              while TMDB is unavailable
+            - error: {"error": error_message}, status_code; 503 with Retry-After if TMDB
+              is unavailable and the catalog has no match, or too many searches are waiting
     """
     logger.info('Processing movie search by name request')
     data = request.get_json()
@@ -231,25 +559,73 @@ def search_by_name():
         return make_response(jsonify({'error': 'Movie name is required'}), 400)
     
     try:
-        movie = find_movie_by_name(name)
+        movie = await afind_movie_by_name(name)
         logger.info('Movie found: %s', movie.name)
-        return make_response(jsonify({
-            'status': 'success',
-            'name': movie.name,
-            'year': movie.year,
-            'director': movie.director,
-            'genres': movie.genres,
-            'original_language': movie.original_language
-        }), 200)
+        return movie_response(movie)
     except ValueError as e:
         logger.error('Value error during movie search: %s', str(e))
         return make_response(jsonify({'error': str(e)}), 404)
+    except TMDBUnavailableError as e:
+        return tmdb_unavailable_response(e)
     except Exception as e:
         logger.error('Unexpected error during movie search: %s', str(e))
         return make_response(jsonify({'error': 'An error occurred while searching for the movie'}), 500)
 
-@app.route('/movies/search-by-year', methods=['POST'])
-def search_by_year():
+@bp.route('/movies/search-batch', methods=['POST'])
+@login_required
+def search_batch():
+    """
+    Search for many movies by name concurrently, e.g. to import a watchlist.
+
+    Expected Query Parameters:
+        - names (list): The names of the movies to search for
+        - concurrency (int, optional): Maximum number of titles looked up at the same time
+
+    Returns:
+        Streamed JSON lines (application/x-ndjson), one per distinct title in input order:
+            - success: {"name": query, "status": "success", "movie": movie details}
+            - error: {"name": query, "error": error_message}
+        followed by {"status": "done", "found": count}.
+    """
+    logger.info('Processing batch movie search request')
+    data = request.get_json()
+    names = data.get('names')
+
+    if not isinstance(names, list) or not all(isinstance(name, str) for name in names):
+        logger.error('Missing or malformed movie names in request')
+        return make_response(jsonify({'error': 'names must be a list of movie names'}), 400)
+
+    if len(names) > SEARCH_BATCH_MAX_NAMES:
+        logger.error('Too many movie names in request: %d', len(names))
+        return make_response(jsonify({'error': f'At most {SEARCH_BATCH_MAX_NAMES} names can be searched per request'}), 400)
+
+    try:
+        concurrency = max(1, min(int(data.get('concurrency', TMDB_BATCH_CONCURRENCY)), TMDB_BATCH_CONCURRENCY))
+    except (TypeError, ValueError):
+        logger.error('Invalid concurrency format provided')
+        return make_response(jsonify({'error': 'Concurrency must be a valid integer'}), 400)
+
+    def generate():
+        found = 0
+        try:
+            for name, result in find_movies_by_names(names, concurrency=concurrency):
+                if isinstance(result, Exception):
+                    yield dumps({'name': name, 'error': str(result)}) + b'\n'
+                    continue
+                found += 1
+                yield dumps({'name': name, 'status': 'success', 'movie': result.to_dict()}) + b'\n'
+            logger.info('Batch movie search finished: %d of %d found', found, len(names))
+            yield dumps({'status': 'done', 'found': found}) + b'\n'
+        except Exception as e:
+            logger.error('Unexpected error during batch movie search: %s', str(e))
+            yield dumps({'error': 'An error occurred while searching for the movies'}) + b'\n'
+
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+@bp.route('/movies/search-by-year', methods=['POST'])
+@login_required
+@limit_concurrency('year')
+async def search_by_year():
     """
     Get a random movie from a specific year.
 
@@ -258,8 +634,10 @@ def search_by_year():
 
     Returns:
         JSON Response:
-            - success: Movie details, 200
-            - error: {"error": error_message}, status_code
+            - success: Movie details, 200, with "stale": true if served from the catalog
+              while TMDB is unavailable
+            - error: {"error": error_message}, status_code; 503 with Retry-After if TMDB
+              is unavailable and the catalog has no match, or too many searches are waiting
     """
     logger.info('Processing random movie by year request')
     try:
@@ -274,25 +652,22 @@ def search_by_year():
         return make_response(jsonify({'error': 'Year must be 1900 or later'}), 400)
     
     try:
-        movie = find_movie_by_year(year)
+        movie = await afind_movie_by_year(year)
         logger.info('Movie found: %s', movie.name)
-        return make_response(jsonify({
-            'status': 'success',
-            'name': movie.name,
-            'year': movie.year,
-            'director': movie.director,
-            'genres': movie.genres,
-            'original_language': movie.original_language
-        }), 200)
+        return movie_response(movie)
     except ValueError as e:
         logger.error('Value error during movie search: %s', str(e))
         return make_response(jsonify({'error': str(e)}), 404)
+    except TMDBUnavailableError as e:
+        return tmdb_unavailable_response(e)
     except Exception as e:
         logger.error('Unexpected error during movie search: %s', str(e))
         return make_response(jsonify({'error': 'An error occurred while searching for the movie'}), 500)
 
-@app.route('/movies/search-by-language', methods=['POST'])
-def search_by_language():
+@bp.route('/movies/search-by-language', methods=['POST'])
+@login_required
+@limit_concurrency('language')
+async def search_by_language():
     """
     Search for movies by original language.
 
@@ -301,8 +676,10 @@ def search_by_language():
 
     Returns:
         JSON Response:
-            - success: Movie details, 200
-            - error: {"error": error_message}, status_code
+            - success: Movie details, 200, with "stale": true if served from the catalog
+              while TMDB is unavailable
+            - error: {"error": error_message}, status_code; 503 with Retry-After if TMDB
+              is unavailable and the catalog has no match, or too many searches are waiting
     """
     logger.info('Processing movie search by language request')
     data = request.get_json()
@@ -313,25 +690,22 @@ def search_by_language():
         return make_response(jsonify({'error': 'Language code is required'}), 400)
     
     try:
-        movie = find_movie_by_language(language_code)
+        movie = await afind_movie_by_language(language_code)
         logger.info('Movie found: %s', movie.name)
-        return make_response(jsonify({
-            'status': 'success',
-            'name': movie.name,
-            'year': movie.year,
-            'director': movie.director,
-            'genres': movie.genres,
-            'original_language': movie.original_language
-        }), 200)
+        return movie_response(movie)
     except ValueError as e:
         logger.error('Value error during movie search: %s', str(e))
         return make_response(jsonify({'error': str(e)}), 404)
+    except TMDBUnavailableError as e:
+        return tmdb_unavailable_response(e)
     except Exception as e:
         logger.error('Unexpected error during movie search: %s', str(e))
         return make_response(jsonify({'error': 'An error occurred while searching for the movie'}), 500)
 
-@app.route('/movies/search-by-director', methods=['POST'])
-def search_by_director():
+@bp.route('/movies/search-by-director', methods=['POST'])
+@login_required
+@limit_concurrency('director')
+async def search_by_director():
     """
     Search for movies by director name.
 
@@ -340,8 +714,10 @@ def search_by_director():
 
     Returns:
         JSON Response:
-            - success: Movie details, 200
-            - error: {"error": error_message}, status_code
+            - success: Movie details, 200, with "stale": true if served from the catalog
+              while TMDB is unavailable
+            - error: {"error": error_message}, status_code; 503 with Retry-After if TMDB
+              is unavailable and the catalog has no match, or too many searches are waiting
     """
     logger.info('Processing movie search by director request')    
     data = request.get_json()
@@ -352,25 +728,22 @@ def search_by_director():
         return make_response(jsonify({'error': 'Director name is required'}), 400)
     
     try:
-        movie = find_movie_by_director(director)
+        movie = await afind_movie_by_director(director)
         logger.info('Movie found: %s', movie.name)
-        return make_response(jsonify({
-            'status': 'success',
-            'name': movie.name,
-            'year': movie.year,
-            'director': movie.director,
-            'genres': movie.genres,
-            'original_language': movie.original_language
-        }), 200)
+        return movie_response(movie)
     except ValueError as e:
         logger.error('Value error during movie search: %s', str(e))
         return make_response(jsonify({'error': str(e)}), 404)
+    except TMDBUnavailableError as e:
+        return tmdb_unavailable_response(e)
     except Exception as e:
         logger.error('Unexpected error during movie search: %s', str(e))
         return make_response(jsonify({'error': 'An error occurred while searching for the movie'}), 500)
 
-@app.route('/movies/search-by-genre', methods=['POST'])
-def search_by_genre():
+@bp.route('/movies/search-by-genre', methods=['POST'])
+@login_required
+@limit_concurrency('genre')
+async def search_by_genre():
     """
     Search for movies by genre ID.
 
@@ -379,8 +752,10 @@ def search_by_genre():
 
     Returns:
         JSON Response:
-            - success: Movie details, 200
-            - error: {"error": error_message}, status_code
+            - success: Movie details, 200, with "stale": true if served from the catalog
+              while TMDB is unavailable
+            - error: {"error": error_message}, status_code; 503 with Retry-After if TMDB
+              is unavailable and the catalog has no match, or too many searches are waiting
     """
     logger.info('Processing movie search by genre request')
 
@@ -396,24 +771,20 @@ def search_by_genre():
         return make_response(jsonify({'error': 'Genre ID must be a positive integer'}), 400)
     
     try:
-        movie = find_movie_by_genre(genre_id)
+        movie = await afind_movie_by_genre(genre_id)
         logger.info('Movie found: %s', movie.name)
-        return make_response(jsonify({
-            'status': 'success',
-            'name': movie.name,
-            'year': movie.year,
-            'director': movie.director,
-            'genres': movie.genres,
-            'original_language': movie.original_language
-        }), 200)
+        return movie_response(movie)
     except ValueError as e:
         logger.error('Value error during movie search: %s', str(e))
         return make_response(jsonify({'error': str(e)}), 404)
+    except TMDBUnavailableError as e:
+        return tmdb_unavailable_response(e)
     except Exception as e:
         logger.error('Unexpected error during movie search: %s', str(e))
         return make_response(jsonify({'error': 'An error occurred while searching for the movie'}), 500)
     
-@app.route('/movies/add-to-list', methods=['POST'])
+@bp.route('/movies/add-to-list', methods=['POST'])
+@login_required
 def add_to_list():
     """
     Add a movie to the database.
@@ -489,7 +860,8 @@ def add_to_list():
         logger.error('Unexpected error: %s', str(e))
         return make_response(jsonify({'error': 'An error occurred while adding movie to the database'}), 500)
     
-@app.route('/movies/delete-from-list', methods=['DELETE'])
+@bp.route('/movies/delete-from-list', methods=['DELETE'])
+@login_required
 def delete_from_list():
     """
     Soft deletes a movie from the catalog by marking it as deleted.
@@ -525,63 +897,210 @@ def delete_from_list():
         logger.error('Unexpected error: %s', str(e))
         return make_response(jsonify({'error': 'An error occurred while deleting movie from the database'}), 500)
 
-@app.route('/movies/clear-list', methods=['DELETE'])
+@bp.route('/movies/delete-batch', methods=['DELETE'])
+@login_required
+def delete_batch():
+    """
+    Soft deletes many movies from the catalog in one request.
+
+    Expected Query Parameters:
+        movie_ids (list): The IDs of the movies to delete.
+
+    Returns:
+        JSON Response:
+            - success: {"status": "success", "deleted": [...], "already_deleted": [...], "not_found": [...]}, 200
+            - error: {"error": error_message}, status_code
+    """
+    logger.info('Deleting movies from the database in bulk')
+
+    data = request.get_json()
+
+    try:
+        movie_ids = [int(movie_id) for movie_id in data.get('movie_ids')]
+    except (TypeError, ValueError):
+        logger.error('Invalid movie_ids format provided')
+        return make_response(jsonify({'error': 'movie_ids must be a list of integers'}), 400)
+
+    try:
+        result = delete_movies(movie_ids)
+        logger.info('Movies deleted: %d', len(result['deleted']))
+        return make_response(jsonify({'status': 'success', **result}), 200)
+    except Exception as e:
+        logger.error('Unexpected error: %s', str(e))
+        return make_response(jsonify({'error': 'An error occurred while deleting movies from the database'}), 500)
+
+@bp.route('/movies/clear-list', methods=['DELETE'])
+@login_required
 def clear_list():
     """
-    Recreates the movie table, effectively deleting all movies.
+    Deletes all movies from the catalog.
+
+    Expected Query Parameters:
+        mode (str, optional): "truncate" (default) deletes rows in chunks and keeps the schema,
+            "recreate" drops and recreates the table.
+        vacuum (bool, optional): "true" to reclaim disk space in the background afterwards.
 
     Returns:
         JSON Response:
             - success: {"status": "success"}, 200
             - error: {"error": error_message}, status_code
     """
+    mode = request.args.get('mode', 'truncate')
+    vacuum = request.args.get('vacuum', 'false').lower() == 'true'
     try:
-        clear_movie_list()
+        clear_movie_list(mode=mode, vacuum=vacuum)
         logger.info('Clearing Database')
         return make_response(jsonify({
             'status': 'success'
         }), 200)
     except ValueError as e:
         logger.error('Value error: %s', str(e))
-        return make_response(jsonify({'error': str(e)}), 404)
+        return make_response(jsonify({'error': str(e)}), 400)
     except Exception as e:
         logger.error('Unexpected error: %s', str(e))
         return make_response(jsonify({'error': 'An error occurred while clearing the database'}), 500)
     
-@app.route('/movies/mark-as-favorite', methods=['POST'])
-def mark_as_favorite():
+def parse_favorite_targets(data: dict) -> tuple[list, bool]:
     """
-    Marks a movie as a favorite in the database.
+    Read the movies targeted by a favorite route from its JSON body.
 
-    Expected Query Parameters:
-        name (str): The name of the movie to mark as favorite.
+    Args:
+        data (dict): The request body, with either "name"/"movie_id" or "names"/"movie_ids".
 
     Returns:
-        JSON Response:
-            - success: {"status": "success"}, 200
-            - error: {"error": error_message}, status_code
+        tuple: The names and/or IDs of the movies, and whether a single movie was requested.
+
+    Raises:
+        ValueError: If no movie is given or the values have the wrong type.
     """
-    data = request.get_json()
-    name = data.get('name')
+    if 'names' in data or 'movie_ids' in data:
+        names = data.get('names') or []
+        movie_ids = data.get('movie_ids') or []
+        if not isinstance(names, list) or not all(isinstance(name, str) for name in names):
+            raise ValueError('names must be a list of movie names')
+        if not isinstance(movie_ids, list):
+            raise ValueError('movie_ids must be a list of integers')
+        try:
+            return names + [int(movie_id) for movie_id in movie_ids], False
+        except (TypeError, ValueError):
+            raise ValueError('movie_ids must be a list of integers')
+    if data.get('movie_id') is not None:
+        try:
+            return [int(data.get('movie_id'))], True
+        except (TypeError, ValueError):
+            raise ValueError('Movie ID must be a valid integer')
+    if data.get('name'):
+        return [data.get('name')], True
+    raise ValueError('Movie name or ID is required')
+
+def update_favorite_status(single_update, bulk_update, action: str) -> Response:
+    """
+    Shared body of the favorite routes: apply an update to one movie or to a list of movies.
 
+    Args:
+        single_update (callable): Updates one movie by name or ID; raises ValueError if it is not found.
+        bulk_update (callable): Updates a list of names/IDs and returns the per-movie result dict.
+        action (str): Description of the update for logs and error messages.
+
+    Returns:
+        Response: The JSON response for the route.
+    """
     try:
-        mark_movie_as_favorite(name)
-        logger.info('Marking %s as favorite', name)
-        return make_response(jsonify({
-            'status': 'success'
-        }), 200)
+        targets, single = parse_favorite_targets(request.get_json())
+    except ValueError as e:
+        logger.error('Invalid input while %s: %s', action, str(e))
+        return make_response(jsonify({'error': str(e)}), 400)
+
+    try:
+        if single:
+            result = single_update(targets[0])
+            logger.info('%s: %s', action, targets[0])
+            body = {'status': 'success'}
+            if isinstance(result, bool):
+                body['favorite'] = result
+            return make_response(jsonify(body), 200)
+        result = bulk_update(targets)
+        logger.info('%s: %d movies', action, len(targets))
+        return make_response(jsonify({'status': 'success', **result}), 200)
     except ValueError as e:
         logger.error('Value error: %s', str(e))
         return make_response(jsonify({'error': str(e)}), 404)
     except Exception as e:
         logger.error('Unexpected error: %s', str(e))
-        return make_response(jsonify({'error': 'An error occurred while marking a movie favorite'}), 500)
+        return make_response(jsonify({'error': f'An error occurred while {action}'}), 500)
+
+@bp.route('/movies/mark-as-favorite', methods=['POST'])
+@login_required
+def mark_as_favorite():
+    """
+    Marks one or more movies as favorites in the database.
+
+    Expected Query Parameters:
+        name (str) or movie_id (int): The movie to mark as favorite, or
+        names (list) and/or movie_ids (list): The movies to mark as favorite.
+
+    Returns:
+        JSON Response:
+            - success: {"status": "success"}, 200
+              (with "updated" and "not_found" lists when arrays are given)
+            - error: {"error": error_message}, status_code
+    """
+    return update_favorite_status(
+        lambda movie: set_favorite(movie, True),
+        lambda movies: set_favorites(movies, True),
+        'marking movies favorite'
+    )
+
+@bp.route('/movies/unmark-favorite', methods=['POST'])
+@login_required
+def unmark_favorite():
+    """
+    Clears the favorite status of one or more movies.
+
+    Expected Query Parameters:
+        name (str) or movie_id (int): The movie to unmark, or
+        names (list) and/or movie_ids (list): The movies to unmark.
+
+    Returns:
+        JSON Response:
+            - success: {"status": "success"}, 200
+              (with "updated" and "not_found" lists when arrays are given)
+            - error: {"error": error_message}, status_code
+    """
+    return update_favorite_status(
+        lambda movie: set_favorite(movie, False),
+        lambda movies: set_favorites(movies, False),
+        'unmarking movies favorite'
+    )
+
+@bp.route('/movies/toggle-favorite', methods=['POST'])
+@login_required
+def toggle_favorite_route():
+    """
+    Flips the favorite status of one or more movies.
+
+    Expected Query Parameters:
+        name (str) or movie_id (int): The movie to toggle, or
+        names (list) and/or movie_ids (list): The movies to toggle.
+
+    Returns:
+        JSON Response:
+            - success: {"status": "success", "favorite": new_status}, 200
+              (with "favorite", "not_favorite" and "not_found" lists when arrays are given)
+            - error: {"error": error_message}, status_code
+    """
+    return update_favorite_status(toggle_favorite, toggle_favorites, 'toggling movies favorite')
     
-@app.route('/movies/list-favorite', methods=['GET'])
+@bp.route('/movies/list-favorite', methods=['GET'])
+@login_required
+@conditional_get(get_catalog_version)
 def list_favorite() -> list:
     """
     Fetches the names of all favorite movies from the database.
 
+    Expected Query Parameters:
+        - details (str, optional): "true" to list every movie field instead of the names
+
     Returns:
         JSON Response:
             - success: Movie List, 200
@@ -589,6 +1108,9 @@ def list_favorite() -> list:
     """
     try:
         logger.info('Retriving Favorites')
+        if request.args.get('details', 'false').lower() == 'true':
+            columns, rows = list_favorite_movie_rows()
+            return json_response({'status': 'success', 'favorite_movies': rows_to_dicts(columns, rows)})
         favorite_movies = list_favorite_movies()
         return make_response(jsonify({
             'status': 'success',
@@ -601,8 +1123,110 @@ def list_favorite() -> list:
         logger.error('Unexpected error: %s', str(e))
         return make_response(jsonify({'error': 'An error occurred while retriving favorite movies'}), 500)
 
-if __name__ == '__main__':
+@bp.route('/movies/stats', methods=['GET'])
+@login_required
+@conditional_get(get_catalog_version)
+def movie_stats() -> Response:
+    """
+    Route to count the movies in the catalog in total and per year, language, genre and director.
+
+    Expected Query Parameters:
+        - dimension (str, optional): Comma-separated breakdowns to return (defaults to all)
+        - limit (int, optional): The most values returned per breakdown, most frequent first (defaults to 50)
+
+    Returns:
+        JSON Response:
+            - success: {"status": "success", "total": count, "stats": {dimension: [{"value": value, "count": count}]}}, 200
+            - error: {"error": error_message}, status_code
+    """
+    dimensions = request.args.get('dimension')
+    dimensions = tuple(dimensions.split(',')) if dimensions else STATS_DIMENSIONS
+    try:
+        limit = int(request.args.get('limit', 50))
+    except ValueError:
+        logger.error('Invalid limit format provided')
+        return make_response(jsonify({'error': 'Limit must be a valid integer'}), 400)
+
+    try:
+        stats = get_movie_stats(dimensions, limit)
+        total = stats.pop('total')
+        return json_response({
+            'status': 'success',
+            'total': total,
+            'stats': {dimension: rows_to_dicts(('value', 'count'), rows) for dimension, rows in stats.items()}
+        })
+    except ValueError as e:
+        logger.error('Value error while reading movie stats: %s', str(e))
+        return make_response(jsonify({'error': str(e)}), 400)
+    except Exception as e:
+        logger.error('Unexpected error while reading movie stats: %s', str(e))
+        return make_response(jsonify({'error': 'An error occurred while reading movie stats'}), 500)
+
+class App(Flask):
+    """
+    The Flask application, running async views on the background event loop of the process.
+
+    Under a WSGI server, the request thread waits for the view while it runs on that loop, so
+    every async view of the process shares one event loop, one async TMDB client and one set
+    of concurrency limits. Under the ASGI server (asgi.py), async views run on the server's loop
+    instead and hold no thread.
+    """
+
+    def async_to_sync(self, func):
+        return partial(run_coroutine, func)
+
+def create_app(config: dict = None) -> Flask:
+    """
+    Build the application and register the routes.
+
+    Nothing here connects to a database or to TMDB: connection pools, the TMDB session and
+    the caches are filled on first use, and the user tables are created by init_db.
+
+    Args:
+        config (dict, optional): Settings overriding the defaults, e.g. for tests.
+
+    Returns:
+        Flask: The application.
+    """
+    app = App(__name__)
+    if TRUSTED_PROXY_COUNT:
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=TRUSTED_PROXY_COUNT)
+    app.config['SQLALCHEMY_DATABASE_URI'] = USERS_DATABASE_URL
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    if config:
+        app.config.update(config)
+    db.init_app(app)
+    # Lets login_required reject tokens of sessions ended by any worker
+    app.extensions['session_generations'] = Users.get_session_generation
+    app.register_blueprint(bp)
+    return app
+
+# The application served by gunicorn (app:app) and the development server
+app = create_app()
+
+def init_db() -> None:
+    """
+    Create the user tables. Run once at boot, e.g. by the gunicorn master.
+    """
     with app.app_context():
         db.create_all()
+        Users.upgrade_schema()
         logger.info('Database tables created successfully')
-    app.run(debug=True, host='0.0.0.0', port=5000)
\ No newline at end of file
+
+def start_worker_jobs() -> None:
+    """
+    Start the background jobs of a worker process. Run in every worker, never in the gunicorn
+    master, which forks workers for as long as the server runs.
+
+    Every worker runs the purge scheduler; a lock file makes sure only one of them purges.
+    """
+    start_movie_pool()
+    readiness_monitor.start()
+    if PURGE_INTERVAL_SECONDS > 0:
+        start_purge_scheduler()
+
+if __name__ == '__main__':
+    # Development server only; production runs under gunicorn (see gunicorn.conf.py)
+    init_db()
+    start_worker_jobs()
+    app.run(debug=os.getenv('FLASK_DEBUG', 'false').lower() == 'true', host='0.0.0.0', port=5000)
\ No newline at end of file
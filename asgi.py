@@ -0,0 +1,22 @@
+import os
+
+from app import app as flask_app, init_db, start_worker_jobs
+from movie_collection.utils.asgi_bridge import ASGIBridge
+from movie_collection.utils.tmdb_client import aclose_async_client
+
+
+# The application served by gunicorn with uvicorn workers (asgi:app). The async search routes
+# run on the event loop of each worker; the other routes run on GUNICORN_THREADS threads.
+app = ASGIBridge(
+    flask_app,
+    threads=int(os.getenv('GUNICORN_THREADS', '4')),
+    on_shutdown=[aclose_async_client]
+)
+
+if __name__ == '__main__':
+    # Development server only; production runs under gunicorn (see gunicorn.conf.py)
+    import uvicorn
+
+    init_db()
+    start_worker_jobs()
+    uvicorn.run(app, host='0.0.0.0', port=5000)
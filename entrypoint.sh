@@ -5,13 +5,13 @@ if [ -f .env ]; then
     export $(cat .env | xargs)
 fi
 
-# Check if CREATE_DB is true, and run the database creation script if so
-if [ "$CREATE_DB" = "true" ]; then
-    echo "Creating the database..."
-    /app/sql/create_db.sh
+# Apply pending schema migrations unless MIGRATE_DB is false; existing data is kept
+if [ "$MIGRATE_DB" != "false" ]; then
+    echo "Migrating the database at $DB_PATH..."
+    python -m movie_collection.utils.migrations upgrade || exit 1
 else
-    echo "Skipping database creation."
+    echo "Skipping database migrations."
 fi
 
-# Start the Python application
-exec python app.py
+# Start the server passed as the container command (gunicorn by default)
+exec "$@"
@@ -0,0 +1,55 @@
+# Gunicorn settings for the production server, e.g.
+#   gunicorn -c gunicorn.conf.py asgi:app
+# or, with GUNICORN_WORKER_CLASS=gthread, the WSGI application:
+#   gunicorn -c gunicorn.conf.py app:app
+# Every value can be overridden from the environment.
+import multiprocessing
+import os
+
+
+bind = f"0.0.0.0:{os.getenv('PORT', '5000')}"
+
+# One process per core (plus one). Uvicorn workers run the async search routes on their event
+# loop and every other route on GUNICORN_THREADS threads (see asgi.py); gthread workers run all
+# routes on those threads. Keep GUNICORN_THREADS in line with DB_POOL_SIZE so threads do not
+# queue for connections.
+workers = int(os.getenv("WEB_CONCURRENCY", multiprocessing.cpu_count() + 1))
+threads = int(os.getenv("GUNICORN_THREADS", "4"))
+worker_class = os.getenv("GUNICORN_WORKER_CLASS", "uvicorn_worker.UvicornWorker")
+
+# Import the app once in the master so workers share its memory copy-on-write
+preload_app = True
+
+# Recycle workers gracefully after a number of requests to bound memory growth;
+# the jitter keeps them from restarting all at once
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", "2000"))
+max_requests_jitter = int(os.getenv("GUNICORN_MAX_REQUESTS_JITTER", "200"))
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", "30"))
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "60"))
+keepalive = int(os.getenv("GUNICORN_KEEPALIVE", "5"))
+
+accesslog = os.getenv("GUNICORN_ACCESS_LOG", "-")
+loglevel = os.getenv("GUNICORN_LOG_LEVEL", "info")
+
+
+def when_ready(server):
+    """
+    Create the database tables once, in the master, before any worker starts. The master starts
+    no threads: a thread holding a lock while the master forks hands the worker a lock that is
+    never released.
+    """
+    from app import init_db
+
+    init_db()
+
+
+def post_fork(server, worker):
+    """
+    Drop pooled connections inherited from the master; SQLite connections must not cross a fork.
+    Then start the background jobs of the worker.
+    """
+    from app import start_worker_jobs
+    from movie_collection.db import dispose_engines
+
+    dispose_engines()
+    start_worker_jobs()
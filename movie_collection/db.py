@@ -1,3 +1,167 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import contextvars
+import logging
+import os
+import threading
+
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.pool import QueuePool, StaticPool
+
+from movie_collection.utils.logger import configure_logger
+
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+
+# load the db locations from the environment with default values
+DB_PATH = os.getenv("DB_PATH", "/app/sql/movies.db")
+MOVIES_DATABASE_URL = os.getenv("MOVIES_DATABASE_URL", f"sqlite:///{DB_PATH}")
+USERS_DATABASE_URL = os.getenv(
+    "USERS_DATABASE_URL", f"sqlite:///{os.path.join(os.path.dirname(DB_PATH), 'users.db')}"
+)
+
+# Pool settings shared by every engine, see "Database Pool Sizing" in the README
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "-1"))
+
+# Applied to every new SQLite connection
+SQLITE_PRAGMAS = (
+    ("journal_mode", os.getenv("SQLITE_JOURNAL_MODE", "WAL")),
+    ("synchronous", os.getenv("SQLITE_SYNCHRONOUS", "NORMAL")),
+    ("busy_timeout", os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000")),
+    ("cache_size", os.getenv("SQLITE_CACHE_SIZE", "-8000")),
+    ("temp_store", "MEMORY"),
+    ("foreign_keys", "ON"),
+)
+
+_engines = {}
+_engines_lock = threading.Lock()
+
+# Runs the blocking database work of coroutines, see run_db. Sized like the pools, so its
+# threads never wait for a connection.
+db_executor = ThreadPoolExecutor(max_workers=DB_POOL_SIZE, thread_name_prefix="db")
+
+
+def _apply_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in SQLITE_PRAGMAS:
+            cursor.execute(f"PRAGMA {name} = {value}")
+    finally:
+        cursor.close()
+
+
+def get_engine(url: str) -> Engine:
+    """
+    Get the shared engine for a database URL, creating it on first use.
+
+    Every caller asking for the same URL shares one engine and therefore one connection pool.
+
+    Args:
+        url (str): The SQLAlchemy database URL.
+
+    Returns:
+        Engine: The engine for the URL.
+    """
+    with _engines_lock:
+        engine = _engines.get(url)
+        if engine is None:
+            engine = _engines[url] = _create_engine(url)
+        return engine
+
+
+def _create_engine(url: str) -> Engine:
+    parsed = make_url(url)
+    is_sqlite = parsed.get_backend_name() == "sqlite"
+    if is_sqlite and parsed.database in (None, "", ":memory:"):
+        # An in-memory database only exists inside its one connection
+        engine = create_engine(url, poolclass=StaticPool, connect_args={"check_same_thread": False})
+    else:
+        engine = create_engine(
+            url,
+            poolclass=QueuePool,
+            pool_size=DB_POOL_SIZE,
+            max_overflow=DB_MAX_OVERFLOW,
+            pool_timeout=DB_POOL_TIMEOUT,
+            pool_recycle=DB_POOL_RECYCLE,
+            pool_pre_ping=not is_sqlite,
+            connect_args={"check_same_thread": False} if is_sqlite else {}
+        )
+    if is_sqlite:
+        event.listen(engine, "connect", _apply_sqlite_pragmas)
+    logger.info("Created database engine for %s", parsed.render_as_string(hide_password=True))
+    return engine
+
+
+def get_pool_status(url: str) -> dict:
+    """
+    Count the connections of the pool behind a database URL, without checking any out.
+
+    Args:
+        url (str): The SQLAlchemy database URL.
+
+    Returns:
+        dict: The pool size, the connections checked out and the most that can be, which is
+            None when the pool has no limit.
+    """
+    pool = get_engine(url).pool
+    if not isinstance(pool, QueuePool):
+        return {'size': 1, 'checked_out': 0, 'capacity': None}
+    return {
+        'size': pool.size(),
+        'checked_out': pool.checkedout(),
+        'capacity': pool.size() + DB_MAX_OVERFLOW if DB_MAX_OVERFLOW >= 0 else None
+    }
+
+
+def run_db(fn, *args):
+    """
+    Run a blocking database function on the database threads, so a coroutine can await it
+    without blocking its event loop.
+
+    fn sees the context variables of the caller, e.g. the Flask application context that
+    scopes db.session.
+
+    Args:
+        fn (callable): The function.
+        *args: Positional arguments for fn.
+
+    Returns:
+        asyncio.Future: Resolves to the result of fn.
+    """
+    context = contextvars.copy_context()
+    return asyncio.get_running_loop().run_in_executor(db_executor, context.run, fn, *args)
+
+
+def dispose_engines() -> None:
+    """
+    Drop the pooled connections of every engine, e.g. after forking a worker process.
+    """
+    with _engines_lock:
+        for engine in _engines.values():
+            engine.dispose(close=False)
+
+
+class _SharedEngineSQLAlchemy(SQLAlchemy):
+    """
+    Flask-SQLAlchemy extension whose engines come from get_engine, so that the Users model
+    and the raw movie queries share one pool per database.
+
+    init_app only records the database URLs; each engine is created on first use.
+    """
+
+    def _make_engine(self, bind_key, options, app) -> str:
+        return make_url(options["url"]).render_as_string(hide_password=False)
+
+    @property
+    def engines(self) -> dict:
+        return {key: get_engine(url) for key, url in super().engines.items()}
+
 
-db = SQLAlchemy()
\ No newline at end of file
+db = _SharedEngineSQLAlchemy()
@@ -1,25 +1,88 @@
-from dataclasses import dataclass
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import contextmanager
 import logging
+from operator import attrgetter
 import os
 import sqlite3
+import threading
 
+from movie_collection.db import run_db
+from movie_collection.utils.cache import LRUCache, VersionedCache
 from movie_collection.utils.logger import configure_logger
+from movie_collection.utils.migrations import upgrade as upgrade_schema
+from movie_collection.utils.prefetch_pool import PrefetchPool
 from movie_collection.utils.sql_utils import get_db_connection
-import requests
+from movie_collection.utils.tmdb_client import (
+    TMDBUnavailableError,
+    atmdb_get,
+    atmdb_stream,
+    create_session,
+    tmdb_flight,
+    tmdb_get,
+    tmdb_stream
+)
 import random
 
-API_KEY = ''
-BASE_URL = 'https://api.themoviedb.org/3'
-
 logger = logging.getLogger(__name__)
 configure_logger(logger)
 
-@dataclass
+# Maximum number of values bound into one IN (...) list, below SQLite's variable limit
+SQL_IN_CHUNK_SIZE = 500
+
+# Rows deleted per transaction when truncating the catalog
+CLEAR_CHUNK_SIZE = int(os.getenv("CLEAR_CHUNK_SIZE", "1000"))
+
+# Concurrent TMDB lookups per find_movies_by_names batch
+TMDB_BATCH_CONCURRENCY = int(os.getenv("TMDB_BATCH_CONCURRENCY", "8"))
+
+# How long discover page counts and pages are reused, and how many are kept
+DISCOVER_CACHE_TTL_SECONDS = int(os.getenv("DISCOVER_CACHE_TTL_SECONDS", "3600"))
+DISCOVER_CACHE_SIZE = int(os.getenv("DISCOVER_CACHE_SIZE", "2048"))
+
+# Seconds favorites are served from memory without checking for writes by other processes;
+# 0 checks the catalog version on every read
+FAVORITES_CACHE_MAX_STALENESS_SECONDS = float(os.getenv("FAVORITES_CACHE_MAX_STALENESS_SECONDS", "0"))
+
+# Breakdowns served by get_movie_stats, and the most values returned per breakdown
+STATS_DIMENSIONS = ('year', 'language', 'genre', 'director')
+STATS_MAX_LIMIT = 1000
+
+# How long genre names, director IDs and filmographies are reused, and how many directors are kept
+GENRES_CACHE_TTL_SECONDS = int(os.getenv("GENRES_CACHE_TTL_SECONDS", "86400"))
+DIRECTOR_CACHE_TTL_SECONDS = int(os.getenv("DIRECTOR_CACHE_TTL_SECONDS", "86400"))
+DIRECTOR_CACHE_SIZE = int(os.getenv("DIRECTOR_CACHE_SIZE", "1024"))
+
+# TMDB rejects discover pages beyond this one
+DISCOVER_MAX_PAGE = 500
+
+# Resolved random movies kept per year/genre/language key; 0 disables the pool
+MOVIE_POOL_SIZE = int(os.getenv("MOVIE_POOL_SIZE", "0"))
+MOVIE_POOL_LOW_WATER = int(os.getenv("MOVIE_POOL_LOW_WATER", "3"))
+MOVIE_POOL_MAX_KEYS = int(os.getenv("MOVIE_POOL_MAX_KEYS", "64"))
+# Keys warmed on first use are dropped once no request drew from them for this long
+MOVIE_POOL_IDLE_SECONDS = float(os.getenv("MOVIE_POOL_IDLE_SECONDS", "600"))
+# Keys warmed at startup, e.g. "year:2020,genre:28,language:fr"; other keys warm on first use
+MOVIE_POOL_KEYS = os.getenv("MOVIE_POOL_KEYS", "")
+
+
+def _chunks(items: list, size: int):
+    """
+    Split a list into consecutive slices of at most size items.
+    """
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+# Fields of a Movie as returned by the API, in order
+MOVIE_FIELDS = ('name', 'year', 'director', 'genres', 'original_language')
+_movie_values = attrgetter(*MOVIE_FIELDS)
+
 class Movie:
     """
     A class representing a movie with basic information.
 
+    Slotted, so instances carry no per-instance __dict__.
+
     Attributes:
         name (str): The title of the movie
         year (int): The release year of the movie
@@ -27,32 +90,105 @@ class Movie:
         genres (list): List of genres associated with the movie
         original_language (str): The original language of the movie
         favorite (bool): favorite status of the movie
+        stale (bool): whether the movie was served from the catalog because TMDB was unavailable
+    """
+    __slots__ = MOVIE_FIELDS + ('favorite', 'stale')
+
+    def __init__(self, name: str, year: int, director: str, genres: list, original_language: str, favorite: bool = False,
+                 stale: bool = False):
+        if year <= 1900:
+            raise ValueError(f"Year must be greater than 1900, got {year}")
+        self.name = name
+        self.year = year
+        self.director = director
+        self.genres = genres
+        self.original_language = original_language
+        self.favorite = favorite
+        self.stale = stale
+
+    def __repr__(self) -> str:
+        return (f"Movie(name={self.name!r}, year={self.year!r}, director={self.director!r}, "
+                f"genres={self.genres!r}, original_language={self.original_language!r}, favorite={self.favorite!r})")
+
+    def __eq__(self, other) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return _movie_values(self) + (self.favorite,) == _movie_values(other) + (other.favorite,)
+
+    __hash__ = None
+
+    def to_dict(self) -> dict:
+        """
+        Serialize the movie for an API response.
+
+        Returns:
+            dict: The MOVIE_FIELDS of the movie.
+        """
+        return dict(zip(MOVIE_FIELDS, _movie_values(self)))
+
+_genres_cache = LRUCache(1, ttl=GENRES_CACHE_TTL_SECONDS)
+
+def get_genres(session=None):
     """
-    name: str
-    year: int
-    director: str
-    genres: list
-    original_language: str
-    favorite: bool = False
+    Fetch the list of all movie genres from the TMDB API, cached for GENRES_CACHE_TTL_SECONDS.
 
-    def __post_init__(self):
-        if self.year <= 1900:
-            raise ValueError(f"Year must be greater than 1900, got {self.year}")
+    While TMDB is unavailable, an expired list is served if there is one.
+
+    Args:
+        session (requests.Session, optional): Session to reuse connections from.
 
-def get_genres():
-    """
-    Fetch the list of all movie genres from the TMDB API.
     Returns:
         dict: A dictionary mapping genre IDs to genre names.
+
+    Raises:
+        TMDBUnavailableError: If TMDB is unavailable and no list was ever fetched.
     """
-    url = f"{BASE_URL}/genre/movie/list"
-    params = {'api_key': API_KEY}
-    response = requests.get(url, params=params)
-    data = response.json()
+    genres = _genres_cache.get('genres')
+    if genres is not None:
+        return genres
 
+    try:
+        data = tmdb_get("/genre/movie/list", session=session)
+    except TMDBUnavailableError as e:
+        return _stale_genres(e)
+    return _cache_genres(data)
+
+def _cache_genres(data: dict) -> dict:
+    """
+    Map the genres of a TMDB genre list response and cache them.
+    """
     genres = {genre['id']: genre['name'] for genre in data.get('genres', [])}
+    if genres:
+        _genres_cache.set('genres', genres)
+    return genres
+
+def _stale_genres(error: TMDBUnavailableError) -> dict:
+    """
+    Return the expired genres, for when TMDB is unavailable.
+
+    Raises:
+        TMDBUnavailableError: The original error, if no list was ever fetched.
+    """
+    genres = _genres_cache.get_stale('genres')
+    if genres is None:
+        raise error
+    logger.warning("Serving expired genres, TMDB is unavailable: %s", str(error))
     return genres
 
+def _validate_movie(year: int, genres: list, original_language: str) -> None:
+    """
+    Check the fields of a movie before it is stored.
+
+    Raises:
+        ValueError: If the year, genres or original language is invalid.
+    """
+    if not isinstance(year, int) or year < 1900:
+        raise ValueError(f"Invalid release year: {year}. Must be a valid integer year greater than 1900.")
+    if not genres:
+        raise ValueError("Genres list cannot be empty.")
+    if not isinstance(original_language, str) or not original_language:
+        raise ValueError(f"Invalid original language: '{original_language}'. Must be a non-empty string.")
+
 def add_movie_to_list(name: str, year: int, director: str, genres: list, original_language: str, favorite: bool = False) -> None:
     """
     Add a movie to the database.
@@ -70,12 +206,7 @@ def add_movie_to_list(name: str, year: int, director: str, genres: list, origina
         ValueError: If a movie with the given name already exists in the database.
         sqlite3.Error: If a database error occurs while adding the movie.
     """
-    if not isinstance(year, int) or year < 1900:
-        raise ValueError(f"Invalid release year: {year}. Must be a valid integer year greater than 1900.")
-    if not genres:
-        raise ValueError("Genres list cannot be empty.")
-    if not isinstance(original_language, str) or not original_language:
-        raise ValueError(f"Invalid original language: '{original_language}'. Must be a non-empty string.")
+    _validate_movie(year, genres, original_language)
 
     try:
         with get_db_connection() as conn:
@@ -85,6 +216,7 @@ def add_movie_to_list(name: str, year: int, director: str, genres: list, origina
                 VALUES (?, ?, ?, ?, ?, ?)
             """, (name, year, director, ', '.join(genres), original_language, favorite))
             conn.commit()
+            _favorites_cache.invalidate()
             logger.info("Movie successfully added to the database: %s", name)
     except sqlite3.IntegrityError:
         raise ValueError(f"Movie with name '{name}' already exists")
@@ -93,6 +225,40 @@ def add_movie_to_list(name: str, year: int, director: str, genres: list, origina
         raise e
 
 
+def add_movies_to_list(movies: list) -> int:
+    """
+    Add many movies to the database in one transaction, skipping names that already exist.
+
+    Args:
+        movies (list): Movie objects to add; their fields must already be valid.
+
+    Returns:
+        int: The number of movies inserted.
+
+    Raises:
+        sqlite3.Error: If a database error occurs while adding the movies.
+    """
+    if not movies:
+        return 0
+    try:
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.executemany("""
+                INSERT OR IGNORE INTO movies (name, year, director, genres, original_language, favorite)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """, [
+                (movie.name, movie.year, movie.director, ', '.join(movie.genres), movie.original_language, movie.favorite)
+                for movie in movies
+            ])
+            conn.commit()
+            _favorites_cache.invalidate()
+            logger.info("%d of %d movies added to the database.", cursor.rowcount, len(movies))
+            return cursor.rowcount
+    except sqlite3.Error as e:
+        logger.error("Database error: %s", str(e))
+        raise e
+
+
 def delete_movie_from_list(movie_id: int) -> None:
     """
     Soft deletes a movie from the catalog by marking it as deleted.
@@ -108,22 +274,23 @@ def delete_movie_from_list(movie_id: int) -> None:
         with get_db_connection() as conn:
             cursor = conn.cursor()
 
-            # Check if the movie exists and if it's already deleted
-            cursor.execute("SELECT deleted FROM movies WHERE id = ?", (movie_id,))
-            result = cursor.fetchone()
-
-            if result is None:
-                logger.info("Movie with ID %s not found", movie_id)
-                raise ValueError(f"Movie with ID {movie_id} not found")
+            # Perform the soft delete in one statement; only rows not yet deleted match
+            cursor.execute(
+                "UPDATE movies SET deleted = TRUE, deleted_at = CURRENT_TIMESTAMP WHERE id = ? AND deleted = FALSE",
+                (movie_id,)
+            )
 
-            deleted = result[0]
-            if deleted:
+            if cursor.rowcount == 0:
+                # Nothing changed, find out whether the movie is missing or already deleted
+                cursor.execute("SELECT deleted FROM movies WHERE id = ?", (movie_id,))
+                if cursor.fetchone() is None:
+                    logger.info("Movie with ID %s not found", movie_id)
+                    raise ValueError(f"Movie with ID {movie_id} not found")
                 logger.info("Movie with ID %s has already been deleted", movie_id)
                 raise ValueError(f"Movie with ID {movie_id} has already been deleted")
 
-            # Perform the soft delete by setting 'deleted' to TRUE
-            cursor.execute("UPDATE movies SET deleted = TRUE WHERE id = ?", (movie_id,))
             conn.commit()
+            _favorites_cache.invalidate()
 
             logger.info("Movie with ID %s marked as deleted.", movie_id)
 
@@ -131,84 +298,202 @@ def delete_movie_from_list(movie_id: int) -> None:
         logger.error("Database error while deleting movie: %s", str(e))
         raise e
 
-def clear_movie_list() -> None:
+def delete_movies(movie_ids: list) -> dict:
     """
-    Recreates the movie table, effectively deleting all movies.
+    Soft deletes many movies in one transaction, with one UPDATE per chunk of IDs.
+
+    Args:
+        movie_ids (list): The IDs of the movies to delete.
+
+    Returns:
+        dict: The IDs that were "deleted", "already_deleted" or "not_found".
 
     Raises:
         sqlite3.Error: If any database error occurs.
     """
+    movie_ids = list(dict.fromkeys(movie_ids))
+    deleted = []
     try:
-        with open(os.getenv("SQL_CREATE_TABLE_PATH", "/app/sql/create_movie_table.sql"), "r") as fh:
-            create_table_script = fh.read()
         with get_db_connection() as conn:
             cursor = conn.cursor()
-            cursor.executescript(create_table_script)
+            for chunk in _chunks(movie_ids, SQL_IN_CHUNK_SIZE):
+                placeholders = ", ".join("?" * len(chunk))
+                cursor.execute(
+                    f"UPDATE movies SET deleted = TRUE, deleted_at = CURRENT_TIMESTAMP WHERE id IN ({placeholders}) AND deleted = FALSE RETURNING id",
+                    chunk
+                )
+                deleted.extend(row[0] for row in cursor.fetchall())
+
+            # Only IDs that did not match need a second look
+            deleted_set = set(deleted)
+            remaining = [movie_id for movie_id in movie_ids if movie_id not in deleted_set]
+            existing = set()
+            for chunk in _chunks(remaining, SQL_IN_CHUNK_SIZE):
+                placeholders = ", ".join("?" * len(chunk))
+                cursor.execute(f"SELECT id FROM movies WHERE id IN ({placeholders})", chunk)
+                existing.update(row[0] for row in cursor.fetchall())
+
             conn.commit()
+            _favorites_cache.invalidate()
+            logger.info("%d movies marked as deleted.", len(deleted))
+
+    except sqlite3.Error as e:
+        logger.error("Database error while deleting movies: %s", str(e))
+        raise e
+
+    return {
+        'deleted': [movie_id for movie_id in movie_ids if movie_id in deleted_set],
+        'already_deleted': [movie_id for movie_id in remaining if movie_id in existing],
+        'not_found': [movie_id for movie_id in remaining if movie_id not in existing]
+    }
+
+def get_catalog_version():
+    """
+    Read the catalog version, which the movies table triggers bump on every write.
+
+    Only the one-row catalog_meta table is read, never the movies table.
+
+    Returns:
+        int | None: The version, or None if the database predates the catalog_meta table.
 
-            logger.info("Catalog cleared successfully.")
+    Raises:
+        sqlite3.Error: If any other database error occurs.
+    """
+    try:
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT version FROM catalog_meta WHERE id = 1")
+            row = cursor.fetchone()
+            return row[0] if row else None
+    except sqlite3.OperationalError as e:
+        if "no such table" not in str(e):
+            raise e
+        logger.warning("No catalog_meta table, catalog versioning is disabled")
+        return None
+
+# Favorites queries, dropped on every write by this process and checked against the catalog version
+_favorites_cache = VersionedCache(get_catalog_version, max_staleness=FAVORITES_CACHE_MAX_STALENESS_SECONDS)
+
+def clear_favorites_cache() -> None:
+    """
+    Forget the cached favorites, e.g. after writing to the database outside of this module.
+    """
+    _favorites_cache.invalidate()
+
+def clear_movie_list(mode: str = "truncate", vacuum: bool = False) -> None:
+    """
+    Deletes all movies from the catalog.
+
+    Args:
+        mode (str): "truncate" keeps the schema and deletes rows in chunks of CLEAR_CHUNK_SIZE,
+            committing after each one so that readers are never blocked for long.
+            "recreate" drops the movies and movie_stats tables and recreates them by running
+            the schema migrations again.
+        vacuum (bool): Whether to reclaim the freed space with a VACUUM in a background thread.
+
+    Raises:
+        ValueError: If the mode is unknown.
+        sqlite3.Error: If any database error occurs.
+    """
+    if mode not in ("truncate", "recreate"):
+        raise ValueError(f"Invalid clear mode: '{mode}'. Must be 'truncate' or 'recreate'.")
+
+    try:
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            if mode == "recreate":
+                cursor.execute("BEGIN IMMEDIATE")
+                cursor.execute("DROP TABLE IF EXISTS movies")
+                cursor.execute("DROP TABLE IF EXISTS movie_stats")
+                cursor.execute("PRAGMA user_version = 0")
+                conn.commit()
+                upgrade_schema(conn)
+                _favorites_cache.invalidate()
+            else:
+                while True:
+                    cursor.execute(
+                        "DELETE FROM movies WHERE id IN (SELECT id FROM movies LIMIT ?)",
+                        (CLEAR_CHUNK_SIZE,)
+                    )
+                    conn.commit()
+                    _favorites_cache.invalidate()
+                    if cursor.rowcount < CLEAR_CHUNK_SIZE:
+                        break
+                # Restart IDs at 1 like a recreated table would, unless rows were added meanwhile
+                cursor.execute(
+                    "DELETE FROM sqlite_sequence WHERE name = 'movies' AND NOT EXISTS (SELECT 1 FROM movies)"
+                )
+                conn.commit()
+
+            logger.info("Catalog cleared successfully (%s).", mode)
 
     except sqlite3.Error as e:
         logger.error("Database error while clearing catalog: %s", str(e))
         raise e
+
+    if vacuum:
+        threading.Thread(target=_vacuum_database, name="movies-vacuum", daemon=True).start()
+
+def _vacuum_database() -> None:
+    """
+    Rebuilds the database file to return freed pages to the filesystem.
+    """
+    try:
+        with get_db_connection() as conn:
+            conn.cursor().execute("VACUUM")
+            logger.info("Database vacuumed.")
+    except sqlite3.Error as e:
+        logger.error("Database error while vacuuming: %s", str(e))
         
 
-def find_movie_by_name(name: str) -> Movie:
+def _favorite_target(name_or_id) -> tuple[str, str]:
     """
-    Search for a movie by name using the TMDB API.
+    Pick the column identifying a movie and a description for error messages.
 
     Args:
-        name (str): The name of the movie to search for.
+        name_or_id (str | int): The name or ID of the movie.
 
     Returns:
-        Movie: A Movie object containing the movie information, including favorite status.
+        tuple: The column name and a description of the movie.
+    """
+    if isinstance(name_or_id, int):
+        return "id", f"Movie with ID {name_or_id}"
+    return "name", f"Movie with name '{name_or_id}'"
+
+def set_favorite(name_or_id, value: bool) -> None:
+    """
+    Sets or clears the favorite status of a movie.
+
+    Args:
+        name_or_id (str | int): The name or ID of the movie.
+        value (bool): The favorite status to set.
 
     Raises:
-        ValueError: If no movies are found with the given name.
+        ValueError: If the movie does not exist in the database.
+        sqlite3.Error: If any database error occurs.
     """
-    url = f"{BASE_URL}/search/movie"
-    params = {'api_key': API_KEY, 'query': name}
-    
-    response = requests.get(url, params=params)
-    data = response.json()
-
-    if 'results' in data and data['results']:
-        random_movie = random.choice(data['results'])
-        movie_name = random_movie['title']
-        release_date = random_movie['release_date']
-        release_date = random_movie['release_date']
-        if release_date:
-            release_year = int(release_date[:4])
-        else:
-            release_year = "Unknown"
+    column, description = _favorite_target(name_or_id)
+    try:
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
 
-        genre_ids = random_movie['genre_ids']
-        genres_map = get_genres()
-        original_language = random_movie['original_language']
-        genres = [genres_map.get(genre_id, "Unknown") for genre_id in genre_ids]
+            # Update the favorite status; no matching row means the movie does not exist
+            cursor.execute(
+                f"UPDATE movies SET favorite = {'TRUE' if value else 'FALSE'} WHERE {column} = ?",
+                (name_or_id,)
+            )
 
-        
-        credits_url = f"{BASE_URL}/movie/{random_movie['id']}/credits"
-        credits_response = requests.get(credits_url, params={'api_key': API_KEY})
-        credits_data = credits_response.json()
-
-        director = "Unknown"
-        for crew_member in credits_data.get('crew', []):
-            if crew_member['job'] == 'Director':
-                director = crew_member['name']
-                break
-        add_movie_to_list(movie_name, release_year, director, genres, original_language)
-
-        return Movie(
-            name=movie_name,
-            year=release_year,
-            director=director, 
-            genres=genres,
-            original_language=original_language,
-        )
-    else:
-        raise ValueError("No movies found.")
-    
+            if cursor.rowcount == 0:
+                raise ValueError(f"{description} not found.")
+
+            conn.commit()
+            _favorites_cache.invalidate()
+
+            logger.info("%s marked as %s.", description, "favorite" if value else "not favorite")
+
+    except sqlite3.Error as e:
+        logger.error("Database error while updating favorite status: %s", str(e))
+        raise e
 
 def mark_movie_as_favorite(name: str) -> None:
     """
@@ -221,34 +506,144 @@ def mark_movie_as_favorite(name: str) -> None:
         ValueError: If the movie with the given name does not exist in the database.
         sqlite3.Error: If any database error occurs.
     """
+    set_favorite(name, True)
+
+def toggle_favorite(name_or_id) -> bool:
+    """
+    Flips the favorite status of a movie.
+
+    Args:
+        name_or_id (str | int): The name or ID of the movie.
+
+    Returns:
+        bool: The new favorite status.
+
+    Raises:
+        ValueError: If the movie does not exist in the database.
+        sqlite3.Error: If any database error occurs.
+    """
+    column, description = _favorite_target(name_or_id)
     try:
         with get_db_connection() as conn:
             cursor = conn.cursor()
+            cursor.execute(
+                f"UPDATE movies SET favorite = NOT favorite WHERE {column} = ? RETURNING favorite",
+                (name_or_id,)
+            )
+            row = cursor.fetchone()
 
-            # Check if the movie exists
-            cursor.execute("SELECT id FROM movies WHERE name = ?", (name,))
-            result = cursor.fetchone()
-
-            if result is None:
-                raise ValueError(f"Movie with name '{name}' not found.")
+            if row is None:
+                raise ValueError(f"{description} not found.")
 
-            # Update the favorite status
-            cursor.execute("UPDATE movies SET favorite = TRUE WHERE name = ?", (name,))
             conn.commit()
+            _favorites_cache.invalidate()
+
+            logger.info("%s favorite status toggled to %s.", description, bool(row[0]))
+            return bool(row[0])
+
+    except sqlite3.Error as e:
+        logger.error("Database error while toggling favorite status: %s", str(e))
+        raise e
+
+def _update_favorites(names_or_ids: list, assignment: str) -> dict:
+    """
+    Applies a favorite assignment to many movies, with one UPDATE per chunk of IDs or names.
+
+    Args:
+        names_or_ids (list): Names and/or IDs of the movies to update.
+        assignment (str): The SQL expression assigned to the favorite column.
+
+    Returns:
+        dict: The new favorite status of each movie that was found, keyed by name or ID.
 
-            logger.info("Movie '%s' marked as favorite.", name)
+    Raises:
+        sqlite3.Error: If any database error occurs.
+    """
+    ids = [item for item in names_or_ids if isinstance(item, int)]
+    names = [item for item in names_or_ids if not isinstance(item, int)]
+    updated = {}
+    try:
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            for column, keys in (("id", ids), ("name", names)):
+                for chunk in _chunks(keys, SQL_IN_CHUNK_SIZE):
+                    placeholders = ", ".join("?" * len(chunk))
+                    cursor.execute(
+                        f"UPDATE movies SET favorite = {assignment} WHERE {column} IN ({placeholders}) RETURNING {column}, favorite",
+                        chunk
+                    )
+                    updated.update((row[0], bool(row[1])) for row in cursor.fetchall())
+            conn.commit()
+            _favorites_cache.invalidate()
+            logger.info("Favorite status updated for %d movies.", len(updated))
 
     except sqlite3.Error as e:
-        logger.error("Database error while marking movie as favorite: %s", str(e))
+        logger.error("Database error while updating favorite status: %s", str(e))
         raise e
+
+    return updated
+
+def set_favorites(names_or_ids: list, value: bool) -> dict:
+    """
+    Sets or clears the favorite status of many movies in one transaction.
+
+    Args:
+        names_or_ids (list): Names and/or IDs of the movies to update.
+        value (bool): The favorite status to set.
+
+    Returns:
+        dict: The movies that were "updated" and those "not_found".
+
+    Raises:
+        sqlite3.Error: If any database error occurs.
+    """
+    names_or_ids = list(dict.fromkeys(names_or_ids))
+    updated = _update_favorites(names_or_ids, "TRUE" if value else "FALSE")
+    return {
+        'updated': [item for item in names_or_ids if item in updated],
+        'not_found': [item for item in names_or_ids if item not in updated]
+    }
+
+def toggle_favorites(names_or_ids: list) -> dict:
+    """
+    Flips the favorite status of many movies in one transaction.
+
+    Args:
+        names_or_ids (list): Names and/or IDs of the movies to update.
+
+    Returns:
+        dict: The movies that are now "favorite", now "not_favorite", and those "not_found".
+
+    Raises:
+        sqlite3.Error: If any database error occurs.
+    """
+    names_or_ids = list(dict.fromkeys(names_or_ids))
+    updated = _update_favorites(names_or_ids, "NOT favorite")
+    return {
+        'favorite': [item for item in names_or_ids if updated.get(item) is True],
+        'not_favorite': [item for item in names_or_ids if updated.get(item) is False],
+        'not_found': [item for item in names_or_ids if item not in updated]
+    }
     
 def list_favorite_movies() -> list:
     """
-    Fetches the names of all favorite movies from the database.
+    Fetches the names of all favorite movies, from memory unless the catalog changed.
 
     Returns:
         list: A list of movie names marked as favorite.
 
+    Raises:
+        sqlite3.Error: If any database error occurs.
+    """
+    return list(_favorites_cache.get('names', _query_favorite_movies))
+
+def _query_favorite_movies() -> tuple:
+    """
+    Fetches the names of all favorite movies from the database.
+
+    Returns:
+        tuple: The movie names marked as favorite.
+
     Raises:
         sqlite3.Error: If any database error occurs.
     """
@@ -259,7 +654,7 @@ def list_favorite_movies() -> list:
             results = cursor.fetchall()
 
             # Extract movie names from query results
-            favorite_movies = [row[0] for row in results]
+            favorite_movies = tuple(row[0] for row in results)
 
             logger.info("Favorite movies retrieved: %s", favorite_movies)
             return favorite_movies
@@ -268,6 +663,81 @@ def list_favorite_movies() -> list:
         logger.error("Database error while retrieving favorite movies: %s", str(e))
         raise e
 
+def list_favorite_movie_rows() -> tuple:
+    """
+    Fetches the details of all favorite movies as raw rows, from memory unless the catalog changed.
+
+    Returns:
+        tuple: (column names, list of row tuples), ready to be serialized without building Movie objects.
+
+    Raises:
+        sqlite3.Error: If any database error occurs.
+    """
+    return MOVIE_FIELDS, _favorites_cache.get('rows', _query_favorite_movie_rows)
+
+def _query_favorite_movie_rows() -> list:
+    """
+    Fetches the details of all favorite movies from the database.
+
+    Returns:
+        list: One (MOVIE_FIELDS...) tuple per favorite movie.
+
+    Raises:
+        sqlite3.Error: If any database error occurs.
+    """
+    try:
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f"SELECT {', '.join(MOVIE_FIELDS)} FROM movies WHERE favorite = TRUE")
+            rows = cursor.fetchall()
+            logger.info("Retrieved %d favorite movies", len(rows))
+            return rows
+
+    except sqlite3.Error as e:
+        logger.error("Database error while retrieving favorite movies: %s", str(e))
+        raise e
+
+def get_movie_stats(dimensions: tuple = STATS_DIMENSIONS, limit: int = 50) -> dict:
+    """
+    Reads the number of active movies in total and per year, language, genre or director.
+
+    The counts come from the movie_stats table, which triggers on the movies table keep up
+    to date, so the cost depends on the number of values returned, not on the catalog size.
+
+    Args:
+        dimensions (tuple): The breakdowns to return, among STATS_DIMENSIONS.
+        limit (int): The most values returned per breakdown, most frequent first.
+
+    Returns:
+        dict: {"total": int, dimension: [(value, count), ...] for each dimension}.
+
+    Raises:
+        ValueError: If a dimension is unknown or the limit is out of range.
+        sqlite3.Error: If any database error occurs.
+    """
+    unknown = [dimension for dimension in dimensions if dimension not in STATS_DIMENSIONS]
+    if unknown:
+        raise ValueError(f"Invalid stats dimension: '{unknown[0]}'. Must be one of {', '.join(STATS_DIMENSIONS)}.")
+    if not isinstance(limit, int) or not 0 < limit <= STATS_MAX_LIMIT:
+        raise ValueError(f"Invalid limit: {limit}. Must be an integer between 1 and {STATS_MAX_LIMIT}.")
+
+    try:
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute("SELECT count FROM movie_stats WHERE dimension = 'total' AND value = ''")
+            row = cursor.fetchone()
+            stats = {'total': row[0] if row else 0}
+            for dimension in dimensions:
+                cursor.execute(
+                    "SELECT value, count FROM movie_stats WHERE dimension = ? ORDER BY count DESC, value LIMIT ?",
+                    (dimension, limit)
+                )
+                stats[dimension] = cursor.fetchall()
+            return stats
+
+    except sqlite3.Error as e:
+        logger.error("Database error while reading movie stats: %s", str(e))
+        raise e
 
 ##############################################################
 #
@@ -275,10 +745,619 @@ def list_favorite_movies() -> list:
 #
 ##############################################################
 
-def find_movie_by_year(year: int) -> Movie:
+def _release_year(result: dict):
+    """
+    Extract the release year of a TMDB movie result.
+
+    Returns:
+        int | str: The year, or "Unknown" if the movie has no release date.
+    """
+    release_date = result.get('release_date')
+    return int(release_date[:4]) if release_date else "Unknown"
+
+def _fetch_director(movie_id: int, session=None) -> str:
+    """
+    Fetch the name of the director of a movie from its TMDB credits.
+
+    The credits are parsed as they stream in; the cast list is never built and parsing
+    stops at the first director. Concurrent lookups of the same movie share one request.
+
+    Args:
+        movie_id (int): The TMDB ID of the movie.
+        session (requests.Session, optional): Session to reuse connections from.
+
+    Returns:
+        str: The name of the first crew member credited as director, or "Unknown".
+    """
+    def fetch() -> str:
+        return _director_name(tmdb_stream(f"/movie/{movie_id}/credits", 'crew', session=session))
+
+    return tmdb_flight.do((f"/movie/{movie_id}/credits", 'director'), fetch)
+
+def _director_name(crew) -> str:
+    """
+    Find the first crew member credited as director, reading no further.
+
+    Returns:
+        str: Their name, or "Unknown".
+    """
+    return next((crew_member['name'] for crew_member in crew if crew_member['job'] == 'Director'), "Unknown")
+
+# Discover queries mapped to {"total_pages": int, "pages": [page numbers seen]}
+_discover_index = LRUCache(DISCOVER_CACHE_SIZE, ttl=DISCOVER_CACHE_TTL_SECONDS)
+# (discover query, page) mapped to the results of that page
+_discover_pages = LRUCache(DISCOVER_CACHE_SIZE, ttl=DISCOVER_CACHE_TTL_SECONDS)
+
+# Normalized director names mapped to TMDB person IDs
+_director_ids = LRUCache(DIRECTOR_CACHE_SIZE, ttl=DIRECTOR_CACHE_TTL_SECONDS)
+# Person IDs mapped to the movies they directed, as (title, year, genre_ids, language) tuples
+_filmographies = LRUCache(DIRECTOR_CACHE_SIZE, ttl=DIRECTOR_CACHE_TTL_SECONDS)
+
+def clear_tmdb_caches() -> None:
+    """
+    Forget every cached TMDB response: genres, discover pages and director filmographies.
+    """
+    _genres_cache.clear()
+    _discover_index.clear()
+    _discover_pages.clear()
+    _director_ids.clear()
+    _filmographies.clear()
+
+def _fetch_discover_page(query: tuple, page: int, session=None) -> list:
+    """
+    Fetch one page of a discover query and cache it along with the query's page count.
+
+    Args:
+        query (tuple): The discover parameters as sorted (name, value) pairs.
+        page (int): The page to fetch.
+        session (requests.Session, optional): Session to reuse connections from.
+
+    Returns:
+        list: The movie results of the page.
+    """
+    data = tmdb_get("/discover/movie", _discover_page_params(query, page), session=session)
+    return _cache_discover_page(query, page, data)
+
+def _discover_page_params(query: tuple, page: int) -> dict:
+    """
+    Build the TMDB parameters of one page of a discover query.
+    """
+    params = dict(query)
+    if page > 1:
+        params['page'] = page
+    return params
+
+def _cache_discover_page(query: tuple, page: int, data: dict) -> list:
+    """
+    Cache a discover page response along with the query's page count.
+
+    Returns:
+        list: The movie results of the page.
+    """
+    results = data.get('results') or []
+    _discover_pages.set((query, page), results)
+
+    entry = _discover_index.get(query)
+    if entry is None:
+        entry = {'total_pages': max(1, min(data.get('total_pages') or 1, DISCOVER_MAX_PAGE)), 'pages': []}
+        _discover_index.set(query, entry)
+    entry['pages'].append(page)
+    return results
+
+def _sample_discover(params: dict, session=None) -> list:
+    """
+    Fetch the results of a random page of a discover query.
+
+    The first call for a query fetches page 1 and learns the page count. Later calls pick a
+    random page, served from the cache when it was seen before.
+
+    Args:
+        params (dict): The discover parameters.
+        session (requests.Session, optional): Session to reuse connections from.
+
+    Returns:
+        list: The movie results of the page.
+    """
+    query = tuple(sorted(params.items()))
+    results, page = _plan_discover(query, defer=False)
+    if results is None:
+        results = _fetch_discover_page(query, page, session=session)
+    return results
+
+def _plan_discover(query: tuple, defer: bool) -> tuple:
+    """
+    Choose the discover page to pick from.
+
+    The first lookup of a query needs page 1, which tells the page count. Later lookups
+    pick a random page. If that page is not cached, a deferring caller is given a page
+    already seen to choose from, plus the page number to fetch into the cache alongside
+    its own work, so the extra page costs no latency.
+
+    Args:
+        query (tuple): The discover parameters as sorted (name, value) pairs.
+        defer (bool): Whether an uncached page may be returned for the caller to fetch.
+
+    Returns:
+        tuple: (cached results or None, page to fetch or None). With results, the page is
+            fetched alongside; without, it must be fetched to get results.
+    """
+    entry = _discover_index.get(query)
+    if entry is None:
+        return None, 1
+
+    page = random.randint(1, entry['total_pages'])
+    results = _discover_pages.get((query, page))
+    if results is not None:
+        return results, None
+    if defer:
+        seen_results = _discover_pages.get((query, random.choice(entry['pages'])))
+        if seen_results:
+            return seen_results, page
+    return None, page
+
+# TMDB discover parameter for each random movie pool dimension
+_DISCOVER_PARAMS = {
+    'year': 'primary_release_year',
+    'genre': 'with_genres',
+    'language': 'language',
+}
+
+def _prefetch_random_movies(key: tuple, count: int) -> list:
+    """
+    Resolve up to count random movies for a pool key, without storing them.
+
+    Args:
+        key (tuple): (dimension, value), e.g. ("year", 2020), ("genre", 28) or ("language", "fr").
+        count (int): Maximum number of movies to resolve.
+
+    Returns:
+        list: (TMDB ID, Movie) pairs for the resolved movies; invalid candidates are skipped.
+    """
+    dimension, value = key
+    with create_session(TMDB_BATCH_CONCURRENCY) as session:
+        results = _sample_discover({_DISCOVER_PARAMS[dimension]: value}, session=session)
+        candidates = random.sample(results, min(count, len(results)))
+        if not candidates:
+            return []
+        genres_map = get_genres(session=session)
+        with ThreadPoolExecutor(max_workers=min(TMDB_BATCH_CONCURRENCY, len(candidates))) as pool:
+            directors = list(pool.map(lambda result: _fetch_director(result['id'], session=session), candidates))
+
+    movies = []
+    for result, director in zip(candidates, directors):
+        release_year = _release_year(result)
+        genres = [genres_map.get(genre_id, "Unknown") for genre_id in result['genre_ids']]
+        try:
+            _validate_movie(release_year, genres, result['original_language'])
+        except ValueError:
+            continue
+        movies.append((result['id'], Movie(result['title'], release_year, director, genres, result['original_language'])))
+    return movies
+
+random_movie_pool = PrefetchPool(
+    _prefetch_random_movies,
+    size=MOVIE_POOL_SIZE,
+    low_water=MOVIE_POOL_LOW_WATER,
+    max_keys=MOVIE_POOL_MAX_KEYS,
+    idle_seconds=MOVIE_POOL_IDLE_SECONDS
+)
+
+def _parse_pool_keys(text: str) -> list:
+    """
+    Parse a MOVIE_POOL_KEYS setting, logging and skipping malformed entries so that a bad
+    entry never stops a worker from starting.
+
+    Args:
+        text (str): Comma-separated dimension:value entries, e.g. "year:2020,genre:28,language:fr".
+
+    Returns:
+        list: The valid pool keys, see _prefetch_random_movies.
+    """
+    keys = []
+    for entry in filter(None, (part.strip() for part in text.split(","))):
+        dimension, _, value = (part.strip() for part in entry.partition(":"))
+        if dimension == 'language' and value:
+            keys.append((dimension, value))
+            continue
+        try:
+            number = int(value)
+        except ValueError:
+            number = None
+        if dimension in _DISCOVER_PARAMS and number is not None and number >= (1900 if dimension == 'year' else 1):
+            keys.append((dimension, number))
+        else:
+            logger.warning("Ignoring invalid movie pool key: %s", entry)
+    return keys
+
+def start_movie_pool() -> None:
+    """
+    Warm the configured pool keys and start refilling them in the background.
+
+    The pool lives in process memory, so this must run in every process that serves
+    requests (e.g. each gunicorn worker). Does nothing if MOVIE_POOL_SIZE is 0.
+    """
+    if MOVIE_POOL_SIZE <= 0:
+        return
+    for key in _parse_pool_keys(MOVIE_POOL_KEYS):
+        random_movie_pool.register(key)
+    random_movie_pool.start()
+    logger.info("Random movie pool started with %d movies per key", MOVIE_POOL_SIZE)
+
+def _like_pattern(text: str) -> str:
+    """
+    Escape the LIKE wildcards of text, for use with ESCAPE '\\'.
+    """
+    return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+def _fallback_condition(dimension: str, value) -> tuple:
+    """
+    Build the SQL condition matching the catalog movies of a search.
+
+    Args:
+        dimension (str): What the search is by: name, year, language, director or genre.
+        value: The value searched for; a genre ID for genres.
+
+    Returns:
+        tuple | None: (condition with ? placeholders, parameters), or None for a genre whose
+            name was never fetched.
+    """
+    if dimension == 'name':
+        return "name LIKE ? ESCAPE '\\'", (f"%{_like_pattern(value)}%",)
+    if dimension == 'year':
+        return "year = ?", (value,)
+    if dimension == 'language':
+        return "original_language = ?", (value,)
+    if dimension == 'director':
+        return "director = ? COLLATE NOCASE", (" ".join(value.split()),)
+    genre = _genres_cache.get_stale('genres', {}).get(value)
+    if genre is None:
+        return None
+    # Genres are stored as one comma-separated string
+    return "', ' || genres || ', ' LIKE ? ESCAPE '\\'", (f"%, {_like_pattern(genre)}, %",)
+
+def _catalog_fallback(error: TMDBUnavailableError, dimension: str, value) -> Movie:
+    """
+    Pick a random active catalog movie matching a search, for when TMDB is unavailable.
+
+    Args:
+        error (TMDBUnavailableError): The error that made TMDB unusable.
+        dimension (str): What the search is by, see _fallback_condition.
+        value: The value searched for.
+
+    Returns:
+        Movie: The movie, marked as stale.
+
+    Raises:
+        TMDBUnavailableError: The original error, if no movie in the catalog matches.
+        sqlite3.Error: If any database error occurs.
+    """
+    query = _fallback_condition(dimension, value)
+    if query is None:
+        raise error
+    condition, params = query
+    try:
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(
+                f"SELECT {', '.join(MOVIE_FIELDS)}, favorite FROM movies "
+                f"WHERE deleted = FALSE AND {condition} ORDER BY random() LIMIT 1",
+                params
+            )
+            row = cursor.fetchone()
+    except sqlite3.Error as e:
+        logger.error("Database error while falling back to the catalog: %s", str(e))
+        raise e
+
+    if row is None:
+        raise error
+    name, year, director, genres, original_language, favorite = row
+    logger.warning("TMDB is unavailable (%s), serving '%s' from the catalog", str(error), name)
+    return Movie(name, year, director, genres.split(", "), original_language, bool(favorite), stale=True)
+
+def _resolve_movie_by_name(name: str, genres_map: dict, session) -> Movie:
+    """
+    Search TMDB for a title and build a Movie from a random match, without storing it.
+
+    Args:
+        name (str): The name of the movie to search for.
+        genres_map (dict): Genre IDs mapped to names, fetched once per batch.
+        session (requests.Session): Session shared by the batch.
+
+    Returns:
+        Movie: The resolved movie.
+
+    Raises:
+        ValueError: If no movies are found or the match has invalid fields.
+    """
+    data = tmdb_get("/search/movie", {'query': name}, session=session)
+    if not data.get('results'):
+        raise ValueError("No movies found.")
+
+    random_movie = random.choice(data['results'])
+    release_year = _release_year(random_movie)
+    genres = [genres_map.get(genre_id, "Unknown") for genre_id in random_movie['genre_ids']]
+    original_language = random_movie['original_language']
+    _validate_movie(release_year, genres, original_language)
+
+    return Movie(
+        name=random_movie['title'],
+        year=release_year,
+        director=_fetch_director(random_movie['id'], session=session),
+        genres=genres,
+        original_language=original_language,
+    )
+
+def find_movies_by_names(names: list, concurrency: int = TMDB_BATCH_CONCURRENCY):
+    """
+    Search TMDB for many titles concurrently and add the matches to the database.
+
+    Titles are deduplicated and looked up on a bounded thread pool sharing one HTTP session.
+    Genres are fetched once for the whole batch. Matches are inserted in a single transaction
+    once the batch is done (movies already in the database are skipped).
+
+    Args:
+        names (list): The names of the movies to search for.
+        concurrency (int): Maximum number of titles looked up at the same time.
+
+    Yields:
+        tuple: (name, Movie) for each distinct title in input order as soon as it is resolved,
+        or (name, ValueError) if the title could not be resolved, or (name, TMDBUnavailableError)
+        if TMDB could not answer.
+    """
+    unique_names = list(dict.fromkeys(name for name in names if name))
+    found = []
+    with create_session(concurrency) as session, ThreadPoolExecutor(max_workers=concurrency) as pool:
+        genres_map = get_genres(session=session)
+        futures = [pool.submit(_resolve_movie_by_name, name, genres_map, session) for name in unique_names]
+        try:
+            for name, future in zip(unique_names, futures):
+                try:
+                    movie = future.result()
+                except (ValueError, TMDBUnavailableError) as e:
+                    yield name, e
+                    continue
+                found.append(movie)
+                yield name, movie
+        finally:
+            for future in futures:
+                future.cancel()
+            add_movies_to_list(found)
+
+def _directed_movies(crew) -> tuple:
+    """
+    Keep the movies a person directed from their crew credits.
+
+    Returns:
+        tuple: (title, year, genre_ids, original_language) tuples.
+    """
+    return tuple(
+        (movie['title'], _release_year(movie), tuple(movie.get('genre_ids', ())), movie['original_language'])
+        for movie in crew
+        if movie['job'] == 'Director'
+    )
+
+##############################################################
+#
+# async find_movie functions
+#
+# The searches behind the search routes: TMDB is called with the async client, so a search
+# waiting on TMDB holds no thread. Database work, which is short, runs on the database
+# threads, see run_db.
+#
+##############################################################
+
+async def aget_genres() -> dict:
+    """
+    Async version of get_genres, sharing its cache.
+
+    Returns:
+        dict: A dictionary mapping genre IDs to genre names.
+
+    Raises:
+        TMDBUnavailableError: If TMDB is unavailable and no list was ever fetched.
+    """
+    genres = _genres_cache.get('genres')
+    if genres is not None:
+        return genres
+
+    try:
+        data = await atmdb_get("/genre/movie/list")
+    except TMDBUnavailableError as e:
+        return _stale_genres(e)
+    return _cache_genres(data)
+
+async def _afetch_director(movie_id: int) -> str:
+    """
+    Async version of _fetch_director, streaming the credits the same way.
+    """
+    async def fetch() -> str:
+        crew = atmdb_stream(f"/movie/{movie_id}/credits", 'crew')
+        try:
+            async for crew_member in crew:
+                if crew_member['job'] == 'Director':
+                    return crew_member['name']
+            return "Unknown"
+        finally:
+            await crew.aclose()
+
+    return await tmdb_flight.ado((f"/movie/{movie_id}/credits", 'director'), fetch)
+
+async def _astore_random_result(results: list) -> Movie:
+    """
+    Pick a random TMDB movie result, resolve its genres and director, and add it to the database.
+
+    Genres and director are fetched concurrently.
+
+    Args:
+        results (list): Non-empty list of TMDB movie results.
+
+    Returns:
+        Movie: The stored movie.
+
+    Raises:
+        ValueError: If the movie cannot be stored (invalid fields or already in the database).
+    """
+    random_movie = random.choice(results)
+    movie_name = random_movie['title']
+    release_year = _release_year(random_movie)
+    original_language = random_movie['original_language']
+
+    genres_map, director = await asyncio.gather(aget_genres(), _afetch_director(random_movie['id']))
+    genres = [genres_map.get(genre_id, "Unknown") for genre_id in random_movie['genre_ids']]
+
+    await run_db(add_movie_to_list, movie_name, release_year, director, genres, original_language)
+
+    return Movie(
+        name=movie_name,
+        year=release_year,
+        director=director,
+        genres=genres,
+        original_language=original_language,
+    )
+
+async def _afetch_discover_page(query: tuple, page: int) -> list:
+    """
+    Async version of _fetch_discover_page, sharing its caches.
+    """
+    data = await atmdb_get("/discover/movie", _discover_page_params(query, page))
+    return _cache_discover_page(query, page, data)
+
+async def _astore_discover_result(params: dict, not_found_message: str) -> Movie:
+    """
+    Store a random movie from a random page of a discover query.
+
+    An uncached page is fetched concurrently with the credits of a movie from a page
+    already seen, see _plan_discover.
+
+    Args:
+        params (dict): The discover parameters.
+        not_found_message (str): The error message if the query has no results.
+
+    Returns:
+        Movie: The stored movie.
+
+    Raises:
+        ValueError: If the query has no results or the movie cannot be stored.
+    """
+    query = tuple(sorted(params.items()))
+    results, next_page = _plan_discover(query, defer=True)
+    if results is None:
+        results, next_page = await _afetch_discover_page(query, next_page), None
+    if not results:
+        raise ValueError(not_found_message)
+    if next_page is None:
+        return await _astore_random_result(results)
+
+    warm = asyncio.ensure_future(_afetch_discover_page(query, next_page))
+    try:
+        return await _astore_random_result(results)
+    finally:
+        try:
+            await warm
+        except Exception as e:
+            logger.warning("Failed to fetch discover page %d: %s", next_page, str(e))
+
+async def _afind_director_id(director_name: str):
+    """
+    Look up the TMDB person ID of a director, cached by normalized name.
+
+    Args:
+        director_name (str): The name of the director.
+
+    Returns:
+        int | None: The ID of the best match, or None if TMDB knows no such person.
+    """
+    key = " ".join(director_name.split()).casefold()
+    person_id = _director_ids.get(key)
+    if person_id is None:
+        data = await atmdb_get("/search/person", {'query': director_name})
+        if not data.get('results'):
+            return None
+        person_id = data['results'][0]['id']
+        _director_ids.set(key, person_id)
+    return person_id
+
+async def _adirector_filmography(person_id: int) -> tuple:
+    """
+    Fetch the movies a person directed, cached by person ID.
+
+    The credits are parsed as they stream in and only the fields needed to build a Movie
+    are kept, never the full cast and crew lists. Concurrent cache misses for the same
+    person share one request.
+
+    Args:
+        person_id (int): The TMDB person ID.
+
+    Returns:
+        tuple: (title, year, genre_ids, original_language) tuples, one per directed movie.
+    """
+    async def fetch() -> tuple:
+        crew = atmdb_stream(f"/person/{person_id}/movie_credits", 'crew')
+        try:
+            filmography = _directed_movies([movie async for movie in crew if movie['job'] == 'Director'])
+        finally:
+            await crew.aclose()
+        _filmographies.set(person_id, filmography)
+        return filmography
+
+    filmography = _filmographies.get(person_id)
+    if filmography is None:
+        filmography = await tmdb_flight.ado((f"/person/{person_id}/movie_credits", 'director'), fetch)
+    return filmography
+
+async def _astore_pooled_movie(key: tuple):
+    """
+    Draw a prefetched movie for a key and add it to the database.
+
+    Args:
+        key (tuple): The pool key, see _prefetch_random_movies.
+
+    Returns:
+        Movie | None: The stored movie, or None if the pool has nothing for the key.
+
+    Raises:
+        ValueError: If the movie is already in the database.
+    """
+    movie = random_movie_pool.draw(key)
+    if movie is not None:
+        await run_db(add_movie_to_list, movie.name, movie.year, movie.director, movie.genres, movie.original_language)
+    return movie
+
+async def afind_movie_by_name(name: str) -> Movie:
+    """
+    Search for a movie by name using the TMDB API.
+
+    While TMDB is unavailable, a catalog movie whose name contains the search is returned,
+    marked as stale.
+
+    Args:
+        name (str): The name of the movie to search for.
+
+    Returns:
+        Movie: A Movie object containing the movie information, including favorite status.
+
+    Raises:
+        ValueError: If no movies are found with the given name.
+        TMDBUnavailableError: If TMDB is unavailable and no catalog movie matches.
+    """
+    if not name:
+        raise ValueError("No movies found.")
+
+    try:
+        data = await atmdb_get("/search/movie", {'query': name})
+
+        if data.get('results'):
+            return await _astore_random_result(data['results'])
+    except TMDBUnavailableError as e:
+        return await run_db(_catalog_fallback, e, 'name', name)
+    raise ValueError("No movies found.")
+
+async def afind_movie_by_year(year: int) -> Movie:
     """
     Search for a random movie from a specific year using the TMDB API.
 
+    While TMDB is unavailable, a catalog movie from that year is returned, marked as stale.
+
     Args:
         year (int): The year to search for movies.
 
@@ -287,56 +1366,29 @@ def find_movie_by_year(year: int) -> Movie:
 
     Raises:
         ValueError: If no movies are found for the given year or if the year is invalid.
+        TMDBUnavailableError: If TMDB is unavailable and no catalog movie matches.
     """
-    url = f"{BASE_URL}/discover/movie"
-    params = {'api_key': API_KEY, 'primary_release_year': year}
-    
-    response = requests.get(url, params=params)
-    data = response.json()
-
     if not isinstance(year, int):
         raise ValueError("Year must be an integer")
+    if year < 1900:
+        # Such movies could not be stored anyway, skip the upstream call
+        raise ValueError(f"No movies found for the year: '{year}'.")
 
-    if 'results' in data and data['results']:
-        random_movie = random.choice(data['results'])
-        movie_name = random_movie['title']
-        release_date = random_movie['release_date']
-        release_date = random_movie['release_date']
-        if release_date:
-            release_year = int(release_date[:4])
-        else:
-            release_year = "Unknown"
-
-        genre_ids = random_movie['genre_ids']
-        genres_map = get_genres()
-        original_language = random_movie['original_language']
-        genres = [genres_map.get(genre_id, "Unknown") for genre_id in genre_ids]
+    movie = await _astore_pooled_movie(('year', year))
+    if movie is not None:
+        return movie
 
-        
-        credits_url = f"{BASE_URL}/movie/{random_movie['id']}/credits"
-        credits_response = requests.get(credits_url, params={'api_key': API_KEY})
-        credits_data = credits_response.json()
-
-        director = "Unknown"
-        for crew_member in credits_data.get('crew', []):
-            if crew_member['job'] == 'Director':
-                director = crew_member['name']
-                break
-        add_movie_to_list(movie_name, release_year, director, genres, original_language)
-        return Movie(
-            movie_name,
-            release_year,
-            director,
-            genres,
-            original_language
-        )
-    else:
-        raise ValueError(f"No movies found for the year: '{year}'.")
+    try:
+        return await _astore_discover_result({'primary_release_year': year}, f"No movies found for the year: '{year}'.")
+    except TMDBUnavailableError as e:
+        return await run_db(_catalog_fallback, e, 'year', year)
 
-def find_movie_by_language(language_code: str) -> Movie:
+async def afind_movie_by_language(language_code: str) -> Movie:
     """
     Search for movies by original language using the TMDB API.
 
+    While TMDB is unavailable, a catalog movie in that language is returned, marked as stale.
+
     Args:
         language_code (str): The language code to search for.
 
@@ -345,58 +1397,28 @@ def find_movie_by_language(language_code: str) -> Movie:
 
     Raises:
         ValueError: If no movies are found for the given language or if the language code is invalid.
+        TMDBUnavailableError: If TMDB is unavailable and no catalog movie matches.
     """
-    url = f"{BASE_URL}/discover/movie"
-    params = {'api_key': API_KEY, 'language': language_code}
-    
-    response = requests.get(url, params=params)
-    data = response.json()
-
     if not language_code:
         raise ValueError("Language code cannot be empty")
 
-    if 'results' in data and data['results']:
-        random_movie = random.choice(data['results'])
-        movie_name = random_movie['title']
-        release_date = random_movie['release_date']
-        release_date = random_movie['release_date']
-        if release_date:
-            release_year = int(release_date[:4])
-        else:
-            release_year = "Unknown"
+    movie = await _astore_pooled_movie(('language', language_code))
+    if movie is not None:
+        return movie
 
-        genre_ids = random_movie['genre_ids']
-        genres_map = get_genres()
-        original_language = random_movie['original_language']
-        genres = [genres_map.get(genre_id, "Unknown") for genre_id in genre_ids]
+    try:
+        return await _astore_discover_result({'language': language_code}, f"No movies found for the language: '{language_code}'.")
+    except TMDBUnavailableError as e:
+        return await run_db(_catalog_fallback, e, 'language', language_code)
 
-        
-        credits_url = f"{BASE_URL}/movie/{random_movie['id']}/credits"
-        credits_response = requests.get(credits_url, params={'api_key': API_KEY})
-        credits_data = credits_response.json()
-
-        director = "Unknown"
-        for crew_member in credits_data.get('crew', []):
-            if crew_member['job'] == 'Director':
-                director = crew_member['name']
-                break
-
-        add_movie_to_list(movie_name, release_year, director, genres, original_language)
-
-        return Movie(
-            movie_name,
-            release_year,
-            director,
-            genres,
-            original_language
-        )
-    else:
-        raise ValueError(f"Invalid original language: '{original_language}'. Must be a non-empty string.")
-    
-def find_movie_by_director(director_name: str) -> Movie:
+async def afind_movie_by_director(director_name: str) -> Movie:
     """
     Search for movies by a specific director using the TMDB API.
 
+    Director IDs and filmographies are cached, so repeated searches for a director need no
+    upstream calls. While TMDB is unavailable, a catalog movie by that director is returned,
+    marked as stale.
+
     Args:
         director_name (str): The name of the director to search for.
 
@@ -405,56 +1427,43 @@ def find_movie_by_director(director_name: str) -> Movie:
 
     Raises:
         ValueError: If the director is not found or if no movies are found for the director.
+        TMDBUnavailableError: If TMDB is unavailable and no catalog movie matches.
     """
-    url = f"{BASE_URL}/search/person"
-    params = {'api_key': API_KEY, 'query': director_name}
-    
-    response = requests.get(url, params=params)
-    data = response.json()
+    if not director_name:
+        raise ValueError("Director not found.")
 
-    if 'results' in data and data['results']:
-        person_id = data['results'][0]['id']
-
-        url = f"{BASE_URL}/person/{person_id}/movie_credits"
-        response = requests.get(url, params={'api_key': API_KEY})
-        credits = response.json()
+    try:
+        person_id = await _afind_director_id(director_name)
+        if person_id is None:
+            raise ValueError("Director not found.")
 
-        directed_movies = [movie for movie in credits['crew'] if movie['job'] == 'Director']
-        
-        if directed_movies:
-            random_movie = random.choice(directed_movies)
-            movie_name = random_movie['title']
-            release_date = random_movie['release_date']
-            release_date = random_movie['release_date']
-            if release_date:
-                release_year = int(release_date[:4])
-            else:
-                release_year = "Unknown"
-
-            genre_ids = random_movie['genre_ids']
-            genres_map = get_genres()
-            original_language = random_movie['original_language']
-            genres = [genres_map.get(genre_id, "Unknown") for genre_id in genre_ids]
-                
-            add_movie_to_list(movie_name, release_year, director_name, genres, original_language)
-            
-            return Movie(
-                movie_name,
-                release_year,
-                director_name,
-                genres,
-                original_language
-            )
-        else:
+        directed_movies = await _adirector_filmography(person_id)
+        if not directed_movies:
             raise ValueError(f"No movies found with the director '{director_name}'.")
-    else: 
-        raise ValueError(f"Director not found.")
 
+        movie_name, release_year, genre_ids, original_language = random.choice(directed_movies)
+        genres_map = await aget_genres()
+    except TMDBUnavailableError as e:
+        return await run_db(_catalog_fallback, e, 'director', director_name)
 
-def find_movie_by_genre(genre_id: int) -> Movie:
+    genres = [genres_map.get(genre_id, "Unknown") for genre_id in genre_ids]
+    await run_db(add_movie_to_list, movie_name, release_year, director_name, genres, original_language)
+
+    return Movie(
+        movie_name,
+        release_year,
+        director_name,
+        genres,
+        original_language
+    )
+
+async def afind_movie_by_genre(genre_id: int) -> Movie:
     """
     Search for movies by genre using the TMDB API.
 
+    While TMDB is unavailable, a catalog movie of that genre is returned, marked as stale,
+    provided the genre names were fetched before.
+
     Args:
         genre_id (int): The ID of the genre to search for.
 
@@ -463,46 +1472,16 @@ def find_movie_by_genre(genre_id: int) -> Movie:
 
     Raises:
         ValueError: If no movies are found for the given genre or if the genre ID is invalid.
+        TMDBUnavailableError: If TMDB is unavailable and no catalog movie matches.
     """
-    url = f"{BASE_URL}/discover/movie"
-    params = {'api_key': API_KEY, 'with_genres': genre_id}
-    
-    response = requests.get(url, params=params)
-    data = response.json()
-
-    if 'results' in data and data['results']:
-        random_movie = random.choice(data['results'])
-        movie_name = random_movie['title']
-        release_date = random_movie['release_date']
-        if release_date:
-            release_year = int(release_date[:4])
-        else:
-            release_year = "Unknown"
+    if not isinstance(genre_id, int) or genre_id <= 0:
+        raise ValueError(f"No movies found with the genre with ID '{genre_id}'.")
 
-        genre_ids = random_movie['genre_ids']
-        genres_map = get_genres()
-        original_language = random_movie['original_language']
-        genres = [genres_map.get(genre_id, "Unknown") for genre_id in genre_ids]
+    movie = await _astore_pooled_movie(('genre', genre_id))
+    if movie is not None:
+        return movie
 
-        
-        credits_url = f"{BASE_URL}/movie/{random_movie['id']}/credits"
-        credits_response = requests.get(credits_url, params={'api_key': API_KEY})
-        credits_data = credits_response.json()
-
-        director = "Unknown"
-        for crew_member in credits_data.get('crew', []):
-            if crew_member['job'] == 'Director':
-                director = crew_member['name']
-                break
-        
-        add_movie_to_list(movie_name, release_year, director, genres, original_language)
-
-        return Movie(
-            movie_name,
-            release_year,
-            director,
-            genres,
-            original_language,
-        )
-    else:
-        raise ValueError(f"No movies found with the genre with ID '{genre_id}'.")
+    try:
+        return await _astore_discover_result({'with_genres': genre_id}, f"No movies found with the genre with ID '{genre_id}'.")
+    except TMDBUnavailableError as e:
+        return await run_db(_catalog_fallback, e, 'genre', genre_id)
@@ -1,17 +1,35 @@
 import hashlib
 import logging
 import os
+import threading
 
+from sqlalchemy import inspect, insert, select, text, update
 from sqlalchemy.exc import IntegrityError
 
 from movie_collection.db import db
-from music_collection.utils.logger import configure_logger
+from movie_collection.utils.cache import LRUCache
+from movie_collection.utils.logger import configure_logger
 
 
 logger = logging.getLogger(__name__)
 configure_logger(logger)
 
 
+# username -> (salt, password hash, session generation, version) for recently checked users.
+# The TTL bounds how long a password changed or a session ended by another worker stays valid here.
+_credential_cache = LRUCache(
+    int(os.getenv("USER_CACHE_SIZE", "4096")),
+    ttl=float(os.getenv("USER_CACHE_TTL_SECONDS", "60"))
+)
+# Bumped on every invalidation so that a lookup racing with a password change
+# never stores the credentials it read before the change
+_credential_version = 0
+_credential_lock = threading.Lock()
+
+# Rows per INSERT batch and per IN (...) lookup in create_users
+USER_BATCH_CHUNK_SIZE = int(os.getenv("USER_BATCH_CHUNK_SIZE", "500"))
+
+
 class Users(db.Model):
     __tablename__ = 'users'
 
@@ -19,6 +37,21 @@ class Users(db.Model):
     username = db.Column(db.String(80), unique=True, nullable=False)
     salt = db.Column(db.String(32), nullable=False)  # 16-byte salt in hex
     password = db.Column(db.String(64), nullable=False)  # SHA-256 hash in hex
+    # Embedded in session tokens; bumped on logout and password change to end every session
+    session_generation = db.Column(db.Integer, nullable=False, default=0, server_default=text('0'))
+
+    @classmethod
+    def upgrade_schema(cls) -> None:
+        """
+        Add the columns introduced after the users table was created. Run after db.create_all().
+        """
+        columns = {column['name'] for column in inspect(db.engine).get_columns(cls.__tablename__)}
+        if 'session_generation' not in columns:
+            with db.engine.begin() as conn:
+                conn.execute(text(
+                    f"ALTER TABLE {cls.__tablename__} ADD COLUMN session_generation INTEGER NOT NULL DEFAULT 0"
+                ))
+            logger.info("Added session_generation to the %s table", cls.__tablename__)
 
     @classmethod
     def _generate_hashed_password(cls, password: str) -> tuple[str, str]:
@@ -35,6 +68,97 @@ class Users(db.Model):
         hashed_password = hashlib.sha256((password + salt).encode()).hexdigest()
         return salt, hashed_password
 
+    @classmethod
+    def _invalidate_credentials(cls, username: str) -> None:
+        """
+        Drop the cached credentials of a user.
+
+        Args:
+            username (str): The username whose cached credentials are dropped.
+        """
+        global _credential_version
+        with _credential_lock:
+            _credential_version += 1
+            _credential_cache.pop(username)
+
+    @classmethod
+    def clear_credential_cache(cls) -> None:
+        """
+        Drop all cached credentials.
+        """
+        global _credential_version
+        with _credential_lock:
+            _credential_version += 1
+            _credential_cache.clear()
+
+    @classmethod
+    def _get_credentials(cls, username: str) -> tuple[str, str, int]:
+        """
+        Fetch the salt, password hash and session generation of a user, from the cache when possible.
+
+        Only the needed columns are loaded, without building a Users object.
+
+        Args:
+            username (str): The username of the user.
+
+        Returns:
+            tuple: The salt, password hash and session generation, or None if the user does not exist.
+        """
+        cached = _credential_cache.get(username)
+        if cached is not None:
+            return cached[:3]
+
+        version = _credential_version
+        row = db.session.execute(
+            select(cls.salt, cls.password, cls.session_generation).where(cls.username == username)
+        ).first()
+        if row is None:
+            return None
+
+        with _credential_lock:
+            if version == _credential_version:
+                _credential_cache.set(username, (row.salt, row.password, row.session_generation, version))
+        return row.salt, row.password, row.session_generation
+
+    @classmethod
+    def get_session_generation(cls, username: str) -> int:
+        """
+        Get the session generation of a user, which session tokens must carry to be valid.
+
+        Served from the credential cache, so a bump made by another worker is seen within
+        USER_CACHE_TTL_SECONDS.
+
+        Args:
+            username (str): The username of the user.
+
+        Returns:
+            int: The generation, or None if the user does not exist.
+        """
+        credentials = cls._get_credentials(username)
+        return credentials[2] if credentials else None
+
+    @classmethod
+    def end_sessions(cls, username: str) -> None:
+        """
+        Invalidate every session token issued to a user so far, in every worker.
+
+        Args:
+            username (str): The username of the user.
+
+        Raises:
+            ValueError: If the user does not exist.
+        """
+        result = db.session.execute(
+            update(cls).where(cls.username == username).values(session_generation=cls.session_generation + 1)
+        )
+        if result.rowcount == 0:
+            db.session.rollback()
+            logger.info("User %s not found", username)
+            raise ValueError(f"User {username} not found")
+        db.session.commit()
+        cls._invalidate_credentials(username)
+        logger.info("Sessions ended for user: %s", username)
+
     @classmethod
     def create_user(cls, username: str, password: str) -> None:
         """
@@ -52,6 +176,7 @@ class Users(db.Model):
         try:
             db.session.add(new_user)
             db.session.commit()
+            cls._invalidate_credentials(username)
             logger.info("User successfully added to the database: %s", username)
         except IntegrityError:
             db.session.rollback()
@@ -62,6 +187,100 @@ class Users(db.Model):
             logger.error("Database error: %s", str(e))
             raise
 
+    @classmethod
+    def create_users(cls, accounts, chunk_size: int = USER_BATCH_CHUNK_SIZE) -> list[dict]:
+        """
+        Create many users at once using chunked bulk inserts.
+
+        Each chunk costs one lookup of existing usernames, one multi-row INSERT and one commit.
+        Every account is validated before anything is inserted.
+
+        Args:
+            accounts (iterable): (username, password) pairs.
+            chunk_size (int): Number of users inserted per statement and commit.
+
+        Returns:
+            list: One {"username": ..., "status": ...} dict per account, in input order. The status is
+            "created", "conflict" (the username exists or is repeated in the batch) or "invalid"
+            (the username or password is empty or not a string).
+        """
+        results = []
+        pending = []
+        seen = set()
+        for username, password in accounts:
+            result = {'username': username, 'status': 'created'}
+            results.append(result)
+            if not isinstance(username, str) or not isinstance(password, str) or not username or not password:
+                result['status'] = 'invalid'
+            elif username in seen:
+                result['status'] = 'conflict'
+            else:
+                seen.add(username)
+                pending.append((result, password))
+
+        for start in range(0, len(pending), chunk_size):
+            chunk = pending[start:start + chunk_size]
+            try:
+                cls._insert_user_chunk(chunk)
+                db.session.commit()
+            except IntegrityError:
+                # Another request created one of these usernames in the meantime
+                db.session.rollback()
+                cls._insert_users_one_by_one(chunk)
+            for result, _ in chunk:
+                if result['status'] == 'created':
+                    cls._invalidate_credentials(result['username'])
+
+        created = sum(1 for result in results if result['status'] == 'created')
+        logger.info("Bulk created %d of %d users", created, len(results))
+        return results
+
+    @classmethod
+    def _insert_user_chunk(cls, chunk: list) -> None:
+        """
+        Insert one chunk of create_users, marking usernames that already exist as conflicts.
+
+        Args:
+            chunk (list): (result dict, password) pairs whose results are updated in place.
+        """
+        usernames = [result['username'] for result, _ in chunk]
+        existing = set(db.session.execute(
+            select(cls.username).where(cls.username.in_(usernames))
+        ).scalars())
+
+        rows = []
+        for result, password in chunk:
+            if result['username'] in existing:
+                result['status'] = 'conflict'
+                continue
+            salt, hashed_password = cls._generate_hashed_password(password)
+            rows.append({'username': result['username'], 'salt': salt, 'password': hashed_password})
+        if rows:
+            db.session.execute(insert(cls), rows)
+
+    @classmethod
+    def _insert_users_one_by_one(cls, chunk: list) -> None:
+        """
+        Insert a chunk of create_users one user per commit, marking the usernames that turn out
+        to exist as conflicts, however many other requests are creating them at the same time.
+
+        Args:
+            chunk (list): (result dict, password) pairs whose results are updated in place.
+        """
+        for result, password in chunk:
+            if result['status'] != 'created':
+                continue
+            salt, hashed_password = cls._generate_hashed_password(password)
+            try:
+                db.session.execute(insert(cls), [
+                    {'username': result['username'], 'salt': salt, 'password': hashed_password}
+                ])
+                db.session.commit()
+            except IntegrityError:
+                db.session.rollback()
+                logger.info("Duplicate username: %s", result['username'])
+                result['status'] = 'conflict'
+
     @classmethod
     def check_password(cls, username: str, password: str) -> bool:
         """
@@ -77,17 +296,18 @@ class Users(db.Model):
         Raises:
             ValueError: If the user does not exist.
         """
-        user = cls.query.filter_by(username=username).first()
-        if not user:
+        credentials = cls._get_credentials(username)
+        if not credentials:
             logger.info("User %s not found", username)
             raise ValueError(f"User {username} not found")
-        hashed_password = hashlib.sha256((password + user.salt).encode()).hexdigest()
-        return hashed_password == user.password
+        salt, stored_password, _ = credentials
+        hashed_password = hashlib.sha256((password + salt).encode()).hexdigest()
+        return hashed_password == stored_password
 
     @classmethod
     def update_password(cls, username: str, new_password: str) -> None:
         """
-        Update the password for a user.
+        Update the password for a user, ending every session issued with the old one.
 
         Args:
             username (str): The username of the user.
@@ -96,13 +316,16 @@ class Users(db.Model):
         Raises:
             ValueError: If the user does not exist.
         """
-        user = cls.query.filter_by(username=username).first()
-        if not user:
+        salt, hashed_password = cls._generate_hashed_password(new_password)
+        result = db.session.execute(
+            update(cls).where(cls.username == username).values(
+                salt=salt, password=hashed_password, session_generation=cls.session_generation + 1
+            )
+        )
+        if result.rowcount == 0:
+            db.session.rollback()
             logger.info("User %s not found", username)
             raise ValueError(f"User {username} not found")
-
-        salt, hashed_password = cls._generate_hashed_password(new_password)
-        user.salt = salt
-        user.password = hashed_password
         db.session.commit()
+        cls._invalidate_credentials(username)
         logger.info("Password updated successfully for user: %s", username)
\ No newline at end of file
@@ -0,0 +1,253 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import contextvars
+import copy
+from inspect import iscoroutinefunction, ismethod
+import io
+import logging
+import sys
+
+from flask import request
+from werkzeug.exceptions import HTTPException
+
+from movie_collection.utils.logger import configure_logger
+
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+
+def build_environ(scope: dict, body: bytes) -> dict:
+    """
+    Build the WSGI environ of an ASGI HTTP request.
+
+    Args:
+        scope (dict): The ASGI connection scope.
+        body (bytes): The request body, read in full.
+
+    Returns:
+        dict: The environ.
+    """
+    root_path = scope.get("root_path", "")
+    path = scope["path"]
+    if root_path and path.startswith(root_path):
+        path = path[len(root_path):]
+    server = scope.get("server") or ("localhost", 80)
+    environ = {
+        "REQUEST_METHOD": scope["method"],
+        "SCRIPT_NAME": root_path.encode("utf-8").decode("latin-1"),
+        "PATH_INFO": path.encode("utf-8").decode("latin-1"),
+        "QUERY_STRING": scope.get("query_string", b"").decode("latin-1"),
+        "SERVER_NAME": server[0],
+        "SERVER_PORT": str(server[1] or 80),
+        "SERVER_PROTOCOL": f"HTTP/{scope.get('http_version', '1.1')}",
+        "wsgi.version": (1, 0),
+        "wsgi.url_scheme": scope.get("scheme", "http"),
+        "wsgi.input": io.BytesIO(body),
+        "wsgi.errors": sys.stderr,
+        "wsgi.multithread": True,
+        "wsgi.multiprocess": True,
+        "wsgi.run_once": False,
+    }
+    if scope.get("client"):
+        environ["REMOTE_ADDR"], environ["REMOTE_PORT"] = scope["client"][0], str(scope["client"][1])
+    for raw_name, raw_value in scope.get("headers", []):
+        name = raw_name.decode("latin-1").upper().replace("-", "_")
+        key = name if name in ("CONTENT_LENGTH", "CONTENT_TYPE") else f"HTTP_{name}"
+        value = raw_value.decode("latin-1")
+        environ[key] = f"{environ[key]},{value}" if key in environ else value
+    return environ
+
+
+class ASGIBridge:
+    """
+    Serves a Flask application to an ASGI server, running its async views on the event loop.
+
+    A request routed to an `async def` view is dispatched on the event loop of the server,
+    so while the view awaits (e.g. TMDB) it holds no thread, and one process can keep
+    hundreds of such requests in flight. Every other request runs the WSGI application on a
+    pool of `threads` threads, as a threaded WSGI server would, streamed responses included.
+
+    Async views must return buffered responses: the body is read on the event loop. Their
+    environ first goes through the middleware wrapped around `app.wsgi_app` (e.g. ProxyFix),
+    as it would on the WSGI path; the middleware must keep the application it wraps in its
+    `app` attribute, as the werkzeug middleware do.
+
+    Attributes:
+        app (Flask): The application.
+        threads (int): Threads running the WSGI application for the other views.
+        on_shutdown (list): Coroutine functions awaited when the server shuts down.
+    """
+
+    def __init__(self, app, threads: int = 4, on_shutdown: list = None):
+        """
+        Args:
+            app (Flask): The application.
+            threads (int): Threads running the WSGI application for the other views.
+            on_shutdown (list, optional): Coroutine functions awaited when the server shuts down.
+        """
+        self.app = app
+        self.threads = threads
+        self.on_shutdown = list(on_shutdown or [])
+        self._executor = None
+        self._middleware = self._environ_middleware(app)
+
+    async def __call__(self, scope: dict, receive, send) -> None:
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+            return
+        if scope["type"] != "http":
+            raise ValueError(f"Unsupported ASGI scope type: {scope['type']}")
+
+        environ = build_environ(scope, await self._read_body(receive))
+        # The middleware change the environ in place, and the WSGI path runs them again
+        app_environ = self._middleware(dict(environ), None)
+        if isinstance(app_environ, dict) and self._routes_to_async_view(app_environ):
+            await self._dispatch_async(app_environ, send)
+        else:
+            await self._run_wsgi(environ, send)
+
+    @staticmethod
+    def _environ_middleware(app):
+        """
+        Copy the middleware chain of app.wsgi_app around an application returning its environ.
+
+        Returns:
+            callable: A WSGI application returning the environ the Flask application would get,
+                or whatever a middleware answered without calling it.
+
+        Raises:
+            TypeError: If a middleware does not expose the application it wraps.
+        """
+        def environ_app(environ, start_response):
+            return environ
+
+        layers = []
+        wsgi = app.wsgi_app
+        while not (ismethod(wsgi) and wsgi.__self__ is app):
+            if not hasattr(wsgi, "app"):
+                raise TypeError(f"Cannot find the application wrapped by {wsgi!r}")
+            layers.append(wsgi)
+            wsgi = wsgi.app
+
+        chain = environ_app
+        for layer in reversed(layers):
+            layer = copy.copy(layer)
+            layer.app = chain
+            chain = layer
+        return chain
+
+    @staticmethod
+    async def _read_body(receive) -> bytes:
+        chunks = []
+        while True:
+            message = await receive()
+            if message["type"] == "http.disconnect":
+                break
+            chunks.append(message.get("body", b""))
+            if not message.get("more_body"):
+                break
+        return b"".join(chunks)
+
+    def _routes_to_async_view(self, environ: dict) -> bool:
+        if environ["REQUEST_METHOD"] == "OPTIONS":
+            # Answered by Flask without calling the view
+            return False
+        try:
+            rule, _ = self.app.url_map.bind_to_environ(environ).match(return_rule=True)
+        except HTTPException:
+            # Not found, wrong method or a redirect: let the WSGI application answer
+            return False
+        return iscoroutinefunction(self.app.view_functions.get(rule.endpoint))
+
+    async def _dispatch_async(self, environ: dict, send) -> None:
+        """
+        Run the request through Flask as wsgi_app would, awaiting the view on the event loop.
+        """
+        app = self.app
+        ctx = app.request_context(environ)
+        error = None
+        try:
+            try:
+                ctx.push()
+                try:
+                    rv = app.preprocess_request()
+                    if rv is None:
+                        rv = await app.view_functions[request.url_rule.endpoint](**request.view_args)
+                except Exception as e:
+                    rv = app.handle_user_exception(e)
+                response = app.finalize_request(rv)
+            except Exception as e:
+                error = e
+                response = app.handle_exception(e)
+            app_iter, status, headers = response.get_wsgi_response(environ)
+            try:
+                await self._send_start(send, status, headers)
+                for chunk in app_iter:
+                    if chunk:
+                        await send({"type": "http.response.body", "body": chunk, "more_body": True})
+                await send({"type": "http.response.body", "body": b"", "more_body": False})
+            finally:
+                if hasattr(app_iter, "close"):
+                    app_iter.close()
+        finally:
+            ctx.pop(error)
+
+    async def _run_wsgi(self, environ: dict, send) -> None:
+        """
+        Run the WSGI application on the thread pool, one step at a time.
+
+        Every step runs in the same copy of the context, so a streamed response finds the
+        request context it pushed whichever thread runs the next step.
+        """
+        loop = asyncio.get_running_loop()
+        context = contextvars.copy_context()
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.threads, thread_name_prefix="wsgi")
+
+        def run(fn, *args):
+            return loop.run_in_executor(self._executor, context.run, fn, *args)
+
+        started = []
+
+        def start_response(status, headers, exc_info=None):
+            started[:] = [status, headers]
+
+        app_iter = await run(self.app.wsgi_app, environ, start_response)
+        try:
+            iterator = iter(app_iter)
+            # start_response may only be called once the first chunk is produced
+            chunk = await run(next, iterator, None)
+            await self._send_start(send, *started)
+            while chunk is not None:
+                if chunk:
+                    await send({"type": "http.response.body", "body": chunk, "more_body": True})
+                chunk = await run(next, iterator, None)
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+        finally:
+            if hasattr(app_iter, "close"):
+                await run(app_iter.close)
+
+    @staticmethod
+    async def _send_start(send, status: str, headers: list) -> None:
+        await send({
+            "type": "http.response.start",
+            "status": int(status.split(" ", 1)[0]),
+            "headers": [(name.lower().encode("latin-1"), value.encode("latin-1")) for name, value in headers]
+        })
+
+    async def _lifespan(self, receive, send) -> None:
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                for fn in self.on_shutdown:
+                    try:
+                        await fn()
+                    except Exception as e:
+                        logger.error("Shutdown hook %s failed: %s", fn.__name__, str(e))
+                if self._executor is not None:
+                    self._executor.shutdown(wait=False)
+                await send({"type": "lifespan.shutdown.complete"})
+                return
@@ -0,0 +1,171 @@
+from collections import OrderedDict
+import threading
+import time
+
+
+_MISSING = object()
+
+
+class LRUCache:
+    """
+    Thread-safe, size-bounded LRU cache with an optional time-to-live.
+
+    Attributes:
+        maxsize (int): Maximum number of entries; the least recently used entry is evicted first.
+        ttl (float): Seconds an entry stays valid, or None to keep entries until evicted.
+        hits (int): Number of lookups served from the cache.
+        misses (int): Number of lookups that found no valid entry.
+    """
+
+    def __init__(self, maxsize: int, ttl: float = None):
+        if maxsize <= 0:
+            raise ValueError(f"Cache size must be a positive integer, got {maxsize}")
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        """
+        Look up a key and mark it as recently used.
+
+        Args:
+            key: The key to look up.
+            default: Value returned when the key is missing or expired.
+
+        Returns:
+            The cached value, or default.
+        """
+        with self._lock:
+            entry = self._entries.get(key, _MISSING)
+            if entry is _MISSING or (entry[1] is not None and entry[1] < time.monotonic()):
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def get_stale(self, key, default=None):
+        """
+        Look up a key even if it expired, e.g. to serve something while the source is down.
+
+        Expired entries stay until evicted or replaced. Recency and counters are not updated.
+
+        Args:
+            key: The key to look up.
+            default: Value returned when the key is missing.
+
+        Returns:
+            The cached value, or default.
+        """
+        with self._lock:
+            entry = self._entries.get(key, _MISSING)
+            return default if entry is _MISSING else entry[0]
+
+    def set(self, key, value) -> None:
+        """
+        Store a value, evicting the least recently used entry if the cache is full.
+
+        Args:
+            key: The key to store.
+            value: The value to store.
+        """
+        expires = time.monotonic() + self.ttl if self.ttl is not None else None
+        with self._lock:
+            self._entries[key] = (value, expires)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def pop(self, key) -> None:
+        """
+        Remove a key if present.
+
+        Args:
+            key: The key to remove.
+        """
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Remove every entry."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class VersionedCache:
+    """
+    Thread-safe read-through cache of values derived from versioned data.
+
+    Writes made by this process drop every entry through invalidate(). Writes made by
+    other processes are detected by comparing the data version an entry was loaded at
+    with the current one. That check is skipped while the entry is younger than
+    max_staleness seconds, so a hit then costs a single comparison.
+
+    Attributes:
+        max_staleness (float): Seconds an entry is served without checking the version.
+        hits (int): Number of lookups served from the cache.
+        misses (int): Number of lookups that loaded the value.
+    """
+
+    def __init__(self, get_version, max_staleness: float = 0.0):
+        """
+        Args:
+            get_version (callable): Returns the current data version, or None if unknown.
+            max_staleness (float): Seconds an entry is served without checking the version.
+        """
+        self.get_version = get_version
+        self.max_staleness = max_staleness
+        self.hits = 0
+        self.misses = 0
+        self._entries = {}
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def get(self, key, load):
+        """
+        Return the cached value for a key, loading it if missing or out of date.
+
+        Args:
+            key: The key to look up.
+            load (callable): Computes the value from the data.
+
+        Returns:
+            The value.
+        """
+        generation = self._generation
+        entry = self._entries.get(key)
+        if entry is not None:
+            value, version, checked_at = entry
+            now = time.monotonic()
+            if now - checked_at < self.max_staleness:
+                self.hits += 1
+                return value
+            if version is not None and self.get_version() == version:
+                with self._lock:
+                    # Do not put back an entry dropped while the version was being read
+                    if generation == self._generation:
+                        self._entries[key] = (value, version, now)
+                self.hits += 1
+                return value
+
+        self.misses += 1
+        # Read the version before the data, so a racing write can only make it look older
+        version = self.get_version()
+        value = load()
+        with self._lock:
+            # Do not store a value loaded while this process was writing
+            if generation == self._generation:
+                self._entries[key] = (value, version, time.monotonic())
+        return value
+
+    def invalidate(self) -> None:
+        """Drop every entry, e.g. after this process wrote to the data."""
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
@@ -0,0 +1,214 @@
+from collections import deque
+import logging
+import threading
+import time
+
+from movie_collection.utils.logger import configure_logger
+
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of making a call while the circuit is open."""
+
+
+class CircuitBreaker:
+    """
+    Stops calling a failing dependency for a while, then lets a few probe calls through.
+
+    The outcomes of the last `window` calls are kept. Once at least `min_calls` are known, the
+    circuit opens when the share of failed calls reaches `failure_rate`, or the share of calls
+    slower than `slow_call_seconds` reaches `slow_call_rate`. While it is open, calls fail at
+    once with CircuitOpenError. After `open_seconds` it is half-open: up to `half_open_calls`
+    probe calls go through, the circuit closes once they all succeed in time, and opens again
+    on the first one that does not.
+
+    Attributes:
+        name (str): Name used in logs and errors.
+        opened (int): Number of times the circuit opened.
+        rejected (int): Number of calls rejected while open.
+    """
+
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+    def __init__(self, name: str, failure_rate: float = 0.5, slow_call_rate: float = 0.5,
+                 slow_call_seconds: float = 5.0, window: int = 20, min_calls: int = 10,
+                 open_seconds: float = 30.0, half_open_calls: int = 1):
+        """
+        Args:
+            name (str): Name used in logs and errors.
+            failure_rate (float): Share of failed calls in the window that opens the circuit.
+            slow_call_rate (float): Share of slow calls in the window that opens the circuit.
+            slow_call_seconds (float): Duration from which a call counts as slow.
+            window (int): Number of recent calls considered.
+            min_calls (int): Calls needed in the window before the rates are applied.
+            open_seconds (float): How long the circuit stays open before probing.
+            half_open_calls (int): Probe calls let through while half-open.
+        """
+        self.name = name
+        self.failure_rate = failure_rate
+        self.slow_call_rate = slow_call_rate
+        self.slow_call_seconds = slow_call_seconds
+        self.min_calls = min_calls
+        self.open_seconds = open_seconds
+        self.half_open_calls = half_open_calls
+        self.opened = 0
+        self.rejected = 0
+        self._state = self.CLOSED
+        self._opened_at = 0.0
+        # (failed, slow) per recent call
+        self._outcomes = deque(maxlen=window)
+        self._probes = 0
+        self._probe_successes = 0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        """The current state: closed, open or half_open."""
+        with self._lock:
+            if self._state == self.OPEN and time.monotonic() >= self._opened_at + self.open_seconds:
+                return self.HALF_OPEN
+            return self._state
+
+    def retry_after(self) -> float:
+        """
+        Returns:
+            float: Seconds until the circuit lets probe calls through, 0 if it is not open.
+        """
+        with self._lock:
+            if self._state != self.OPEN:
+                return 0.0
+            return max(0.0, self._opened_at + self.open_seconds - time.monotonic())
+
+    def call(self, fn):
+        """
+        Call fn through the circuit.
+
+        Args:
+            fn (callable): Called with no arguments. Any Exception it raises counts as a failure;
+                a cancellation or interruption is not counted.
+
+        Returns:
+            The result of fn.
+
+        Raises:
+            CircuitOpenError: If the circuit is open, or half-open with every probe in flight.
+        """
+        self._acquire()
+        start = time.monotonic()
+        try:
+            result = fn()
+        except Exception:
+            self._record(False, time.monotonic() - start)
+            raise
+        except BaseException:
+            # Cancelled or interrupted: says nothing about the dependency
+            self._release()
+            raise
+        self._record(True, time.monotonic() - start)
+        return result
+
+    async def acall(self, fn):
+        """
+        Await fn() through the circuit, see call.
+
+        Args:
+            fn (callable): Returns the awaitable to run. Any Exception it raises counts as a
+                failure; a cancellation, e.g. asyncio.CancelledError, is not counted.
+
+        Returns:
+            The result of the awaitable.
+
+        Raises:
+            CircuitOpenError: If the circuit is open, or half-open with every probe in flight.
+        """
+        self._acquire()
+        start = time.monotonic()
+        try:
+            result = await fn()
+        except Exception:
+            self._record(False, time.monotonic() - start)
+            raise
+        except BaseException:
+            # Cancelled or interrupted: says nothing about the dependency
+            self._release()
+            raise
+        self._record(True, time.monotonic() - start)
+        return result
+
+    def _acquire(self) -> None:
+        with self._lock:
+            if self._state == self.OPEN:
+                if time.monotonic() < self._opened_at + self.open_seconds:
+                    self.rejected += 1
+                    raise CircuitOpenError(f"Circuit {self.name} is open")
+                self._state = self.HALF_OPEN
+                self._probes = 0
+                self._probe_successes = 0
+            if self._state == self.HALF_OPEN:
+                if self._probes >= self.half_open_calls:
+                    self.rejected += 1
+                    raise CircuitOpenError(f"Circuit {self.name} is half-open and probing")
+                self._probes += 1
+
+    def _release(self) -> None:
+        """Give back the probe slot of a call that ended without an outcome."""
+        with self._lock:
+            if self._state == self.HALF_OPEN and self._probes > 0:
+                self._probes -= 1
+
+    def _record(self, ok: bool, duration: float) -> None:
+        slow = duration >= self.slow_call_seconds
+        with self._lock:
+            if self._state == self.HALF_OPEN:
+                if not ok or slow:
+                    self._open("probe call failed" if not ok else "probe call was slow")
+                else:
+                    self._probe_successes += 1
+                    if self._probe_successes >= self.half_open_calls:
+                        self._state = self.CLOSED
+                        self._outcomes.clear()
+                        logger.info("Circuit %s closed", self.name)
+                return
+            if self._state == self.OPEN:
+                # Started before the circuit opened
+                return
+
+            self._outcomes.append((not ok, slow))
+            if len(self._outcomes) < self.min_calls:
+                return
+            failures = sum(failed for failed, _ in self._outcomes) / len(self._outcomes)
+            slow_calls = sum(slow for _, slow in self._outcomes) / len(self._outcomes)
+            if failures >= self.failure_rate:
+                self._open(f"{failures:.0%} of recent calls failed")
+            elif slow_calls >= self.slow_call_rate:
+                self._open(f"{slow_calls:.0%} of recent calls took over {self.slow_call_seconds}s")
+
+    def _open(self, reason: str) -> None:
+        self._state = self.OPEN
+        self._opened_at = time.monotonic()
+        self._outcomes.clear()
+        self.opened += 1
+        logger.warning("Circuit %s opened for %ss: %s", self.name, self.open_seconds, reason)
+
+    def stats(self) -> dict:
+        """
+        Counters for monitoring.
+
+        Returns:
+            dict: The state, the recent failed and slow calls, and the open and reject counts.
+        """
+        state = self.state
+        with self._lock:
+            return {
+                'state': state,
+                'recent_calls': len(self._outcomes),
+                'recent_failures': sum(failed for failed, _ in self._outcomes),
+                'recent_slow_calls': sum(slow for _, slow in self._outcomes),
+                'opened': self.opened,
+                'rejected': self.rejected
+            }
@@ -0,0 +1,134 @@
+import asyncio
+from collections import deque
+from contextlib import asynccontextmanager
+import time
+
+
+class LimiterFullError(Exception):
+    """Raised when a request cannot get a slot: the queue is full or the wait timed out."""
+
+
+class ConcurrencyLimiter:
+    """
+    Bounds the coroutines running a section at once, queueing the others in arrival order.
+
+    At most `limit` coroutines hold a slot; up to `max_waiting` more wait for one, each for at
+    most `max_wait_seconds`. A coroutine arriving at a full queue is rejected at once, so
+    overload shows up as fast errors rather than as ever longer waits. The time spent queued
+    is recorded for monitoring. Must be used from a single event loop.
+
+    Attributes:
+        limit (int): Coroutines holding a slot at most.
+        max_waiting (int): Coroutines waiting for a slot at most.
+        max_wait_seconds (float): How long a coroutine waits for a slot before giving up.
+        admitted (int): Number of coroutines that got a slot.
+        rejected (int): Number of coroutines turned away, queue full or wait timed out.
+    """
+
+    def __init__(self, limit: int, max_waiting: int = 0, max_wait_seconds: float = None):
+        """
+        Args:
+            limit (int): Coroutines holding a slot at most.
+            max_waiting (int): Coroutines waiting for a slot at most.
+            max_wait_seconds (float): How long a coroutine waits for a slot; None waits forever.
+        """
+        if limit <= 0:
+            raise ValueError(f"Concurrency limit must be a positive integer, got {limit}")
+        self.limit = limit
+        self.max_waiting = max_waiting
+        self.max_wait_seconds = max_wait_seconds
+        self.admitted = 0
+        self.rejected = 0
+        self.active = 0
+        self._waiters = deque()
+        self._queue_seconds = 0.0
+        self._max_queue_seconds = 0.0
+
+    async def acquire(self) -> float:
+        """
+        Wait for a slot.
+
+        Returns:
+            float: Seconds spent waiting.
+
+        Raises:
+            LimiterFullError: If the queue is full or the wait timed out.
+        """
+        start = time.monotonic()
+        if self.active < self.limit and not self._waiters:
+            self.active += 1
+        else:
+            if len(self._waiters) >= self.max_waiting:
+                self.rejected += 1
+                raise LimiterFullError(f"{len(self._waiters)} requests already waiting")
+            waiter = asyncio.get_running_loop().create_future()
+            self._waiters.append(waiter)
+            try:
+                # release() hands its slot over by resolving the future
+                await asyncio.wait_for(asyncio.shield(waiter), self.max_wait_seconds)
+            except asyncio.TimeoutError:
+                self._abandon(waiter)
+                self.rejected += 1
+                raise LimiterFullError(f"No slot within {self.max_wait_seconds}s")
+            except BaseException:
+                self._abandon(waiter)
+                raise
+
+        waited = time.monotonic() - start
+        self.admitted += 1
+        self._queue_seconds += waited
+        self._max_queue_seconds = max(self._max_queue_seconds, waited)
+        return waited
+
+    def _abandon(self, waiter) -> None:
+        if waiter.done() and not waiter.cancelled():
+            # The slot was handed over just as the wait ended, pass it on
+            self.release()
+        else:
+            waiter.cancel()
+            self._waiters.remove(waiter)
+
+    def release(self) -> None:
+        """Give a slot back, to the longest waiting coroutine if there is one."""
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.active -= 1
+
+    @asynccontextmanager
+    async def slot(self):
+        """
+        Hold a slot for the duration of an async with block.
+
+        Yields:
+            float: Seconds spent waiting for the slot.
+
+        Raises:
+            LimiterFullError: If the queue is full or the wait timed out.
+        """
+        waited = await self.acquire()
+        try:
+            yield waited
+        finally:
+            self.release()
+
+    def stats(self) -> dict:
+        """
+        Counters for monitoring.
+
+        Returns:
+            dict: The limits, the coroutines active and waiting now, the admitted and rejected
+                counts, and the average and longest time spent waiting in milliseconds.
+        """
+        return {
+            'limit': self.limit,
+            'max_waiting': self.max_waiting,
+            'active': self.active,
+            'waiting': len(self._waiters),
+            'admitted': self.admitted,
+            'rejected': self.rejected,
+            'avg_queue_ms': round(self._queue_seconds / self.admitted * 1000, 2) if self.admitted else 0.0,
+            'max_queue_ms': round(self._max_queue_seconds * 1000, 2)
+        }
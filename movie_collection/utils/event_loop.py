@@ -0,0 +1,69 @@
+import asyncio
+from concurrent.futures import Future
+import contextvars
+import os
+import threading
+
+
+_loop = None
+_loop_pid = None
+_loop_lock = threading.Lock()
+
+
+def get_background_loop() -> asyncio.AbstractEventLoop:
+    """
+    Get the event loop of this process that runs coroutines for synchronous callers.
+
+    The loop runs in a daemon thread started on first use, and again in a forked child,
+    since threads do not survive a fork.
+
+    Returns:
+        asyncio.AbstractEventLoop: The running loop.
+    """
+    global _loop, _loop_pid
+    with _loop_lock:
+        if _loop is None or _loop_pid != os.getpid():
+            _loop = asyncio.new_event_loop()
+            _loop_pid = os.getpid()
+            threading.Thread(target=_loop.run_forever, name="event-loop", daemon=True).start()
+        return _loop
+
+
+def run_coroutine(fn, *args, **kwargs):
+    """
+    Run a coroutine function on the background loop and wait for its result.
+
+    Coroutines from every thread share one loop, and with it the async TMDB client, the
+    request coalescing and the concurrency limits. The coroutine sees the context variables
+    of the caller, e.g. the Flask request. Must not be called from that loop.
+
+    Args:
+        fn (callable): The coroutine function.
+        *args: Positional arguments for fn.
+        **kwargs: Keyword arguments for fn.
+
+    Returns:
+        The result of the coroutine.
+
+    Raises:
+        Exception: Whatever the coroutine raised.
+    """
+    loop = get_background_loop()
+    context = contextvars.copy_context()
+    future = Future()
+
+    def transfer(task) -> None:
+        if task.cancelled():
+            future.cancel()
+        elif task.exception() is not None:
+            future.set_exception(task.exception())
+        else:
+            future.set_result(task.result())
+
+    def start() -> None:
+        # A task runs in a copy of the context it is created in
+        task = loop.create_task(fn(*args, **kwargs))
+        task.add_done_callback(transfer)
+
+    loop.call_soon_threadsafe(context.run, start)
+    return future.result()
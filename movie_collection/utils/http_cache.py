@@ -0,0 +1,52 @@
+from functools import wraps
+import logging
+import zlib
+
+from flask import Response, make_response, request
+
+from movie_collection.utils.logger import configure_logger
+
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+
+def conditional_get(get_version):
+    """
+    Decorator adding an ETag to a read route and answering If-None-Match with a 304.
+
+    The ETag combines the data version with the query string, so each variant of the
+    route gets its own tag. A matching request is answered without running the route.
+
+    Args:
+        get_version (callable): Returns the current version of the data the route reads,
+            or None to skip conditional handling.
+
+    Returns:
+        callable: The decorator.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            # Read the version before the data: a write in between only makes the tag older
+            # than the body, so the next request gets a fresh 200, never a stale 304
+            try:
+                version = get_version()
+            except Exception as e:
+                logger.error("Could not read the data version, serving without ETag: %s", str(e))
+                version = None
+            if version is None:
+                return view(*args, **kwargs)
+
+            etag = f"{version}-{zlib.crc32(request.query_string):08x}"
+            if request.if_none_match.contains(etag):
+                response = Response(status=304)
+                response.set_etag(etag)
+                return response
+
+            response = make_response(view(*args, **kwargs))
+            if response.status_code == 200:
+                response.set_etag(etag)
+            return response
+        return wrapper
+    return decorator
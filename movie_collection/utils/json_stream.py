@@ -0,0 +1,198 @@
+import codecs
+import json
+import re
+
+
+_decoder = json.JSONDecoder()
+
+# Text that could still be part of a number cut off by the end of a chunk
+_NUMBER_TAIL = re.compile(r'[0-9.eE+-]*\Z')
+# Separator after an array element, with the whitespace around it
+_ITEM_END = re.compile(r'[ \t\r\n]*([,\]])[ \t\r\n]*')
+
+# Yielded by the parser when it needs the next chunk; it is sent the chunk, or None at the end
+_MORE = object()
+_DONE = object()
+
+
+class _Reader:
+    """
+    Cursor over a JSON document arriving in chunks.
+
+    Values are decoded one at a time with the C decoder, and text before the cursor is
+    dropped, so memory holds at most one chunk plus the value being decoded.
+
+    The reader does no I/O: its methods are generators that yield _MORE whenever they need
+    the next chunk, so the same parser serves both iterators and async iterators of chunks.
+    """
+
+    def __init__(self):
+        self._text_decoder = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._pos = 0
+
+    def _fill(self):
+        """Append the next non-empty chunk to the buffer; returns False at the end of the document."""
+        while True:
+            chunk = yield _MORE
+            if chunk is None:
+                return False
+            text = self._text_decoder.decode(chunk) if isinstance(chunk, bytes) else chunk
+            if text:
+                self._buffer = self._buffer[self._pos:] + text
+                self._pos = 0
+                return True
+
+    def peek(self):
+        """Return the next non-whitespace character without consuming it."""
+        while True:
+            if self._pos >= len(self._buffer) and not (yield from self._fill()):
+                raise ValueError("Unexpected end of JSON document")
+            char = self._buffer[self._pos]
+            if char not in " \t\r\n":
+                return char
+            self._pos += 1
+
+    def expect(self, char: str):
+        """Consume the next non-whitespace character, which must be char."""
+        found = yield from self.peek()
+        if found != char:
+            raise ValueError(f"Expected '{char}' in JSON document, got '{found}'")
+        self._pos += 1
+
+    def read(self):
+        """Consume and decode the next value."""
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError as e:
+                if self._buffer[self._pos:self._pos + 1] in (" ", "\t", "\r", "\n"):
+                    yield from self.peek()
+                    continue
+                # Most likely cut off by the end of the chunk; retry with more text
+                if not (yield from self._fill()):
+                    raise ValueError(f"Invalid JSON document: {e}") from e
+                continue
+            # A number at the very end of the buffer may continue in the next chunk
+            if (isinstance(value, (int, float)) and _NUMBER_TAIL.match(self._buffer, end)
+                    and (yield from self._fill())):
+                continue
+            self._pos = end
+            return value
+
+    def items(self, keep: bool = True):
+        """Consume an array, decoding its elements one at a time and yielding them if keep is set."""
+        yield from self.expect("[")
+        if (yield from self.peek()) == "]":
+            self._pos += 1
+            return
+        while True:
+            value = yield from self.read()
+            if keep:
+                yield value
+            match = _ITEM_END.match(self._buffer, self._pos)
+            if match:
+                self._pos = match.end()
+                if match.group(1) == "]":
+                    return
+            elif (yield from self.peek()) == "]":
+                self._pos += 1
+                return
+            else:
+                yield from self.expect(",")
+
+    def skip(self):
+        """Consume the next value. Arrays are consumed element by element, never as a whole."""
+        if (yield from self.peek()) == "[":
+            yield from self.items(keep=False)
+        else:
+            yield from self.read()
+
+
+def _parse_array_items(key: str):
+    """
+    Parse a JSON object up to the end of one array field, yielding its elements and _MORE.
+    """
+    reader = _Reader()
+    yield from reader.expect("{")
+    if (yield from reader.peek()) == "}":
+        return
+    while True:
+        if (yield from reader.peek()) != '"':
+            raise ValueError("Expected a field name in JSON document")
+        name = yield from reader.read()
+        yield from reader.expect(":")
+        if name == key and (yield from reader.peek()) == "[":
+            yield from reader.items()
+            return
+        yield from reader.skip()
+        if (yield from reader.peek()) == "}":
+            return
+        yield from reader.expect(",")
+
+
+def _resume(parser, chunk=None):
+    """Resume the parser with a chunk, returning its next event or _DONE."""
+    try:
+        return parser.send(chunk)
+    except StopIteration:
+        return _DONE
+
+
+def iter_array_items(chunks, key: str):
+    """
+    Lazily decode the elements of one array field of a JSON object.
+
+    Fields before the array are decoded and discarded one element at a time, and nothing
+    after it is read, so a consumer that stops early never pays for the rest of the document.
+
+    Args:
+        chunks (iterable): The document as successive str or UTF-8 bytes chunks,
+            e.g. response.iter_content().
+        key (str): The name of the top-level field holding the array.
+
+    Yields:
+        The decoded elements of the array, in order. Nothing if the field is missing or not an array.
+
+    Raises:
+        ValueError: If the document is not a well-formed JSON object.
+    """
+    chunks = iter(chunks)
+    parser = _parse_array_items(key)
+    event = _resume(parser)
+    while event is not _DONE:
+        if event is _MORE:
+            event = _resume(parser, next(chunks, None))
+        else:
+            yield event
+            event = _resume(parser)
+
+
+async def aiter_array_items(chunks, key: str):
+    """
+    Async version of iter_array_items, for chunks arriving from an async iterator.
+
+    Args:
+        chunks (async iterable): The document as successive str or UTF-8 bytes chunks,
+            e.g. response.aiter_bytes().
+        key (str): The name of the top-level field holding the array.
+
+    Yields:
+        The decoded elements of the array, in order. Nothing if the field is missing or not an array.
+
+    Raises:
+        ValueError: If the document is not a well-formed JSON object.
+    """
+    chunks = chunks.__aiter__()
+    parser = _parse_array_items(key)
+    event = _resume(parser)
+    while event is not _DONE:
+        if event is _MORE:
+            try:
+                chunk = await chunks.__anext__()
+            except StopAsyncIteration:
+                chunk = None
+            event = _resume(parser, chunk)
+        else:
+            yield event
+            event = _resume(parser)
@@ -0,0 +1,51 @@
+import json
+
+from flask import Response, current_app
+
+try:
+    import orjson
+except ImportError:  # optional dependency, fall back to the standard library
+    orjson = None
+
+
+def dumps(payload) -> bytes:
+    """
+    Encode a payload as compact JSON, with orjson when it is installed.
+
+    Args:
+        payload: A JSON-serializable value; tuples are encoded as arrays.
+
+    Returns:
+        bytes: The UTF-8 encoded JSON document.
+    """
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload, separators=(',', ':')).encode()
+
+
+def json_response(payload, status: int = 200) -> Response:
+    """
+    Build a JSON response, with orjson when it is installed.
+
+    Args:
+        payload: A JSON-serializable value.
+        status (int): The HTTP status code.
+
+    Returns:
+        Response: The response, with an application/json content type.
+    """
+    return current_app.response_class(dumps(payload), status=status, mimetype='application/json')
+
+
+def rows_to_dicts(columns: tuple, rows: list) -> list:
+    """
+    Turn database rows into JSON objects without going through model objects.
+
+    Args:
+        columns (tuple): The column names, in row order.
+        rows (list): The row tuples, e.g. from cursor.fetchall().
+
+    Returns:
+        list[dict]: One {column: value} dict per row.
+    """
+    return [dict(zip(columns, row)) for row in rows]
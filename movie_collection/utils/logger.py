@@ -1,35 +1,68 @@
 import logging
 from logging.handlers import RotatingFileHandler
 import os
+import threading
+
+LOG_DIR = 'logs'
+LOG_FILE = os.path.join(LOG_DIR, 'auth.log')
+
+_handlers = None
+_handlers_lock = threading.Lock()
+
+
+class _LazyRotatingFileHandler(RotatingFileHandler):
+    """
+    Rotating file handler that creates the log directory and opens the file on the first
+    record rather than at import time.
+    """
+
+    def __init__(self, filename, **kwargs):
+        super().__init__(filename, delay=True, **kwargs)
+
+    def _open(self):
+        os.makedirs(os.path.dirname(self.baseFilename), exist_ok=True)
+        return super()._open()
+
+
+def _get_handlers() -> tuple:
+    """
+    Build the file and console handlers once; every configured logger shares them.
+    """
+    global _handlers
+    with _handlers_lock:
+        if _handlers is None:
+            # File Handler - rotates log files when they reach 1MB
+            file_handler = _LazyRotatingFileHandler(
+                LOG_FILE,
+                maxBytes=1024 * 1024,  # 1MB
+                backupCount=5
+            )
+            file_handler.setFormatter(
+                logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+            )
+
+            # Console Handler
+            console_handler = logging.StreamHandler()
+            console_handler.setFormatter(
+                logging.Formatter('%(levelname)s - %(message)s')
+            )
+            _handlers = (file_handler, console_handler)
+        return _handlers
+
 
 def configure_logger(logger, log_level=logging.INFO):
     """
     Configure logger with file and console handlers.
 
+    The handlers are created once and shared by every logger, so all modules write through
+    one open log file, which is only opened when the first record is written. Calling this
+    again for the same logger only updates its level.
+
     Args:
         logger: Logger instance to configure
         log_level: Logging level (default: INFO)
     """
     logger.setLevel(log_level)
-    
-    # Create logs directory if it doesn't exist
-    if not os.path.exists('logs'):
-        os.makedirs('logs')
-    
-    # File Handler - rotates log files when they reach 1MB
-    file_handler = RotatingFileHandler(
-        'logs/auth.log', 
-        maxBytes=1024 * 1024,  # 1MB
-        backupCount=5
-    )
-    file_handler.setFormatter(
-        logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-    )
-    logger.addHandler(file_handler)
-
-    # Console Handler
-    console_handler = logging.StreamHandler()
-    console_handler.setFormatter(
-        logging.Formatter('%(levelname)s - %(message)s')
-    )
-    logger.addHandler(console_handler)
\ No newline at end of file
+    for handler in _get_handlers():
+        if handler not in logger.handlers:
+            logger.addHandler(handler)
@@ -0,0 +1,242 @@
+# Maintenance jobs for the movie catalog. Run from the command line, e.g.
+#   python -m movie_collection.utils.maintenance purge --retention-days 30
+#   python -m movie_collection.utils.maintenance rebuild-stats
+import argparse
+import fcntl
+import logging
+import os
+import sqlite3
+import threading
+
+from movie_collection.db import DB_PATH
+from movie_collection.utils.logger import configure_logger
+from movie_collection.utils.sql_utils import get_db_connection
+
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+
+PURGE_RETENTION_DAYS = float(os.getenv("PURGE_RETENTION_DAYS", "30"))
+PURGE_CHUNK_SIZE = int(os.getenv("PURGE_CHUNK_SIZE", "1000"))
+PURGE_INTERVAL_SECONDS = float(os.getenv("PURGE_INTERVAL_SECONDS", "0"))
+# Every server process runs the scheduler; only the one holding this lock file purges
+PURGE_LOCK_PATH = os.getenv("PURGE_LOCK_PATH", f"{DB_PATH}.purge.lock")
+
+
+def _database_size(cursor) -> int:
+    cursor.execute("PRAGMA page_count")
+    page_count = cursor.fetchone()[0]
+    cursor.execute("PRAGMA page_size")
+    return page_count * cursor.fetchone()[0]
+
+
+def purge_deleted_movies(retention_days: float = PURGE_RETENTION_DAYS,
+                         chunk_size: int = PURGE_CHUNK_SIZE,
+                         compact: str = "auto") -> dict:
+    """
+    Hard-deletes soft-deleted movies older than the retention window, then compacts the file.
+
+    Rows are deleted in transactions of chunk_size rows so that other writers are never blocked
+    for long. Movies deleted before deletion times were recorded count as past the window.
+
+    Args:
+        retention_days (float): How long soft-deleted movies are kept.
+        chunk_size (int): Number of rows deleted per transaction.
+        compact (str): "auto" runs PRAGMA incremental_vacuum when the database was created with
+            auto_vacuum = INCREMENTAL, "full" always runs VACUUM, "none" skips compaction.
+
+    Returns:
+        dict: The number of rows deleted, the compaction performed and the bytes reclaimed.
+
+    Raises:
+        ValueError: If the compaction mode is unknown.
+        sqlite3.Error: If any database error occurs.
+    """
+    if compact not in ("auto", "full", "none"):
+        raise ValueError(f"Invalid compaction mode: '{compact}'. Must be 'auto', 'full' or 'none'.")
+
+    rows_deleted = 0
+    compaction = "none"
+    try:
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            size_before = _database_size(cursor)
+
+            while True:
+                cursor.execute("""
+                    DELETE FROM movies WHERE id IN (
+                        SELECT id FROM movies
+                        WHERE deleted = TRUE AND (deleted_at IS NULL OR deleted_at < datetime('now', ?))
+                        LIMIT ?
+                    )
+                """, (f"-{retention_days} days", chunk_size))
+                conn.commit()
+                rows_deleted += cursor.rowcount
+                if cursor.rowcount < chunk_size:
+                    break
+
+            if compact == "full":
+                cursor.execute("VACUUM")
+                compaction = "vacuum"
+            elif compact == "auto" and rows_deleted:
+                cursor.execute("PRAGMA auto_vacuum")
+                if cursor.fetchone()[0] == 2:
+                    # executescript steps the pragma to completion; execute would free a single page
+                    cursor.executescript("PRAGMA incremental_vacuum;")
+                    compaction = "incremental_vacuum"
+
+            bytes_reclaimed = size_before - _database_size(cursor)
+
+    except sqlite3.Error as e:
+        logger.error("Database error while purging deleted movies: %s", str(e))
+        raise e
+
+    logger.info("Purged %d deleted movies, reclaimed %d bytes (%s).", rows_deleted, bytes_reclaimed, compaction)
+    return {'rows_deleted': rows_deleted, 'compaction': compaction, 'bytes_reclaimed': bytes_reclaimed}
+
+
+def _try_lock(path: str):
+    """
+    Takes an exclusive lock on a file without waiting.
+
+    Returns:
+        The open lock file, to be kept open for as long as the lock is held, or None if
+        another process holds the lock.
+    """
+    lock_file = open(path, "a")
+    try:
+        fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        lock_file.close()
+        return None
+    return lock_file
+
+
+def start_purge_scheduler(interval_seconds: float = PURGE_INTERVAL_SECONDS,
+                          retention_days: float = PURGE_RETENTION_DAYS,
+                          lock_path: str = PURGE_LOCK_PATH) -> threading.Event:
+    """
+    Runs purge_deleted_movies every interval_seconds in a daemon thread.
+
+    Meant to be started in every server process: each tick, the scheduler tries to take the
+    lock file, and only the process holding it purges. The lock is held until the process
+    exits, after which the next process to tick takes over.
+
+    Args:
+        interval_seconds (float): Time between purges.
+        retention_days (float): How long soft-deleted movies are kept.
+        lock_path (str): The lock file electing the process that purges.
+
+    Returns:
+        threading.Event: Set it to stop the scheduler.
+    """
+    stop = threading.Event()
+
+    def run():
+        lock_file = None
+        while not stop.wait(interval_seconds):
+            try:
+                if lock_file is None:
+                    lock_file = _try_lock(lock_path)
+                    if lock_file is None:
+                        continue
+                    logger.info("This process now runs the scheduled purge.")
+                purge_deleted_movies(retention_days)
+            except Exception as e:
+                logger.error("Scheduled purge failed: %s", str(e))
+        if lock_file is not None:
+            lock_file.close()
+
+    threading.Thread(target=run, name="movies-purge", daemon=True).start()
+    logger.info("Purge scheduled every %s seconds (retention %s days).", interval_seconds, retention_days)
+    return stop
+
+
+# Genres are stored comma-separated; split them into JSON arrays the same way the triggers do
+_GENRES_JSON = """'[' || replace(json_quote(genres), ', ', '","') || ']'"""
+
+
+def recompute_movie_stats(conn) -> int:
+    """
+    Recomputes the movie_stats summary table from the movies table in one transaction.
+
+    Args:
+        conn (sqlite3.Connection): The database connection, with no transaction open.
+
+    Returns:
+        int: The number of summary rows written.
+
+    Raises:
+        sqlite3.Error: If any database error occurs; the summary is left as it was.
+    """
+    cursor = conn.cursor()
+    try:
+        cursor.execute("DELETE FROM movie_stats")
+        cursor.execute(f"""
+            INSERT INTO movie_stats (dimension, value, count)
+            SELECT 'total', '', COUNT(*) FROM movies WHERE NOT deleted HAVING COUNT(*) > 0
+            UNION ALL
+            SELECT 'year', year, COUNT(*) FROM movies WHERE NOT deleted GROUP BY year
+            UNION ALL
+            SELECT 'language', original_language, COUNT(*) FROM movies WHERE NOT deleted GROUP BY original_language
+            UNION ALL
+            SELECT 'director', director, COUNT(*) FROM movies WHERE NOT deleted GROUP BY director
+            UNION ALL
+            SELECT 'genre', genre.value, COUNT(DISTINCT movies.id)
+            FROM movies, json_each({_GENRES_JSON}) AS genre
+            WHERE NOT deleted GROUP BY genre.value
+        """)
+        rows = cursor.rowcount
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    return rows
+
+
+def rebuild_movie_stats() -> int:
+    """
+    Recomputes the movie_stats summary table of the catalog database, see recompute_movie_stats.
+
+    The triggers on the movies table keep the summary up to date; this is only needed after
+    writes that bypassed them or to check the summary against the data.
+
+    Returns:
+        int: The number of summary rows written.
+
+    Raises:
+        sqlite3.Error: If any database error occurs.
+    """
+    try:
+        with get_db_connection() as conn:
+            rows = recompute_movie_stats(conn)
+            logger.info("Rebuilt movie stats: %d rows", rows)
+            return rows
+    except sqlite3.Error as e:
+        logger.error("Database error while rebuilding movie stats: %s", str(e))
+        raise e
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Movie catalog maintenance jobs.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    purge = commands.add_parser("purge", help="Hard-delete old soft-deleted movies and compact the database.")
+    purge.add_argument("--retention-days", type=float, default=PURGE_RETENTION_DAYS)
+    purge.add_argument("--chunk-size", type=int, default=PURGE_CHUNK_SIZE)
+    purge.add_argument("--compact", choices=("auto", "full", "none"), default="auto")
+
+    commands.add_parser("rebuild-stats", help="Recompute the movie_stats summary table from the movies table.")
+
+    args = parser.parse_args(argv)
+    if args.command == "purge":
+        result = purge_deleted_movies(args.retention_days, args.chunk_size, args.compact)
+        print(f"Deleted {result['rows_deleted']} rows, reclaimed {result['bytes_reclaimed']} bytes "
+              f"({result['compaction']}).")
+    elif args.command == "rebuild-stats":
+        print(f"Wrote {rebuild_movie_stats()} stats rows.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,348 @@
+# Versioned schema migrations for the movie catalog. The database records the number of the
+# last migration applied in PRAGMA user_version; run the pending ones with
+#   python -m movie_collection.utils.migrations upgrade
+#   python -m movie_collection.utils.migrations status
+import argparse
+import importlib.util
+import logging
+import os
+import re
+import sqlite3
+
+from movie_collection.utils.logger import configure_logger
+
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+
+MIGRATIONS_PATH = os.getenv("SQL_MIGRATIONS_PATH", "/app/sql/migrations")
+
+# Rows copied per transaction by rebuild_table
+REBUILD_BATCH_SIZE = int(os.getenv("MIGRATION_BATCH_SIZE", "5000"))
+
+# NNNN_description.sql or NNNN_description.py
+_MIGRATION_NAME = re.compile(r"^(\d+)_(\w+)\.(sql|py)$")
+
+
+class Migration:
+    """
+    One migration file.
+
+    Attributes:
+        version (int): The number the database is at once the migration is applied.
+        name (str): The file name.
+        path (str): The path to the file.
+    """
+
+    __slots__ = ('version', 'name', 'path')
+
+    def __init__(self, version: int, name: str, path: str):
+        self.version = version
+        self.name = name
+        self.path = path
+
+    def __repr__(self) -> str:
+        return f"Migration({self.version}, {self.name!r})"
+
+
+def list_migrations(path: str = None) -> list:
+    """
+    Find the migration files in a directory, in the order they apply.
+
+    Files not named NNNN_description.sql or NNNN_description.py are ignored.
+
+    Args:
+        path (str): The directory holding the migration files; defaults to MIGRATIONS_PATH.
+
+    Returns:
+        list[Migration]: The migrations, sorted by version.
+
+    Raises:
+        ValueError: If two files share a version, or a version is 0.
+        OSError: If the directory cannot be read.
+    """
+    path = path or MIGRATIONS_PATH
+    migrations = {}
+    for name in os.listdir(path):
+        match = _MIGRATION_NAME.match(name)
+        if not match:
+            continue
+        version = int(match.group(1))
+        if version == 0:
+            raise ValueError(f"Migration {name} has version 0, which means an empty database")
+        if version in migrations:
+            raise ValueError(f"Migrations {migrations[version].name} and {name} share version {version}")
+        migrations[version] = Migration(version, name, os.path.join(path, name))
+    return [migrations[version] for version in sorted(migrations)]
+
+
+def get_schema_version(conn) -> int:
+    """
+    Read the number of the last migration applied to a database.
+
+    Args:
+        conn (sqlite3.Connection): The database connection.
+
+    Returns:
+        int: The version, 0 for a database no migration has run on.
+    """
+    cursor = conn.cursor()
+    cursor.execute("PRAGMA user_version")
+    return cursor.fetchone()[0]
+
+
+def _split_statements(script: str):
+    """
+    Split an SQL script into complete statements, keeping trigger bodies whole.
+    """
+    statement = ""
+    for part in script.split(";"):
+        statement += part + ";"
+        if sqlite3.complete_statement(statement):
+            if statement.strip(" \t\r\n;"):
+                yield statement.strip()
+            statement = ""
+    if statement.strip(" \t\r\n;"):
+        raise ValueError(f"Incomplete SQL statement: {statement.strip()[:80]}")
+
+
+def _apply_sql(conn, migration: Migration) -> bool:
+    with open(migration.path, "r") as fh:
+        statements = list(_split_statements(fh.read()))
+
+    cursor = conn.cursor()
+    cursor.execute("BEGIN IMMEDIATE")
+    try:
+        # Another runner may have applied it while this one waited for the write lock
+        if get_schema_version(conn) >= migration.version:
+            conn.rollback()
+            return False
+        for statement in statements:
+            cursor.execute(statement)
+        cursor.execute(f"PRAGMA user_version = {migration.version}")
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    return True
+
+
+def _apply_python(conn, migration: Migration, report) -> bool:
+    if get_schema_version(conn) >= migration.version:
+        return False
+    spec = importlib.util.spec_from_file_location(f"migration_{migration.version}", migration.path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    # Python migrations manage their own transactions, so they must be safe to run again
+    # if they are interrupted before the version is recorded
+    module.upgrade(conn, report)
+
+    cursor = conn.cursor()
+    cursor.execute("BEGIN IMMEDIATE")
+    try:
+        cursor.execute(f"PRAGMA user_version = {migration.version}")
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    return True
+
+
+def upgrade(conn, target: int = None, path: str = None, report=logger.info) -> int:
+    """
+    Apply the pending migrations to a database, in order.
+
+    SQL migrations run in one transaction each, together with the version update, so a
+    failed migration leaves the database at the previous version; they must not contain
+    BEGIN or COMMIT themselves. Python migrations export upgrade(conn, report) and may
+    commit in batches, e.g. with rebuild_table.
+
+    Args:
+        conn (sqlite3.Connection): The database connection, with no transaction open.
+        target (int): The version to stop at; defaults to the latest migration.
+        path (str): The directory holding the migration files; defaults to MIGRATIONS_PATH.
+        report (callable): Called with a progress message for each step.
+
+    Returns:
+        int: The version the database is at afterwards.
+
+    Raises:
+        ValueError: If the migration files are inconsistent.
+        sqlite3.Error: If a migration fails; the database stays at the last version applied.
+    """
+    migrations = list_migrations(path)
+    current = get_schema_version(conn)
+    latest = migrations[-1].version if migrations else 0
+    if current > latest:
+        logger.warning("Database is at schema version %d, newer than the latest migration %d", current, latest)
+        return current
+
+    pending = [m for m in migrations if m.version > current and (target is None or m.version <= target)]
+    if not pending:
+        report(f"Schema is up to date at version {current}.")
+        return current
+
+    cursor = conn.cursor()
+    cursor.execute("SELECT 1 FROM sqlite_master LIMIT 1")
+    if current == 0 and cursor.fetchone() is None:
+        # Only possible before the first table is created, and not inside a transaction.
+        # Lets purges return freed pages with PRAGMA incremental_vacuum.
+        cursor.execute("PRAGMA auto_vacuum = INCREMENTAL")
+
+    for migration in pending:
+        report(f"Applying migration {migration.name}...")
+        try:
+            if migration.name.endswith(".sql"):
+                applied = _apply_sql(conn, migration)
+            else:
+                applied = _apply_python(conn, migration, report)
+        except (sqlite3.Error, OSError, ValueError) as e:
+            logger.error("Migration %s failed: %s", migration.name, str(e))
+            raise e
+        if not applied:
+            report(f"Migration {migration.name} was already applied.")
+        current = migration.version
+
+    report(f"Schema is at version {current}.")
+    return current
+
+
+def rebuild_table(conn, table: str, create_sql: str, columns: tuple, select: tuple = None,
+                  batch_size: int = REBUILD_BATCH_SIZE, report=logger.info) -> int:
+    """
+    Move a table to a new definition by copying it in batches, while it stays readable and writable.
+
+    The rows are copied into a new table in transactions of batch_size rows. Triggers on the old
+    table mirror writes to rows that were already copied, and the last batch, the swap and the
+    recreation of the table's indexes and triggers happen in one final transaction. An
+    interrupted rebuild resumes from the last batch copied.
+
+    Args:
+        conn (sqlite3.Connection): The database connection, with no transaction open.
+        table (str): The table to rebuild. Its rows must be keyed by an INTEGER PRIMARY KEY.
+        create_sql (str): The CREATE TABLE statement for the new definition, with {name} in
+            place of the table name.
+        columns (tuple): The columns of the new table to fill, including the primary key.
+        select (tuple): The SQL expressions over the old table giving each column; defaults to
+            the column names.
+        batch_size (int): Number of rows copied per transaction.
+        report (callable): Called with a progress message after each batch.
+
+    Returns:
+        int: The number of rows in the rebuilt table.
+
+    Raises:
+        sqlite3.Error: If any database error occurs; the old table is left in place.
+    """
+    new_table = f"{table}_rebuild"
+    mirror_triggers = [f"{new_table}_{event}" for event in ("insert", "update", "delete")]
+    column_list = ", ".join(columns)
+    select_list = ", ".join(select or columns)
+    copied_up_to = f"(SELECT COALESCE(MAX(rowid), 0) FROM {new_table})"
+    copy_row = (f"INSERT OR REPLACE INTO {new_table} ({column_list}) "
+                f"SELECT {select_list} FROM {table} WHERE rowid = NEW.rowid AND NEW.rowid <= {copied_up_to};")
+
+    cursor = conn.cursor()
+
+    def in_transaction(*statements, params=()):
+        cursor.execute("BEGIN IMMEDIATE")
+        try:
+            for statement in statements:
+                cursor.execute(statement, params)
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
+    in_transaction(
+        create_sql.format(name=f"IF NOT EXISTS {new_table}"),
+        f"CREATE TRIGGER IF NOT EXISTS {mirror_triggers[0]} AFTER INSERT ON {table} BEGIN {copy_row} END",
+        f"CREATE TRIGGER IF NOT EXISTS {mirror_triggers[1]} AFTER UPDATE ON {table} BEGIN {copy_row} END",
+        f"CREATE TRIGGER IF NOT EXISTS {mirror_triggers[2]} AFTER DELETE ON {table} "
+        f"BEGIN DELETE FROM {new_table} WHERE rowid = OLD.rowid; END"
+    )
+
+    cursor.execute(f"SELECT COUNT(*) FROM {table}")
+    total = cursor.fetchone()[0]
+    copy_batch = (f"INSERT INTO {new_table} ({column_list}) SELECT {select_list} FROM {table} "
+                  f"WHERE rowid > {copied_up_to} ORDER BY rowid LIMIT ?")
+    while True:
+        in_transaction(copy_batch, params=(batch_size,))
+        copied = cursor.rowcount
+        cursor.execute(f"SELECT COUNT(*) FROM {new_table}")
+        done = cursor.fetchone()[0]
+        report(f"{table}: copied {done}/{total} rows ({100 * done // max(total, 1)}%)")
+        if copied < batch_size:
+            break
+
+    cursor.execute("BEGIN IMMEDIATE")
+    try:
+        # Rows added since the last batch
+        cursor.execute(copy_batch.replace(" LIMIT ?", ""))
+        cursor.execute(
+            "SELECT name, sql FROM sqlite_master WHERE tbl_name = ? AND type IN ('index', 'trigger') AND sql IS NOT NULL",
+            (table,)
+        )
+        dependents = [sql for name, sql in cursor.fetchall() if name not in mirror_triggers]
+        cursor.execute("SELECT name FROM sqlite_master WHERE name = 'sqlite_sequence'")
+        sequence = None
+        if cursor.fetchone():
+            cursor.execute("SELECT seq FROM sqlite_sequence WHERE name = ?", (table,))
+            row = cursor.fetchone()
+            sequence = row[0] if row else None
+
+        for trigger in mirror_triggers:
+            cursor.execute(f"DROP TRIGGER {trigger}")
+        cursor.execute(f"DROP TABLE {table}")
+        cursor.execute(f"ALTER TABLE {new_table} RENAME TO {table}")
+        for statement in dependents:
+            cursor.execute(statement)
+        if sequence is not None:
+            # Never hand out IDs the old table already used
+            cursor.execute("UPDATE sqlite_sequence SET seq = MAX(seq, ?) WHERE name = ?", (sequence, table))
+            cursor.execute(
+                "INSERT INTO sqlite_sequence (name, seq) SELECT ?, ? "
+                "WHERE NOT EXISTS (SELECT 1 FROM sqlite_sequence WHERE name = ?)",
+                (table, sequence, table)
+            )
+        cursor.execute(f"SELECT COUNT(*) FROM {table}")
+        rows = cursor.fetchone()[0]
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+
+    report(f"{table}: rebuilt with {rows} rows.")
+    return rows
+
+
+def main(argv=None) -> None:
+    from movie_collection.db import DB_PATH
+
+    parser = argparse.ArgumentParser(description="Movie catalog schema migrations.")
+    parser.add_argument("--db", default=DB_PATH, help="Path to the SQLite database file.")
+    parser.add_argument("--path", default=MIGRATIONS_PATH, help="Directory holding the migration files.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    upgrade_parser = commands.add_parser("upgrade", help="Apply the pending migrations.")
+    upgrade_parser.add_argument("--target", type=int, default=None, help="Stop at this version.")
+    commands.add_parser("status", help="Show the schema version and the pending migrations.")
+
+    args = parser.parse_args(argv)
+    conn = sqlite3.connect(args.db, timeout=30)
+    try:
+        if args.command == "upgrade":
+            upgrade(conn, args.target, args.path, report=print)
+        else:
+            current = get_schema_version(conn)
+            print(f"Schema version: {current}")
+            for migration in list_migrations(args.path):
+                if migration.version > current:
+                    print(f"Pending: {migration.name}")
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,225 @@
+from collections import OrderedDict, deque
+import logging
+import threading
+import time
+
+from movie_collection.utils.logger import configure_logger
+
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+
+class _KeyState:
+    """
+    The items pooled for one key, and when the key was last drawn from or refilled.
+    """
+
+    __slots__ = ('items', 'ids', 'pinned', 'last_draw', 'empty_fetches', 'retry_at')
+
+    def __init__(self, pinned: bool, now: float):
+        self.items = deque()
+        self.ids = set()
+        self.pinned = pinned
+        self.last_draw = now
+        self.empty_fetches = 0
+        self.retry_at = 0.0
+
+
+class PrefetchPool:
+    """
+    Per-key pools of precomputed items, refilled by a background thread.
+
+    draw() pops an item in O(1). Keys are refilled up to `size` items whenever they drop to
+    `low_water`. An item already pooled for a key is not pooled again.
+
+    Keys registered up front are kept for good. Other keys are added on their first draw, up to
+    `max_keys`: the least recently drawn one makes room for a new one, and a key not drawn for
+    `idle_seconds` is dropped. A key whose refill brings nothing is retried after an interval
+    that doubles every time, up to `max_backoff`, instead of on every pass.
+
+    Attributes:
+        size (int): Number of items kept per key after a refill; 0 disables the pool.
+        low_water (int): Item count at or below which a key is refilled.
+        max_keys (int): Maximum number of keys kept warm.
+        hits (int): Number of draws served from the pool.
+        misses (int): Number of draws that found the pool empty.
+        evicted (int): Number of keys dropped to make room or for being idle.
+    """
+
+    def __init__(self, fetch, size: int, low_water: int, max_keys: int = 64, refill_interval: float = 30.0,
+                 idle_seconds: float = 600.0, max_backoff: float = 3600.0):
+        """
+        Args:
+            fetch (callable): fetch(key, count) returns a list of up to count new (item id, item)
+                pairs for key; the ids tell duplicates apart.
+            size (int): Number of items kept per key after a refill.
+            low_water (int): Item count at or below which a key is refilled.
+            max_keys (int): Maximum number of keys kept warm.
+            refill_interval (float): Seconds between refill passes when no draw triggers one.
+            idle_seconds (float): Seconds after which a key added by a draw and not drawn since is dropped.
+            max_backoff (float): Longest wait before refilling a key whose refills keep coming back empty.
+        """
+        self.fetch = fetch
+        self.size = size
+        self.low_water = low_water
+        self.max_keys = max_keys
+        self.refill_interval = refill_interval
+        self.idle_seconds = idle_seconds
+        self.max_backoff = max_backoff
+        self.hits = 0
+        self.misses = 0
+        self.evicted = 0
+        # Least recently drawn key first
+        self._pools = OrderedDict()
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def register(self, key) -> None:
+        """
+        Keep a key warm for good.
+
+        Args:
+            key: The key to keep items for.
+        """
+        with self._lock:
+            state = self._pools.get(key)
+            if state is not None:
+                state.pinned = True
+            elif self._make_room():
+                self._pools[key] = _KeyState(True, time.monotonic())
+                self._wakeup.set()
+
+    def _make_room(self) -> bool:
+        """
+        Drop the least recently drawn key that was not registered if the pool is full. Holds the lock.
+
+        Returns:
+            bool: Whether a key can be added.
+        """
+        if len(self._pools) < self.max_keys:
+            return True
+        victim = next((key for key, state in self._pools.items() if not state.pinned), None)
+        if victim is None:
+            return False
+        del self._pools[victim]
+        self.evicted += 1
+        return True
+
+    def draw(self, key):
+        """
+        Take one item for a key.
+
+        Args:
+            key: The key to draw for.
+
+        Returns:
+            The item, or None if the pool for the key is empty or disabled.
+        """
+        if self.size <= 0:
+            return None
+        now = time.monotonic()
+        with self._lock:
+            state = self._pools.get(key)
+            if state is None:
+                if self._make_room():
+                    self._pools[key] = _KeyState(False, now)
+                    self._wakeup.set()
+                self.misses += 1
+                return None
+            state.last_draw = now
+            self._pools.move_to_end(key)
+            if len(state.items) <= self.low_water + 1 and now >= state.retry_at:
+                self._wakeup.set()
+            if not state.items:
+                self.misses += 1
+                return None
+            self.hits += 1
+            item_id, item = state.items.popleft()
+            state.ids.discard(item_id)
+            return item
+
+    def refill(self) -> None:
+        """
+        Drop idle keys, then top up every key that is at or below the low-water mark and not backing off.
+        """
+        now = time.monotonic()
+        with self._lock:
+            for key in [key for key, state in self._pools.items()
+                        if not state.pinned and now - state.last_draw > self.idle_seconds]:
+                del self._pools[key]
+                self.evicted += 1
+            wanted = [(key, self.size - len(state.items)) for key, state in self._pools.items()
+                      if len(state.items) <= self.low_water and now >= state.retry_at]
+        for key, count in wanted:
+            try:
+                items = self.fetch(key, count)
+            except Exception as e:
+                logger.error("Prefetch for %s failed: %s", key, str(e))
+                items = []
+            with self._lock:
+                state = self._pools.get(key)
+                if state is None:
+                    # Evicted while fetching
+                    continue
+                added = 0
+                for item_id, item in items:
+                    if len(state.items) >= self.size:
+                        break
+                    if item_id not in state.ids:
+                        state.ids.add(item_id)
+                        state.items.append((item_id, item))
+                        added += 1
+                if added:
+                    state.empty_fetches = 0
+                    state.retry_at = 0.0
+                else:
+                    state.empty_fetches += 1
+                    state.retry_at = time.monotonic() + min(
+                        self.refill_interval * 2 ** state.empty_fetches, self.max_backoff
+                    )
+            if added:
+                logger.info("Prefetched %d items for %s", added, key)
+            else:
+                logger.warning("Prefetch for %s brought nothing new, retrying in %.0fs",
+                               key, state.retry_at - time.monotonic())
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self.refill()
+            self._wakeup.wait(self.refill_interval)
+            self._wakeup.clear()
+
+    def start(self) -> None:
+        """
+        Start the background refill thread. Must run in the process that serves draws.
+        """
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="prefetch-pool", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        """
+        Stop the background refill thread.
+        """
+        self._stop.set()
+        self._wakeup.set()
+        self._thread = None
+
+    def stats(self) -> dict:
+        """
+        Counters for monitoring.
+
+        Returns:
+            dict: The number of items per key and the hit, miss and eviction counts.
+        """
+        with self._lock:
+            return {
+                'keys': {str(key): len(state.items) for key, state in self._pools.items()},
+                'hits': self.hits,
+                'misses': self.misses,
+                'evicted': self.evicted
+            }
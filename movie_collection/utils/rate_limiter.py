@@ -0,0 +1,98 @@
+from collections import deque
+import logging
+import threading
+import time
+
+from movie_collection.utils.logger import configure_logger
+
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+
+class SlidingWindowLimiter:
+    """
+    Per-key sliding-window rate limiter held in process memory.
+
+    Each key keeps a ring buffer of its last `limit` hit timestamps, so memory per key
+    is bounded by the limit and a check is O(1). Keys that have been idle for a whole
+    window are evicted periodically.
+
+    Attributes:
+        limit (int): Maximum number of hits allowed per key within the window.
+        window_seconds (float): Length of the sliding window in seconds.
+        allowed (int): Number of hits allowed since startup.
+        rejected (int): Number of hits rejected since startup.
+    """
+
+    def __init__(self, limit: int, window_seconds: float, evict_interval: float = 60.0):
+        if limit <= 0:
+            raise ValueError(f"Limit must be a positive integer, got {limit}")
+        self.limit = limit
+        self.window_seconds = window_seconds
+        self.evict_interval = evict_interval
+        self.allowed = 0
+        self.rejected = 0
+        self._hits = {}
+        self._lock = threading.Lock()
+        self._next_eviction = time.monotonic() + evict_interval
+
+    def hit(self, key: str) -> float:
+        """
+        Record an attempt for a key if it is within the limit.
+
+        Args:
+            key (str): The key to rate limit, e.g. a username or client IP.
+
+        Returns:
+            float: 0 if the attempt is allowed, otherwise the number of seconds until
+            the key is allowed again. Rejected attempts are not recorded.
+        """
+        now = time.monotonic()
+        with self._lock:
+            if now >= self._next_eviction:
+                self._evict(now)
+            ring = self._hits.get(key)
+            if ring is None:
+                ring = self._hits[key] = deque(maxlen=self.limit)
+            elif len(ring) == self.limit and now - ring[0] < self.window_seconds:
+                self.rejected += 1
+                return self.window_seconds - (now - ring[0])
+            ring.append(now)
+            self.allowed += 1
+            return 0.0
+
+    def reset(self, key: str) -> None:
+        """
+        Forget all recorded attempts for a key.
+
+        Args:
+            key (str): The key to reset.
+        """
+        with self._lock:
+            self._hits.pop(key, None)
+
+    def _evict(self, now: float) -> None:
+        cutoff = now - self.window_seconds
+        idle_keys = [key for key, ring in self._hits.items() if ring[-1] < cutoff]
+        for key in idle_keys:
+            del self._hits[key]
+        self._next_eviction = now + self.evict_interval
+        if idle_keys:
+            logger.info("Evicted %d idle rate limiter keys", len(idle_keys))
+
+    def stats(self) -> dict:
+        """
+        Counters for monitoring.
+
+        Returns:
+            dict: The limiter configuration, number of tracked keys and allowed/rejected counts.
+        """
+        with self._lock:
+            return {
+                'limit': self.limit,
+                'window_seconds': self.window_seconds,
+                'tracked_keys': len(self._hits),
+                'allowed': self.allowed,
+                'rejected': self.rejected
+            }
@@ -0,0 +1,109 @@
+import logging
+import threading
+import time
+
+from movie_collection.utils.json_utils import dumps
+from movie_collection.utils.logger import configure_logger
+
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+
+class ReadinessMonitor:
+    """
+    Runs dependency checks in a background thread and keeps the last result for probes.
+
+    A probe only reads the cached result, whose JSON body is encoded once per round of checks,
+    so probing costs the same however often it happens. The service is ready when every
+    critical check passed in a round that finished less than `max_age` seconds ago.
+
+    Attributes:
+        interval (float): Seconds between rounds of checks.
+        max_age (float): Age after which a result no longer counts, e.g. because the thread died.
+    """
+
+    def __init__(self, checks: dict, critical: set = None, interval: float = 5.0, max_age: float = None):
+        """
+        Args:
+            checks (dict): name -> callable. A check raises to fail and may return a dict of details.
+            critical (set): Names of the checks that must pass; defaults to all of them.
+            interval (float): Seconds between rounds of checks.
+            max_age (float): Age after which a result no longer counts; defaults to three intervals.
+        """
+        self.checks = checks
+        self.critical = set(checks) if critical is None else set(critical)
+        self.interval = interval
+        self.max_age = max_age if max_age is not None else 3 * interval
+        # (ready, body, monotonic time of the round), replaced as a whole so probes never mix rounds
+        self._state = (False, dumps({'status': 'starting'}), None)
+        self._stop = threading.Event()
+        self._thread = None
+
+    def run_checks(self) -> dict:
+        """
+        Run every check once and store the result for status().
+
+        Returns:
+            dict: {'status': 'ready' | 'not ready', 'checks': {name: result}}, where each result
+                holds 'ok', 'critical', 'duration_ms' and either the details or the 'error'.
+        """
+        results = {}
+        for name, check in self.checks.items():
+            start = time.perf_counter()
+            try:
+                result = dict(check() or {}, ok=True)
+            except Exception as e:
+                result = {'ok': False, 'error': str(e)}
+            result['critical'] = name in self.critical
+            result['duration_ms'] = round((time.perf_counter() - start) * 1000, 2)
+            results[name] = result
+
+        ready = all(result['ok'] for result in results.values() if result['critical'])
+        report = {'status': 'ready' if ready else 'not ready', 'checks': results}
+        failed = [name for name, result in results.items() if not result['ok']]
+        if failed:
+            logger.warning("Readiness checks failed: %s", ", ".join(failed))
+
+        self._state = (ready, dumps(report), time.monotonic())
+        return report
+
+    def status(self) -> tuple:
+        """
+        Read the result of the last round of checks without running any.
+
+        Returns:
+            tuple: (ready, JSON body as bytes). Not ready before the first round has finished
+                or when the last one is older than max_age.
+        """
+        ready, body, checked_at = self._state
+        if checked_at is None:
+            return False, body
+        age = time.monotonic() - checked_at
+        if age > self.max_age:
+            return False, dumps({'status': 'stale', 'age_seconds': round(age, 1)})
+        return ready, body
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.run_checks()
+            except Exception as e:
+                logger.error("Readiness checks could not run: %s", str(e))
+            self._stop.wait(self.interval)
+
+    def start(self) -> None:
+        """
+        Start the background thread. Must run in the process that serves the probes.
+        """
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="readiness-monitor", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        """
+        Stop the background thread.
+        """
+        self._stop.set()
+        self._thread = None
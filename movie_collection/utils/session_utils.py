@@ -0,0 +1,221 @@
+import base64
+from functools import wraps
+import hashlib
+import hmac
+from inspect import iscoroutinefunction
+import logging
+import os
+import threading
+import time
+
+from flask import current_app, g, jsonify, make_response, request
+
+from movie_collection.db import run_db
+from movie_collection.utils.logger import configure_logger
+
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+
+# Tokens are only valid across restarts and workers when SESSION_SECRET is set
+SESSION_SECRET = os.getenv("SESSION_SECRET", "").encode() or os.urandom(32)
+SESSION_TTL_SECONDS = int(os.getenv("SESSION_TTL_SECONDS", "3600"))
+
+# Shared secret for administrative routes, sent in the X-Admin-Token header; they are disabled while it is unset
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN", "")
+
+# token id -> expiry timestamp, pruned as entries expire. Only this process sees it; revocation
+# across workers goes through the session generation of the user, see verify_session_token
+_revoked_tokens = {}
+_revoked_lock = threading.Lock()
+
+
+def _b64encode(raw: bytes) -> str:
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+def _b64decode(text: str) -> bytes:
+    return base64.urlsafe_b64decode(text + "=" * (-len(text) % 4))
+
+
+def _sign(body: str) -> str:
+    return _b64encode(hmac.new(SESSION_SECRET, body.encode("ascii"), hashlib.sha256).digest())
+
+
+def _decode_session_token(token: str) -> tuple[str, int, str, int]:
+    """
+    Check the signature of a token and split its payload.
+
+    Args:
+        token (str): The token to decode.
+
+    Returns:
+        tuple: The username, expiry timestamp, token id and session generation.
+
+    Raises:
+        ValueError: If the token is malformed or the signature does not match.
+    """
+    body, _, signature = (token or "").partition(".")
+    if not body or not signature or not hmac.compare_digest(signature, _sign(body)):
+        raise ValueError("Invalid session token")
+    try:
+        username, expires, token_id, generation = _b64decode(body).decode("utf-8").rsplit("|", 3)
+        return username, int(expires), token_id, int(generation)
+    except (ValueError, UnicodeDecodeError):
+        raise ValueError("Invalid session token")
+
+
+def issue_session_token(username: str, generation: int = 0) -> str:
+    """
+    Issue a signed session token for an authenticated user.
+
+    Args:
+        username (str): The username the token is issued to.
+        generation (int): The current session generation of the user.
+
+    Returns:
+        str: The token, "<payload>.<signature>" encoded as URL-safe base64.
+    """
+    expires = int(time.time()) + SESSION_TTL_SECONDS
+    token_id = os.urandom(8).hex()
+    body = _b64encode(f"{username}|{expires}|{token_id}|{generation}".encode("utf-8"))
+    logger.info("Session token issued for user: %s", username)
+    return f"{body}.{_sign(body)}"
+
+
+def verify_session_token(token: str, get_generation=None) -> str:
+    """
+    Verify a session token.
+
+    Args:
+        token (str): The token to verify.
+        get_generation (callable, optional): Returns the current session generation of a
+            username, or None if the user no longer exists. Tokens issued with another
+            generation are rejected. Without it, only revocations made by this process apply.
+
+    Returns:
+        str: The username the token was issued to.
+
+    Raises:
+        ValueError: If the token is invalid, expired or revoked.
+    """
+    username, generation = _check_session_token(token)
+    if get_generation is not None and get_generation(username) != generation:
+        raise ValueError("Session token has been revoked")
+    return username
+
+
+async def averify_session_token(token: str, get_generation=None) -> str:
+    """
+    Async version of verify_session_token. The generation lookup, which may query the users
+    database, runs on the database threads instead of the event loop.
+
+    Raises:
+        ValueError: If the token is invalid, expired or revoked.
+    """
+    username, generation = _check_session_token(token)
+    if get_generation is not None and await run_db(get_generation, username) != generation:
+        raise ValueError("Session token has been revoked")
+    return username
+
+
+def _check_session_token(token: str) -> tuple[str, int]:
+    """
+    Check the signature, expiry and local revocation of a session token.
+
+    Returns:
+        tuple: The username and session generation the token was issued with.
+
+    Raises:
+        ValueError: If the token is invalid, expired or revoked in this process.
+    """
+    username, expires, token_id, generation = _decode_session_token(token)
+    if expires < time.time():
+        raise ValueError("Session token has expired")
+    if token_id in _revoked_tokens:
+        raise ValueError("Session token has been revoked")
+    return username, generation
+
+
+def revoke_session_token(token: str) -> None:
+    """
+    Revoke a session token in this process until it would have expired anyway.
+
+    Args:
+        token (str): The token to revoke.
+
+    Raises:
+        ValueError: If the token is invalid.
+    """
+    username, expires, token_id, _ = _decode_session_token(token)
+    now = time.time()
+    with _revoked_lock:
+        for revoked_id, revoked_expires in list(_revoked_tokens.items()):
+            if revoked_expires < now:
+                del _revoked_tokens[revoked_id]
+        if expires >= now:
+            _revoked_tokens[token_id] = expires
+    logger.info("Session token revoked for user: %s", username)
+
+
+def get_request_token() -> str:
+    """
+    Read the bearer token from the Authorization header of the current request.
+
+    Returns:
+        str: The token, or an empty string if none was sent.
+    """
+    scheme, _, token = request.headers.get("Authorization", "").partition(" ")
+    return token.strip() if scheme.lower() == "bearer" else ""
+
+
+def verify_admin_token() -> None:
+    """
+    Check the X-Admin-Token header of the current request against ADMIN_TOKEN.
+
+    Raises:
+        PermissionError: If ADMIN_TOKEN is not configured, which disables administrative routes.
+        ValueError: If the header is missing or does not match.
+    """
+    if not ADMIN_TOKEN:
+        raise PermissionError("Administrative routes are disabled")
+    token = request.headers.get("X-Admin-Token", "")
+    if not hmac.compare_digest(token.encode(), ADMIN_TOKEN.encode()):
+        raise ValueError("Invalid admin token")
+
+
+def login_required(view):
+    """
+    Decorator for routes that need a valid session token.
+
+    Token generations are checked with the lookup the application registers as
+    app.extensions['session_generations'], if any; see verify_session_token. Async views
+    stay async and await the lookup off the event loop.
+    The username the token was issued to is stored in flask.g.username.
+    Requests without a valid token get a 401 response.
+    """
+    def reject(error: ValueError):
+        logger.warning("Rejected request to %s: %s", request.path, str(error))
+        return make_response(jsonify({'error': str(error)}), 401)
+
+    if iscoroutinefunction(view):
+        @wraps(view)
+        async def async_wrapper(*args, **kwargs):
+            try:
+                g.username = await averify_session_token(
+                    get_request_token(), current_app.extensions.get('session_generations')
+                )
+            except ValueError as e:
+                return reject(e)
+            return await view(*args, **kwargs)
+        return async_wrapper
+
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        try:
+            g.username = verify_session_token(get_request_token(), current_app.extensions.get('session_generations'))
+        except ValueError as e:
+            return reject(e)
+        return view(*args, **kwargs)
+    return wrapper
@@ -0,0 +1,110 @@
+import asyncio
+from concurrent.futures import Future
+import threading
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls that share a key into one call whose result they all get.
+
+    The first caller for a key runs the function; callers arriving while it is in flight wait
+    for its result or exception instead of running it again. Nothing is kept once the call
+    returns, so a later caller runs the function afresh: this bounds concurrent work per key,
+    caching is left to the caller. The result is shared and must not be mutated.
+
+    Attributes:
+        calls (int): Number of calls that ran the function.
+        shared (int): Number of calls served by a call already in flight.
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.shared = 0
+        self._futures = {}
+        self._tasks = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, fn):
+        """
+        Run fn, or wait for the call already running for key, from a thread.
+
+        Args:
+            key: A hashable key identifying the call, e.g. (endpoint, params).
+            fn (callable): Called with no arguments by the first caller.
+
+        Returns:
+            The result of fn.
+
+        Raises:
+            Exception: Whatever fn raised, in every caller that waited for it.
+        """
+        with self._lock:
+            future = self._futures.get(key)
+            leader = future is None
+            if leader:
+                future = self._futures[key] = Future()
+                self.calls += 1
+            else:
+                self.shared += 1
+        if not leader:
+            return future.result()
+
+        try:
+            result = fn()
+        except BaseException as e:
+            with self._lock:
+                del self._futures[key]
+            future.set_exception(e)
+            raise
+        with self._lock:
+            del self._futures[key]
+        future.set_result(result)
+        return result
+
+    async def ado(self, key, fn):
+        """
+        Await fn(), or the call already running for key on this event loop.
+
+        The call runs as its own task, so a caller that is cancelled (e.g. because its client
+        went away) does not cancel it for the others.
+
+        Args:
+            key: A hashable key identifying the call.
+            fn (callable): Returns the awaitable to run; called by the first caller only.
+
+        Returns:
+            The result of the awaitable.
+
+        Raises:
+            Exception: Whatever the awaitable raised, in every caller that waited for it.
+        """
+        loop = asyncio.get_running_loop()
+        task_key = (loop, key)
+        with self._lock:
+            task = self._tasks.get(task_key)
+            if task is None:
+                task = self._tasks[task_key] = loop.create_task(fn())
+                task.add_done_callback(lambda done: self._forget_task(task_key, done))
+                self.calls += 1
+            else:
+                self.shared += 1
+        return await asyncio.shield(task)
+
+    def _forget_task(self, task_key, task) -> None:
+        with self._lock:
+            if self._tasks.get(task_key) is task:
+                del self._tasks[task_key]
+
+    def stats(self) -> dict:
+        """
+        Counters for monitoring.
+
+        Returns:
+            dict: The calls run, the calls served by one in flight and the keys in flight now.
+        """
+        with self._lock:
+            return {
+                'calls': self.calls,
+                'shared': self.shared,
+                'in_flight': len(self._futures) + len(self._tasks)
+            }
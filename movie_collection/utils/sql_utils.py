@@ -1,8 +1,10 @@
 from contextlib import contextmanager
 import logging
-import os
 import sqlite3
 
+from sqlalchemy.exc import DBAPIError
+
+from movie_collection.db import MOVIES_DATABASE_URL, get_engine, get_pool_status
 from movie_collection.utils.logger import configure_logger
 
 
@@ -10,17 +12,12 @@ logger = logging.getLogger(__name__)
 configure_logger(logger)
 
 
-# load the db path from the environment with a default value
-DB_PATH = os.getenv("DB_PATH", "/app/sql/movies.db")
-
-
 def check_database_connection():
     try:
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-        # This ensures the connection is actually active
-        cursor.execute("SELECT 1;")
-        conn.close()
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            # This ensures the connection is actually active
+            cursor.execute("SELECT 1;")
     except sqlite3.Error as e:
         error_message = f"Database connection error: {e}"
         logger.error(error_message)
@@ -28,26 +25,49 @@ def check_database_connection():
 
 def check_table_exists(tablename: str):
     try:
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-        cursor.execute(f"SELECT 1 FROM {tablename} LIMIT 1;")
-        conn.close()
+        with get_db_connection() as conn:
+            cursor = conn.cursor()
+            # Look the name up in the schema rather than formatting it into a query
+            cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (tablename,))
+            if cursor.fetchone() is None:
+                raise sqlite3.OperationalError(f"no such table: {tablename}")
     except sqlite3.Error as e:
         error_message = f"Table check error: {e}"
         logger.error(error_message)
         raise Exception(error_message) from e
 
+def check_pool_capacity() -> dict:
+    """
+    Check that the movies connection pool has a connection left to hand out.
+
+    Returns:
+        dict: The pool counts, see get_pool_status.
+
+    Raises:
+        Exception: If every connection the pool allows is checked out.
+    """
+    status = get_pool_status(MOVIES_DATABASE_URL)
+    if status['capacity'] is not None and status['checked_out'] >= status['capacity']:
+        raise Exception(f"Connection pool saturated: {status['checked_out']} of {status['capacity']} connections in use")
+    return status
+
 ###################################################
 #
 # This one yields rather than returns.
 # What is the type of the yielded value?
 #
+# A pooled DB-API connection from the shared movies
+# engine; closing it hands it back to the pool.
+#
 ###################################################
 @contextmanager
 def get_db_connection():
     conn = None
     try:
-        conn = sqlite3.connect(DB_PATH)
+        try:
+            conn = get_engine(MOVIES_DATABASE_URL).raw_connection()
+        except DBAPIError as e:
+            raise e.orig from e
         yield conn
     except sqlite3.Error as e:
         logger.error("Database connection error: %s", str(e))
@@ -55,4 +75,3 @@ def get_db_connection():
     finally:
         if conn:
             conn.close()
-            logger.info("Database connection closed.")
\ No newline at end of file
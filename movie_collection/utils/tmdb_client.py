@@ -0,0 +1,357 @@
+import asyncio
+import logging
+import os
+import threading
+import weakref
+
+from movie_collection.utils.circuit_breaker import CircuitBreaker, CircuitOpenError
+from movie_collection.utils.json_stream import aiter_array_items, iter_array_items
+from movie_collection.utils.logger import configure_logger
+from movie_collection.utils.single_flight import SingleFlight
+
+
+logger = logging.getLogger(__name__)
+configure_logger(logger)
+
+
+API_KEY = os.getenv("TMDB_API_KEY", "")
+BASE_URL = 'https://api.themoviedb.org/3'
+
+# Bytes read at a time from streamed responses
+STREAM_CHUNK_SIZE = 16384
+
+# Connections kept open to TMDB by the shared session of each process
+TMDB_POOL_SIZE = int(os.getenv("TMDB_POOL_SIZE", "10"))
+
+# Connections the async client of each event loop opens to TMDB at most; further requests wait for one
+TMDB_ASYNC_POOL_SIZE = int(os.getenv("TMDB_ASYNC_POOL_SIZE", "100"))
+
+# How long check_tmdb waits for an answer
+TMDB_CHECK_TIMEOUT_SECONDS = float(os.getenv("TMDB_CHECK_TIMEOUT_SECONDS", "2"))
+
+# Seconds to wait for a connection and then for each read, so a stalled TMDB never holds a worker thread for long
+TMDB_TIMEOUT = (
+    float(os.getenv("TMDB_CONNECT_TIMEOUT_SECONDS", "3")),
+    float(os.getenv("TMDB_READ_TIMEOUT_SECONDS", "5"))
+)
+
+# Answers that mean TMDB is failing or shedding load rather than rejecting the request
+_UNAVAILABLE_STATUSES = frozenset([429, *range(500, 600)])
+
+_session = None
+_session_lock = threading.Lock()
+
+# Event loop -> its async client; an httpx client must not be shared between loops
+_async_clients = weakref.WeakKeyDictionary()
+
+# Identical TMDB requests in flight at the same time share one upstream call
+tmdb_flight = SingleFlight()
+
+# Fails TMDB requests at once while most recent ones failed or were slow, see CircuitBreaker
+tmdb_breaker = CircuitBreaker(
+    "tmdb",
+    failure_rate=float(os.getenv("TMDB_CIRCUIT_FAILURE_RATE", "0.5")),
+    slow_call_rate=float(os.getenv("TMDB_CIRCUIT_SLOW_CALL_RATE", "0.5")),
+    slow_call_seconds=float(os.getenv("TMDB_CIRCUIT_SLOW_CALL_SECONDS", "2")),
+    window=int(os.getenv("TMDB_CIRCUIT_WINDOW", "20")),
+    min_calls=int(os.getenv("TMDB_CIRCUIT_MIN_CALLS", "10")),
+    open_seconds=float(os.getenv("TMDB_CIRCUIT_OPEN_SECONDS", "30")),
+    half_open_calls=int(os.getenv("TMDB_CIRCUIT_HALF_OPEN_CALLS", "1"))
+)
+
+
+class TMDBUnavailableError(Exception):
+    """
+    Raised when TMDB cannot answer: the circuit is open, the request failed or timed out,
+    or TMDB answered with a server error.
+    """
+
+
+def create_session(pool_size: int) -> 'requests.Session':
+    """
+    Create an HTTP session whose connection pool can serve pool_size concurrent requests.
+
+    Args:
+        pool_size (int): Number of connections kept open to TMDB.
+
+    Returns:
+        requests.Session: The session, to be shared by the threads of one batch.
+    """
+    # Imported on first use: requests is not needed to start the server
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def get_session() -> 'requests.Session':
+    """
+    Get the TMDB session of this process, creating it on first use.
+
+    Requests made without an explicit session go through it, so they reuse its open
+    connections instead of connecting to TMDB every time.
+
+    Returns:
+        requests.Session: The shared session, with a pool of TMDB_POOL_SIZE connections.
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = create_session(TMDB_POOL_SIZE)
+        return _session
+
+
+def check_tmdb(timeout: float = TMDB_CHECK_TIMEOUT_SECONDS) -> dict:
+    """
+    Check that TMDB answers and accepts the API key, through the shared session.
+
+    Args:
+        timeout (float): Seconds to wait for the answer.
+
+    Returns:
+        dict: The HTTP status of the answer and the state of the TMDB circuit.
+
+    Raises:
+        Exception: If TMDB cannot be reached, times out or rejects the request.
+    """
+    try:
+        response = get_session().get(f"{BASE_URL}/configuration", params={'api_key': API_KEY}, timeout=timeout)
+    except Exception as e:
+        # requests errors quote the URL, and with it the API key
+        raise Exception(f"TMDB unreachable ({type(e).__name__})") from e
+    if response.status_code != 200:
+        raise Exception(f"TMDB answered {response.status_code}")
+    return {'status_code': response.status_code, 'circuit': tmdb_breaker.state}
+
+
+def _request(path: str, params: dict, session, stream: bool = False):
+    """
+    GET a TMDB endpoint through the circuit breaker, with timeouts.
+
+    Raises:
+        TMDBUnavailableError: If the circuit is open, the request failed or timed out, or
+            TMDB answered with a server error.
+    """
+    import requests
+
+    query = {'api_key': API_KEY}
+    if params:
+        query.update(params)
+
+    def send():
+        response = (session or get_session()).get(f"{BASE_URL}{path}", params=query, timeout=TMDB_TIMEOUT, stream=stream)
+        if response.status_code in _UNAVAILABLE_STATUSES:
+            response.close()
+            raise TMDBUnavailableError(f"TMDB answered {response.status_code}")
+        return response
+
+    try:
+        return tmdb_breaker.call(send)
+    except CircuitOpenError as e:
+        raise TMDBUnavailableError(str(e)) from e
+    except requests.RequestException as e:
+        # requests errors quote the URL, and with it the API key
+        raise TMDBUnavailableError(f"TMDB request failed ({type(e).__name__})") from e
+
+
+def _decode_json(response) -> dict:
+    """
+    Decode the JSON body of a TMDB response.
+
+    Raises:
+        TMDBUnavailableError: If the body is not valid JSON, e.g. cut off or an HTML error page.
+    """
+    try:
+        return response.json()
+    except ValueError as e:
+        raise TMDBUnavailableError(f"TMDB answered an invalid body ({type(e).__name__})") from e
+
+
+def tmdb_get(path: str, params: dict = None, session: 'requests.Session' = None) -> dict:
+    """
+    GET a TMDB endpoint and decode its JSON body.
+
+    Concurrent calls for the same endpoint and parameters share one request and its result,
+    which must therefore not be mutated.
+
+    Args:
+        path (str): The endpoint path, e.g. "/search/movie".
+        params (dict, optional): Query parameters; the API key is added automatically.
+        session (requests.Session, optional): Session to reuse connections from; defaults
+            to the shared session of the process.
+
+    Returns:
+        dict: The decoded response body.
+
+    Raises:
+        TMDBUnavailableError: If TMDB cannot answer.
+    """
+    key = (path, tuple(sorted((params or {}).items())))
+    return tmdb_flight.do(key, lambda: _decode_json(_request(path, params, session)))
+
+
+def tmdb_stream(path: str, key: str, params: dict = None, session: 'requests.Session' = None):
+    """
+    GET a TMDB endpoint and lazily decode the elements of one array field of its JSON body.
+
+    The body is parsed as it arrives, so large payloads are never held in memory as a whole.
+    When the caller stops early, the rest of the body is read without being parsed, which
+    keeps the connection reusable.
+
+    Args:
+        path (str): The endpoint path, e.g. "/movie/550/credits".
+        key (str): The top-level array field to decode, e.g. "crew".
+        params (dict, optional): Query parameters; the API key is added automatically.
+        session (requests.Session, optional): Session to reuse connections from; defaults
+            to the shared session of the process.
+
+    Yields:
+        The elements of the array, in order.
+
+    Raises:
+        TMDBUnavailableError: If TMDB cannot answer, or the body stops arriving.
+    """
+    import requests
+
+    response = _request(path, params, session, stream=True)
+    chunks = response.iter_content(chunk_size=STREAM_CHUNK_SIZE)
+    try:
+        yield from iter_array_items(chunks, key)
+    except requests.RequestException as e:
+        raise TMDBUnavailableError(f"TMDB response interrupted ({type(e).__name__})") from e
+    except ValueError as e:
+        raise TMDBUnavailableError(f"TMDB answered an invalid body: {e}") from e
+    finally:
+        try:
+            for _ in chunks:
+                pass
+        except requests.RequestException:
+            pass
+        response.close()
+
+
+def get_async_client() -> 'httpx.AsyncClient':
+    """
+    Get the async TMDB client of the running event loop, creating it on first use.
+
+    Returns:
+        httpx.AsyncClient: The client, with at most TMDB_ASYNC_POOL_SIZE connections and TMDB_TIMEOUT.
+    """
+    # Imported on first use: httpx is only needed by the async routes
+    import httpx
+
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        connect, read = TMDB_TIMEOUT
+        client = _async_clients[loop] = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=TMDB_ASYNC_POOL_SIZE, max_keepalive_connections=TMDB_ASYNC_POOL_SIZE),
+            timeout=httpx.Timeout(read, connect=connect)
+        )
+    return client
+
+
+async def aclose_async_client() -> None:
+    """
+    Close the async TMDB client of the running event loop, e.g. when the server shuts down.
+    """
+    client = _async_clients.pop(asyncio.get_running_loop(), None)
+    if client is not None:
+        await client.aclose()
+
+
+async def _arequest(path: str, params: dict, stream: bool = False):
+    """
+    GET a TMDB endpoint with the async client, through the circuit breaker.
+
+    Raises:
+        TMDBUnavailableError: If the circuit is open, the request failed or timed out, or
+            TMDB answered with a server error.
+    """
+    import httpx
+
+    query = {'api_key': API_KEY}
+    if params:
+        query.update(params)
+
+    async def send():
+        client = get_async_client()
+        response = await client.send(client.build_request("GET", f"{BASE_URL}{path}", params=query), stream=stream)
+        if response.status_code in _UNAVAILABLE_STATUSES:
+            await response.aclose()
+            raise TMDBUnavailableError(f"TMDB answered {response.status_code}")
+        return response
+
+    try:
+        return await tmdb_breaker.acall(send)
+    except CircuitOpenError as e:
+        raise TMDBUnavailableError(str(e)) from e
+    except httpx.HTTPError as e:
+        # httpx errors quote the URL, and with it the API key
+        raise TMDBUnavailableError(f"TMDB request failed ({type(e).__name__})") from e
+
+
+async def atmdb_get(path: str, params: dict = None) -> dict:
+    """
+    GET a TMDB endpoint and decode its JSON body, without blocking the event loop.
+
+    Concurrent calls on the same event loop for the same endpoint and parameters share one
+    request and its result, which must therefore not be mutated.
+
+    Args:
+        path (str): The endpoint path, e.g. "/search/movie".
+        params (dict, optional): Query parameters; the API key is added automatically.
+
+    Returns:
+        dict: The decoded response body.
+
+    Raises:
+        TMDBUnavailableError: If TMDB cannot answer.
+    """
+    async def fetch() -> dict:
+        return _decode_json(await _arequest(path, params))
+
+    key = (path, tuple(sorted((params or {}).items())))
+    return await tmdb_flight.ado(key, fetch)
+
+
+async def atmdb_stream(path: str, key: str, params: dict = None):
+    """
+    Async version of tmdb_stream: the body is parsed as it arrives, without blocking the event loop.
+
+    A caller that stops early must close the generator (await it.aclose()), which reads the
+    rest of the body and releases the connection.
+
+    Args:
+        path (str): The endpoint path, e.g. "/movie/550/credits".
+        key (str): The top-level array field to decode, e.g. "crew".
+        params (dict, optional): Query parameters; the API key is added automatically.
+
+    Yields:
+        The elements of the array, in order.
+
+    Raises:
+        TMDBUnavailableError: If TMDB cannot answer, or the body stops arriving.
+    """
+    import httpx
+
+    response = await _arequest(path, params, stream=True)
+    chunks = response.aiter_bytes(STREAM_CHUNK_SIZE)
+    try:
+        async for item in aiter_array_items(chunks, key):
+            yield item
+    except httpx.HTTPError as e:
+        raise TMDBUnavailableError(f"TMDB response interrupted ({type(e).__name__})") from e
+    except ValueError as e:
+        raise TMDBUnavailableError(f"TMDB answered an invalid body: {e}") from e
+    finally:
+        try:
+            async for _ in chunks:
+                pass
+        except httpx.HTTPError:
+            pass
+        await response.aclose()
@@ -3,6 +3,9 @@
 # Define the base URL for the Flask API
 BASE_URL="http://localhost:5000"
 
+# Session token issued by /login, sent with every movie request
+TOKEN=""
+
 # Flag to control whether to echo JSON output
 ECHO_JSON=false
 
@@ -25,7 +28,7 @@ done
 # Function to check the health of the service
 check_health() {
   echo "Checking health status..."
-  curl -s -X GET "$BASE_URL/api/health" | grep -q '"status": "healthy"'
+  curl -s -X GET "$BASE_URL/api/health" | grep -Eq '"status": ?"healthy"'
   if [ $? -eq 0 ]; then
     echo "Service is healthy."
   else
@@ -37,7 +40,7 @@ check_health() {
 # Function to check the database connection
 check_db() {
   echo "Checking database connection..."
-  curl -s -X GET "$BASE_URL/api/db-check" | grep -q '"database_status": "healthy"'
+  curl -s -X GET "$BASE_URL/api/db-check" | grep -Eq '"database_status": ?"healthy"'
   if [ $? -eq 0 ]; then
     echo "Database connection is healthy."
   else
@@ -58,7 +61,7 @@ create_account() {
 
   echo "Creating New Account..."
   curl -s -X POST "$BASE_URL/create-account" -H "Content-Type: application/json" \
-    -d "{\"username\":\"$username\", \"password\":\"$password\"}" | grep -q '"status": "success"'
+    -d "{\"username\":\"$username\", \"password\":\"$password\"}" | grep -Eq '"status": ?"success"'
   if [ $? -eq 0 ]; then
     echo "Account created successfully."
   else
@@ -72,9 +75,12 @@ login() {
   password=$2
 
   echo "Logging in..."
-  curl -s -X POST "$BASE_URL/login" -H "Content-Type: application/json" \
-    -d "{\"username\":\"$username\", \"password\":\"$password\"}" | grep -q '"status": "success"'
+  response=$(curl -s -X POST "$BASE_URL/login" -H "Content-Type: application/json" \
+    -d "{\"username\":\"$username\", \"password\":\"$password\"}")
+  echo "$response" | grep -Eq '"status": ?"success"'
   if [ $? -eq 0 ]; then
+    # Keep the session token for the movie routes
+    TOKEN=$(echo "$response" | sed -n 's/.*"token": *"\([^"]*\)".*/\1/p')
     echo "Login successfully."
   else
     echo "Account Login failed."
@@ -89,7 +95,7 @@ update_password() {
 
   echo "Logging in..."
   curl -s -X POST "$BASE_URL/update-password" -H "Content-Type: application/json" \
-    -d "{\"username\":\"$username\", \"old_password\":\"$old_password\", \"new_password\":\"$new_password\"}" | grep -q '"status": "success"'
+    -d "{\"username\":\"$username\", \"old_password\":\"$old_password\", \"new_password\":\"$new_password\"}" | grep -Eq '"status": ?"success"'
   if [ $? -eq 0 ]; then
     echo "Password updated successfully."
   else
@@ -108,8 +114,8 @@ search_by_name(){
   name=$1
 
   echo "Searching by name..."
-  curl -s -X POST "$BASE_URL/movies/search-by-name" -H "Content-Type: application/json" \
-    -d "{\"name\":\"$name\"}" | grep -q '"status": "success"'
+  curl -s -X POST "$BASE_URL/movies/search-by-name" -H "Authorization: Bearer $TOKEN" -H "Content-Type: application/json" \
+    -d "{\"name\":\"$name\"}" | grep -Eq '"status": ?"success"'
   if [ $? -eq 0 ]; then
     echo "Movie retrived successfully."
   else
@@ -122,8 +128,8 @@ search_by_year(){
   year=$1
 
   echo "Searching by year..."
-  curl -s -X POST "$BASE_URL/movies/search-by-year" -H "Content-Type: application/json" \
-    -d "{\"year\":$year}" | grep -q '"status": "success"'
+  curl -s -X POST "$BASE_URL/movies/search-by-year" -H "Authorization: Bearer $TOKEN" -H "Content-Type: application/json" \
+    -d "{\"year\":$year}" | grep -Eq '"status": ?"success"'
   if [ $? -eq 0 ]; then
     echo "Movie retrived successfully."
   else
@@ -136,8 +142,8 @@ search_by_language(){
   language_code=$1
 
   echo "Searching by language..."
-  curl -s -X POST "$BASE_URL/movies/search-by-language" -H "Content-Type: application/json" \
-    -d "{\"language_code\":\"$language_code\"}" | grep -q '"status": "success"'
+  curl -s -X POST "$BASE_URL/movies/search-by-language" -H "Authorization: Bearer $TOKEN" -H "Content-Type: application/json" \
+    -d "{\"language_code\":\"$language_code\"}" | grep -Eq '"status": ?"success"'
   if [ $? -eq 0 ]; then
     echo "Movie retrived successfully."
   else
@@ -150,8 +156,8 @@ search_by_director(){
   director=$1
 
   echo "Searching by director..."
-  curl -s -X POST "$BASE_URL/movies/search-by-director" -H "Content-Type: application/json" \
-    -d "{\"director\":\"$director\"}" | grep -q '"status": "success"'
+  curl -s -X POST "$BASE_URL/movies/search-by-director" -H "Authorization: Bearer $TOKEN" -H "Content-Type: application/json" \
+    -d "{\"director\":\"$director\"}" | grep -Eq '"status": ?"success"'
   if [ $? -eq 0 ]; then
     echo "Movie retrived successfully."
   else
@@ -164,8 +170,8 @@ search_by_genre(){
   genre_id=$1
 
   echo "Searching by genre..."
-  curl -s -X POST "$BASE_URL/movies/search-by-genre" -H "Content-Type: application/json" \
-    -d "{\"genre_id\":\"$genre_id\"}" | grep -q '"status": "success"'
+  curl -s -X POST "$BASE_URL/movies/search-by-genre" -H "Authorization: Bearer $TOKEN" -H "Content-Type: application/json" \
+    -d "{\"genre_id\":\"$genre_id\"}" | grep -Eq '"status": ?"success"'
   if [ $? -eq 0 ]; then
     echo "Movie retrived successfully."
   else
@@ -184,8 +190,8 @@ add_movie_to_list()
   favorite=$6
 
   echo "Adding Movie to the database..."
-  curl -s -X POST "$BASE_URL/movies/add-to-list" -H "Content-Type: application/json" \
-    -d "{\"name\":\"$name\", \"year\":\"$year\", \"language_code\":\"$language_code\", \"director\":\"$director\", \"genres\":\"$genres\", \"favorite\":\"$favorite\"}" | grep -q '"status": "success"'
+  curl -s -X POST "$BASE_URL/movies/add-to-list" -H "Authorization: Bearer $TOKEN" -H "Content-Type: application/json" \
+    -d "{\"name\":\"$name\", \"year\":\"$year\", \"language_code\":\"$language_code\", \"director\":\"$director\", \"genres\":\"$genres\", \"favorite\":\"$favorite\"}" | grep -Eq '"status": ?"success"'
   if [ $? -eq 0 ]; then
     echo "Movie added successfully."
   else
@@ -199,8 +205,8 @@ delete_movie_from_list()
   movie_id=$1
 
   echo "Deleting Movie from the database..."
-  curl -s -X DELETE "$BASE_URL/movies/delete-from-list" -H "Content-Type: application/json" \
-    -d "{\"movie_id\":\"$movie_id\"}" | grep -q '"status": "success"'
+  curl -s -X DELETE "$BASE_URL/movies/delete-from-list" -H "Authorization: Bearer $TOKEN" -H "Content-Type: application/json" \
+    -d "{\"movie_id\":\"$movie_id\"}" | grep -Eq '"status": ?"success"'
   if [ $? -eq 0 ]; then
     echo "Movie deleted successfully."
   else
@@ -212,7 +218,7 @@ delete_movie_from_list()
 clear_movie_list()
 {
   echo "Clearing movie database..."
-  curl -s -X DELETE "$BASE_URL/movies/clear-list" | grep -q '"status": "success"'
+  curl -s -X DELETE "$BASE_URL/movies/clear-list" -H "Authorization: Bearer $TOKEN" | grep -Eq '"status": ?"success"'
   if [ $? -eq 0 ]; then
     echo "Database is now empty."
   else
@@ -225,8 +231,8 @@ mark_movie_as_favorite()
 {
   name=$1
   echo "Clearing movie database..."
-  curl -s -X POST "$BASE_URL/movies/mark-as-favorite" -H "Content-Type: application/json" \
-    -d "{\"name\":\"$name\"}" | grep -q '"status": "success"'
+  curl -s -X POST "$BASE_URL/movies/mark-as-favorite" -H "Authorization: Bearer $TOKEN" -H "Content-Type: application/json" \
+    -d "{\"name\":\"$name\"}" | grep -Eq '"status": ?"success"'
   if [ $? -eq 0 ]; then
     echo "This movie is marked as favorite."
   else
@@ -238,7 +244,7 @@ mark_movie_as_favorite()
 list_favorite_movies()
 {
   echo "Retrieving favorite movies..."
-  curl -s -X GET "$BASE_URL/movies/list-favorite" | grep -q '"status": "success"'
+  curl -s -X GET "$BASE_URL/movies/list-favorite" -H "Authorization: Bearer $TOKEN" | grep -Eq '"status": ?"success"'
   if [ $? -eq 0 ]; then
     echo "Favorite movie retrived successfully."
   else
@@ -1,5 +1,5 @@
-DROP TABLE IF EXISTS movies;
-CREATE TABLE movies (
+-- The movie catalog as first shipped. IF NOT EXISTS adopts databases created before migrations.
+CREATE TABLE IF NOT EXISTS movies (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
     name TEXT UNIQUE NOT NULL,
     year INTEGER NOT NULL,
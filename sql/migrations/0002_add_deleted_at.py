@@ -0,0 +1,17 @@
+"""Record when a movie was soft-deleted, so purges can keep a retention window."""
+
+
+def upgrade(conn, report):
+    cursor = conn.cursor()
+    cursor.execute("PRAGMA table_info(movies)")
+    # Databases created from the old DDL file already have the column
+    if any(row[1] == "deleted_at" for row in cursor.fetchall()):
+        report("movies.deleted_at already exists.")
+        return
+    cursor.execute("BEGIN IMMEDIATE")
+    try:
+        cursor.execute("ALTER TABLE movies ADD COLUMN deleted_at TIMESTAMP")
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
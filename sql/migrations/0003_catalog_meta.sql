@@ -0,0 +1,21 @@
+-- Catalog version, bumped on every write to movies so readers can tell whether anything changed.
+-- It starts from the creation time in milliseconds, so a recreated database never reuses old versions.
+CREATE TABLE IF NOT EXISTS catalog_meta (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    version INTEGER NOT NULL
+);
+INSERT INTO catalog_meta (id, version) VALUES (1, CAST(strftime('%s', 'now') AS INTEGER) * 1000)
+    ON CONFLICT (id) DO UPDATE SET version = version + 1;
+
+CREATE TRIGGER IF NOT EXISTS movies_insert_version AFTER INSERT ON movies
+BEGIN
+    UPDATE catalog_meta SET version = version + 1 WHERE id = 1;
+END;
+CREATE TRIGGER IF NOT EXISTS movies_update_version AFTER UPDATE ON movies
+BEGIN
+    UPDATE catalog_meta SET version = version + 1 WHERE id = 1;
+END;
+CREATE TRIGGER IF NOT EXISTS movies_delete_version AFTER DELETE ON movies
+BEGIN
+    UPDATE catalog_meta SET version = version + 1 WHERE id = 1;
+END;
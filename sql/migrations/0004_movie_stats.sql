@@ -0,0 +1,79 @@
+-- Number of active (not soft-deleted) movies per year, language, genre and director, plus the
+-- total under ('total', ''), kept up to date by the triggers below. Rebuild it from the movies
+-- table with: python -m movie_collection.utils.maintenance rebuild-stats
+CREATE TABLE IF NOT EXISTS movie_stats (
+    dimension TEXT NOT NULL,
+    value NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (dimension, value)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS movie_stats_by_count ON movie_stats (dimension, count DESC);
+
+-- Each trigger upserts +1/-1 per value; genres are stored comma-separated and split with json_each()
+-- after json_quote() escapes them, so quotes, backslashes and control characters stay inside the values
+CREATE TRIGGER IF NOT EXISTS movies_insert_stats AFTER INSERT ON movies WHEN NOT NEW.deleted
+BEGIN
+    INSERT INTO movie_stats (dimension, value, count)
+    SELECT column1, column2, 1
+    FROM (VALUES ('total', ''), ('year', NEW.year), ('language', NEW.original_language), ('director', NEW.director))
+    WHERE true
+    ON CONFLICT (dimension, value) DO UPDATE SET count = count + excluded.count;
+    INSERT INTO movie_stats (dimension, value, count)
+    SELECT DISTINCT 'genre', value, 1
+    FROM json_each('[' || replace(json_quote(NEW.genres), ', ', '","') || ']')
+    WHERE true
+    ON CONFLICT (dimension, value) DO UPDATE SET count = count + excluded.count;
+END;
+CREATE TRIGGER IF NOT EXISTS movies_delete_stats AFTER DELETE ON movies WHEN NOT OLD.deleted
+BEGIN
+    INSERT INTO movie_stats (dimension, value, count)
+    SELECT column1, column2, -1
+    FROM (VALUES ('total', ''), ('year', OLD.year), ('language', OLD.original_language), ('director', OLD.director))
+    WHERE true
+    ON CONFLICT (dimension, value) DO UPDATE SET count = count + excluded.count;
+    INSERT INTO movie_stats (dimension, value, count)
+    SELECT DISTINCT 'genre', value, -1
+    FROM json_each('[' || replace(json_quote(OLD.genres), ', ', '","') || ']')
+    WHERE true
+    ON CONFLICT (dimension, value) DO UPDATE SET count = count + excluded.count;
+    DELETE FROM movie_stats WHERE dimension IN ('total', 'year', 'language', 'director', 'genre') AND count <= 0;
+END;
+CREATE TRIGGER IF NOT EXISTS movies_update_stats AFTER UPDATE OF deleted, year, original_language, director, genres ON movies
+BEGIN
+    INSERT INTO movie_stats (dimension, value, count)
+    SELECT column1, column2, -1
+    FROM (VALUES ('total', ''), ('year', OLD.year), ('language', OLD.original_language), ('director', OLD.director))
+    WHERE NOT OLD.deleted
+    ON CONFLICT (dimension, value) DO UPDATE SET count = count + excluded.count;
+    INSERT INTO movie_stats (dimension, value, count)
+    SELECT DISTINCT 'genre', value, -1
+    FROM json_each('[' || replace(json_quote(OLD.genres), ', ', '","') || ']')
+    WHERE NOT OLD.deleted
+    ON CONFLICT (dimension, value) DO UPDATE SET count = count + excluded.count;
+    INSERT INTO movie_stats (dimension, value, count)
+    SELECT column1, column2, 1
+    FROM (VALUES ('total', ''), ('year', NEW.year), ('language', NEW.original_language), ('director', NEW.director))
+    WHERE NOT NEW.deleted
+    ON CONFLICT (dimension, value) DO UPDATE SET count = count + excluded.count;
+    INSERT INTO movie_stats (dimension, value, count)
+    SELECT DISTINCT 'genre', value, 1
+    FROM json_each('[' || replace(json_quote(NEW.genres), ', ', '","') || ']')
+    WHERE NOT NEW.deleted
+    ON CONFLICT (dimension, value) DO UPDATE SET count = count + excluded.count;
+    DELETE FROM movie_stats WHERE dimension IN ('total', 'year', 'language', 'director', 'genre') AND count <= 0;
+END;
+
+-- Count the movies already in the catalog
+DELETE FROM movie_stats;
+INSERT INTO movie_stats (dimension, value, count)
+SELECT 'total', '', COUNT(*) FROM movies WHERE NOT deleted HAVING COUNT(*) > 0
+UNION ALL
+SELECT 'year', year, COUNT(*) FROM movies WHERE NOT deleted GROUP BY year
+UNION ALL
+SELECT 'language', original_language, COUNT(*) FROM movies WHERE NOT deleted GROUP BY original_language
+UNION ALL
+SELECT 'director', director, COUNT(*) FROM movies WHERE NOT deleted GROUP BY director
+UNION ALL
+SELECT 'genre', genre.value, COUNT(DISTINCT movies.id)
+FROM movies, json_each('[' || replace(json_quote(genres), ', ', '","') || ']') AS genre
+WHERE NOT deleted GROUP BY genre.value;
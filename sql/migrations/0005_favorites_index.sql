@@ -0,0 +1,2 @@
+-- Favorites are read on every list-favorite request; index just those rows instead of scanning the catalog
+CREATE INDEX IF NOT EXISTS movies_favorite_name ON movies (name) WHERE favorite = TRUE;
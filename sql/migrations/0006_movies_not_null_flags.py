@@ -0,0 +1,28 @@
+"""Make favorite and deleted NOT NULL, so that NOT deleted and favorite = TRUE never see a NULL."""
+from movie_collection.utils.maintenance import recompute_movie_stats
+from movie_collection.utils.migrations import rebuild_table
+
+
+CREATE_MOVIES = """
+CREATE TABLE {name} (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT UNIQUE NOT NULL,
+    year INTEGER NOT NULL,
+    director TEXT NOT NULL,
+    genres TEXT NOT NULL,
+    original_language TEXT NOT NULL,
+    favorite BOOLEAN NOT NULL DEFAULT FALSE,
+    deleted BOOLEAN NOT NULL DEFAULT FALSE,
+    deleted_at TIMESTAMP
+)
+"""
+
+COLUMNS = ('id', 'name', 'year', 'director', 'genres', 'original_language', 'favorite', 'deleted', 'deleted_at')
+
+
+def upgrade(conn, report):
+    select = tuple(f"COALESCE({column}, FALSE)" if column in ('favorite', 'deleted') else column
+                   for column in COLUMNS)
+    rebuild_table(conn, "movies", CREATE_MOVIES, COLUMNS, select, report=report)
+    # The stats triggers and the initial count of 0004 skipped rows whose deleted flag was NULL
+    report(f"movie_stats: recomputed {recompute_movie_stats(conn)} rows.")
@@ -0,0 +1,221 @@
+import asyncio
+from contextlib import contextmanager
+import sqlite3
+import threading
+
+from flask import request
+import httpx
+import pytest
+
+import app
+import asgi
+from movie_collection.models import movie_model
+from movie_collection.utils.asgi_bridge import ASGIBridge
+from movie_collection.utils.concurrency_limiter import ConcurrencyLimiter
+from movie_collection.utils.migrations import upgrade
+from movie_collection.utils.session_utils import issue_session_token
+
+
+@pytest.fixture
+def movies_db(tmp_path, mocker):
+    """Create a real movies database with the schema migrations and route get_db_connection to it."""
+    db_path = tmp_path / "movies.db"
+    mocker.patch("movie_collection.utils.migrations.MIGRATIONS_PATH", "sql/migrations")
+    conn = sqlite3.connect(db_path)
+    upgrade(conn)
+    conn.close()
+
+    @contextmanager
+    def mock_get_db_connection():
+        conn = sqlite3.connect(db_path)
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    mocker.patch("movie_collection.models.movie_model.get_db_connection", mock_get_db_connection)
+    movie_model.clear_tmdb_caches()
+    return db_path
+
+
+@pytest.fixture(autouse=True)
+def session_generations(mocker):
+    """Accept the tokens of the tests without a users database."""
+    mocker.patch.object(app.Users, "get_session_generation", return_value=0)
+    mocker.patch.dict(app.app.extensions, {'session_generations': app.Users.get_session_generation})
+
+
+@pytest.fixture
+def slow_tmdb(mocker):
+    """Fake the async TMDB client: every search waits until the returned event is set."""
+    release = asyncio.Event()
+
+    async def fake_atmdb_get(path, params=None):
+        if path == "/search/movie":
+            await release.wait()
+            return {'results': [{'id': 1, 'title': params['query'], 'release_date': "2010-01-01",
+                                 'genre_ids': [18], 'original_language': "en"}]}
+        if path == "/genre/movie/list":
+            return {'genres': [{'id': 18, 'name': "Drama"}]}
+
+    async def fake_atmdb_stream(path, key, params=None):
+        yield {'job': "Director", 'name': "Jane Doe"}
+
+    mocker.patch.object(movie_model, "atmdb_get", side_effect=fake_atmdb_get)
+    mocker.patch.object(movie_model, "atmdb_stream", fake_atmdb_stream)
+    return release
+
+
+def search(client, route, body):
+    headers = {'Authorization': f'Bearer {issue_session_token("user")}'}
+    return client.post(f'/movies/search-by-{route}', json=body, headers=headers)
+
+
+def test_searches_wait_on_the_event_loop_without_threads(movies_db, slow_tmdb, mocker):
+    """Test that hundreds of searches can be in flight in one process without a thread each."""
+    limiter = ConcurrencyLimiter(100, max_waiting=200)
+    mocker.patch.dict(app.search_limiters, {'name': limiter})
+
+    async def main():
+        transport = httpx.ASGITransport(app=asgi.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            requests = [asyncio.ensure_future(search(client, 'name', {'name': f"Movie {i}"})) for i in range(300)]
+            while limiter.stats()['waiting'] < 200:
+                await asyncio.sleep(0.01)
+            threads = threading.active_count()
+            slow_tmdb.set()
+            return threads, await asyncio.gather(*requests)
+
+    threads, responses = asyncio.run(main())
+
+    assert threads < 50
+    assert all(response.status_code == 200 for response in responses)
+    assert responses[-1].json()['name'] == "Movie 299"
+    assert responses[-1].headers['Server-Timing'].startswith("queue;dur=")
+    assert limiter.stats()['admitted'] == 300 and limiter.stats()['max_queue_ms'] > 0
+
+
+def test_full_search_queue_answers_503(movies_db, slow_tmdb, mocker):
+    """Test that a search finding the queue of its route full is rejected at once."""
+    mocker.patch.dict(app.search_limiters, {'name': ConcurrencyLimiter(1, max_waiting=0)})
+
+    async def main():
+        transport = httpx.ASGITransport(app=asgi.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            first = asyncio.ensure_future(search(client, 'name', {'name': "Heat"}))
+            while app.search_limiters['name'].active == 0:
+                await asyncio.sleep(0.01)
+            rejected = await search(client, 'name', {'name': "Ronin"})
+            slow_tmdb.set()
+            return await first, rejected, await client.get('/api/search-stats')
+
+    first, rejected, stats = asyncio.run(main())
+
+    assert first.status_code == 200
+    assert rejected.status_code == 503 and rejected.headers['Retry-After'] == "1"
+    assert stats.status_code == 200, "Sync routes are served by the WSGI application."
+    assert stats.json()['name']['rejected'] == 1
+
+
+def test_async_search_under_wsgi(movies_db, slow_tmdb):
+    """Test that the async search routes still work under a WSGI server."""
+    slow_tmdb.set()
+    client = app.create_app({'TESTING': True}).test_client()
+
+    response = search(client, 'name', {'name': "Heat"})
+
+    assert response.status_code == 200
+    assert response.get_json()['director'] == "Jane Doe"
+    assert search(client, 'name', {}).status_code == 400
+
+
+def run_asgi(send):
+    """Run send(client) against asgi.app and return its result."""
+    async def main():
+        transport = httpx.ASGITransport(app=asgi.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            return await send(client)
+
+    return asyncio.run(main())
+
+
+def test_async_search_validation():
+    """Test that invalid searches are answered 400 before any search runs."""
+    async def send(client):
+        return [await search(client, route, body) for route, body in [
+            ('name', {}), ('year', {'year': "abc"}), ('year', {'year': 1800}), ('language', {}),
+            ('director', {}), ('genre', {'genre_id': "abc"}), ('genre', {'genre_id': -1})
+        ]]
+
+    responses = run_asgi(send)
+
+    assert [response.status_code for response in responses] == [400] * 7
+    assert responses[0].json() == {'error': 'Movie name is required'}
+
+
+def test_async_search_not_found(movies_db, mocker):
+    """Test that searches TMDB has no result for are answered 404."""
+    async def fake_atmdb_get(path, params=None):
+        return {'results': []}
+
+    mocker.patch.object(movie_model, "atmdb_get", side_effect=fake_atmdb_get)
+
+    async def send(client):
+        return [await search(client, route, body) for route, body in [
+            ('name', {'name': "Nothing"}), ('year', {'year': 2010}), ('director', {'director': "Nobody"})
+        ]]
+
+    responses = run_asgi(send)
+
+    assert [response.status_code for response in responses] == [404] * 3
+    assert responses[2].json() == {'error': 'Director not found.'}
+
+
+def test_async_search_tmdb_unavailable(movies_db, mocker):
+    """Test that searches fall back to stale catalog movies while TMDB is unavailable, and answer 503 without one."""
+    movie_model.add_movie_to_list("Heat", 1995, "Michael Mann", ["Crime"], "en")
+
+    async def unavailable(path, params=None):
+        raise movie_model.TMDBUnavailableError("Circuit tmdb is open")
+
+    mocker.patch.object(movie_model, "atmdb_get", side_effect=unavailable)
+
+    async def send(client):
+        return [await search(client, route, body) for route, body in [
+            ('name', {'name': "heat"}), ('director', {'director': "michael  mann"}), ('year', {'year': 2010})
+        ]]
+
+    by_name, by_director, by_year = run_asgi(send)
+
+    assert by_name.status_code == 200 and by_name.json()['stale'] is True
+    assert by_name.headers['Warning'] == '110 - "Response is Stale"'
+    assert by_director.status_code == 200 and by_director.json()['name'] == "Heat"
+    assert by_year.status_code == 503 and int(by_year.headers['Retry-After']) >= 1
+
+
+def test_async_search_sees_forwarded_client(mocker):
+    """Test that async views see the client IP from X-Forwarded-For, through ProxyFix, like the other views."""
+    mocker.patch.object(app, "TRUSTED_PROXY_COUNT", 1)
+    bridge = ASGIBridge(app.create_app({'TESTING': True}))
+    client_addresses = []
+
+    async def fake_afind_movie_by_name(name):
+        client_addresses.append(request.remote_addr)
+        return movie_model.Movie(name, 2010, "Jane Doe", ["Drama"], "en")
+
+    mocker.patch.object(app, "afind_movie_by_name", side_effect=fake_afind_movie_by_name)
+    headers = {'Authorization': f'Bearer {issue_session_token("user")}', 'X-Forwarded-For': "203.0.113.7"}
+
+    async def main():
+        transport = httpx.ASGITransport(app=bridge, client=("10.0.0.2", 5000))
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            proxied = await client.post('/movies/search-by-name', json={'name': "Heat"}, headers=headers)
+        transport = httpx.ASGITransport(app=asgi.app, client=("10.0.0.2", 5000))
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+            direct = await client.post('/movies/search-by-name', json={'name': "Heat"}, headers=headers)
+        return proxied, direct
+
+    proxied, direct = asyncio.run(main())
+
+    assert proxied.status_code == 200 and direct.status_code == 200
+    assert client_addresses == ["203.0.113.7", "10.0.0.2"], "Without trusted proxies the header is ignored."
@@ -0,0 +1,33 @@
+from movie_collection.utils.cache import VersionedCache
+
+def test_versioned_cache_revalidates_unchanged_version():
+    """Test that an expired entry is served again when the data version has not changed."""
+    cache = VersionedCache(lambda: 1)
+    loads = []
+    assert cache.get("key", lambda: loads.append(1) or "value") == "value"
+    assert cache.get("key", lambda: loads.append(1) or "fresh") == "value"
+    assert len(loads) == 1
+    assert (cache.hits, cache.misses) == (1, 1)
+
+def test_versioned_cache_reloads_changed_version():
+    """Test that an entry is reloaded once the data version changed."""
+    version = [1]
+    cache = VersionedCache(lambda: version[0])
+    cache.get("key", lambda: "old")
+    version[0] = 2
+    assert cache.get("key", lambda: "new") == "new"
+
+def test_versioned_cache_invalidate_during_revalidation():
+    """Test that an entry dropped while its version is checked is not put back."""
+    cache = VersionedCache(lambda: 1)
+    cache.get("key", lambda: "stale")
+
+    def invalidate_then_read_version():
+        cache.invalidate()
+        return 1
+
+    cache.get_version = invalidate_then_read_version
+    cache.get("key", lambda: "fresh")
+
+    cache.get_version = lambda: 1
+    assert cache.get("key", lambda: "fresh") == "fresh", "The invalidated entry should have been reloaded."
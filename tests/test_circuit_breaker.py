@@ -0,0 +1,198 @@
+import pytest
+import requests
+
+from movie_collection.utils import circuit_breaker, tmdb_client
+from movie_collection.utils.circuit_breaker import CircuitBreaker, CircuitOpenError
+from movie_collection.utils.tmdb_client import TMDBUnavailableError
+
+
+class FakeClock:
+    """Stands in for time.monotonic, advanced by hand."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(mocker):
+    clock = FakeClock()
+    mocker.patch.object(circuit_breaker.time, "monotonic", clock)
+    return clock
+
+
+def fail():
+    raise ConnectionError("upstream down")
+
+
+def test_opens_on_failure_rate_and_rejects(clock):
+    """Test that the circuit opens once enough recent calls failed, then fails fast."""
+    breaker = CircuitBreaker("test", failure_rate=0.5, window=4, min_calls=4, open_seconds=30)
+    assert breaker.call(lambda: "ok") == "ok"
+    for _ in range(2):
+        with pytest.raises(ConnectionError):
+            breaker.call(fail)
+    assert breaker.state == CircuitBreaker.CLOSED, "Too few calls to judge yet."
+
+    with pytest.raises(ConnectionError):
+        breaker.call(fail)
+    assert breaker.state == CircuitBreaker.OPEN
+
+    calls = []
+    with pytest.raises(CircuitOpenError):
+        breaker.call(lambda: calls.append(1))
+    assert calls == []
+    assert breaker.retry_after() == 30
+    assert breaker.stats()['opened'] == 1 and breaker.stats()['rejected'] == 1
+
+
+def test_opens_on_slow_calls(clock):
+    """Test that calls slower than the threshold open the circuit even when they succeed."""
+    breaker = CircuitBreaker("test", slow_call_rate=0.5, slow_call_seconds=2, window=2, min_calls=2)
+
+    def slow():
+        clock.now += 3
+        return "ok"
+
+    breaker.call(slow)
+    breaker.call(slow)
+    assert breaker.state == CircuitBreaker.OPEN
+
+
+def test_half_open_probe_closes_or_reopens(clock):
+    """Test that after the open period one probe goes through and decides the state."""
+    breaker = CircuitBreaker("test", window=1, min_calls=1, open_seconds=30, half_open_calls=1)
+    with pytest.raises(ConnectionError):
+        breaker.call(fail)
+    clock.now += 30
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+
+    with pytest.raises(ConnectionError):
+        breaker.call(fail)
+    assert breaker.state == CircuitBreaker.OPEN, "A failed probe opens the circuit again."
+
+    clock.now += 30
+
+    def probe():
+        # A second caller is rejected while the probe is in flight
+        with pytest.raises(CircuitOpenError):
+            breaker.call(lambda: "ok")
+        return "ok"
+
+    assert breaker.call(probe) == "ok"
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_tmdb_request_errors_are_wrapped(mocker):
+    """Test that TMDB timeouts, server errors and an open circuit raise TMDBUnavailableError without the URL."""
+    breaker = CircuitBreaker("tmdb", window=3, min_calls=3)
+    mocker.patch.object(tmdb_client, "tmdb_breaker", breaker)
+    get = mocker.patch("requests.Session.get", side_effect=requests.exceptions.ReadTimeout("https://api?api_key=secret"))
+
+    with pytest.raises(TMDBUnavailableError) as error:
+        tmdb_client.tmdb_get("/search/movie", {'query': "Heat"})
+    assert "secret" not in str(error.value)
+    assert get.call_args.kwargs['timeout'] == tmdb_client.TMDB_TIMEOUT
+
+    get.side_effect = None
+    get.return_value = mocker.Mock(status_code=503)
+    for _ in range(2):
+        with pytest.raises(TMDBUnavailableError):
+            tmdb_client.tmdb_get("/search/movie", {'query': "Heat"})
+    assert breaker.state == CircuitBreaker.OPEN
+
+    get.reset_mock()
+    with pytest.raises(TMDBUnavailableError):
+        tmdb_client.tmdb_get("/search/movie", {'query': "Heat"})
+    get.assert_not_called()
+
+
+def test_async_tmdb_request_errors_are_wrapped(mocker):
+    """Test that the async client reports server errors and connection failures as TMDBUnavailableError."""
+    import asyncio
+    import httpx
+
+    mocker.patch.object(tmdb_client, "tmdb_breaker", CircuitBreaker("tmdb"))
+    statuses = iter([502, None, 200])
+
+    def handler(request):
+        status = next(statuses)
+        if status is None:
+            raise httpx.ConnectError(f"cannot connect to {request.url}")
+        return httpx.Response(status, json={'results': []})
+
+    async def main():
+        mocker.patch.object(tmdb_client, "get_async_client",
+                            return_value=httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+        errors = []
+        for _ in range(2):
+            with pytest.raises(TMDBUnavailableError) as error:
+                await tmdb_client.atmdb_get("/search/movie", {'query': "Heat"})
+            errors.append(str(error.value))
+        return errors, await tmdb_client.atmdb_get("/search/movie", {'query': "Heat"})
+
+    errors, data = asyncio.run(main())
+
+    assert errors == ["TMDB answered 502", "TMDB request failed (ConnectError)"]
+    assert data == {'results': []}
+
+
+def test_cancelled_calls_are_not_failures(clock):
+    """Test that a cancelled call neither counts as a failure nor keeps its probe slot."""
+    import asyncio
+
+    breaker = CircuitBreaker("test", window=1, min_calls=1, open_seconds=30, half_open_calls=1)
+
+    async def cancelled():
+        raise asyncio.CancelledError()
+
+    async def ok():
+        return "ok"
+
+    async def main():
+        with pytest.raises(asyncio.CancelledError):
+            await breaker.acall(cancelled)
+        assert breaker.state == CircuitBreaker.CLOSED
+
+        with pytest.raises(ConnectionError):
+            breaker.call(fail)
+        clock.now += 30
+        with pytest.raises(asyncio.CancelledError):
+            await breaker.acall(cancelled)
+        assert breaker.state == CircuitBreaker.HALF_OPEN
+        return await breaker.acall(ok)
+
+    assert asyncio.run(main()) == "ok"
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_invalid_tmdb_bodies_are_unavailable(mocker):
+    """Test that a cut-off or HTML body raises TMDBUnavailableError, from the sync and async clients."""
+    import asyncio
+    import httpx
+
+    mocker.patch.object(tmdb_client, "tmdb_breaker", CircuitBreaker("tmdb"))
+    response = mocker.Mock(status_code=200)
+    response.json.side_effect = requests.exceptions.JSONDecodeError("Expecting value", "<html>", 0)
+    mocker.patch("requests.Session.get", return_value=response)
+
+    with pytest.raises(TMDBUnavailableError, match="invalid body"):
+        tmdb_client.tmdb_get("/search/movie", {'query': "Heat"})
+
+    def handler(request):
+        if request.url.path.endswith("/credits"):
+            return httpx.Response(200, content=b'{"crew": [{"job": "Dir')
+        return httpx.Response(200, content=b"<html>Bad gateway</html>")
+
+    async def main():
+        mocker.patch.object(tmdb_client, "get_async_client",
+                            return_value=httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+        with pytest.raises(TMDBUnavailableError, match="invalid body"):
+            await tmdb_client.atmdb_get("/search/movie", {'query': "Heat"})
+        with pytest.raises(TMDBUnavailableError, match="invalid body"):
+            async for _ in tmdb_client.atmdb_stream("/movie/1/credits", 'crew'):
+                pass
+
+    asyncio.run(main())
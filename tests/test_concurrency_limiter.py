@@ -0,0 +1,64 @@
+import asyncio
+
+import pytest
+
+from movie_collection.utils.concurrency_limiter import ConcurrencyLimiter, LimiterFullError
+
+
+def test_waiters_get_slots_in_arrival_order():
+    """Test that no more than limit coroutines run at once and waiters are served first come, first served."""
+    limiter = ConcurrencyLimiter(2, max_waiting=10)
+    running = []
+    order = []
+
+    async def work(i):
+        async with limiter.slot():
+            running.append(i)
+            order.append(i)
+            assert len(running) <= 2
+            await asyncio.sleep(0.01)
+            running.remove(i)
+
+    async def main():
+        await asyncio.gather(*(work(i) for i in range(6)))
+
+    asyncio.run(main())
+
+    assert order == list(range(6))
+    stats = limiter.stats()
+    assert stats['admitted'] == 6 and stats['active'] == 0 and stats['waiting'] == 0
+    assert stats['max_queue_ms'] > 0
+
+
+def test_full_queue_and_wait_timeout_are_rejected():
+    """Test that coroutines are turned away when the queue is full or the wait times out."""
+    limiter = ConcurrencyLimiter(1, max_waiting=1, max_wait_seconds=0.05)
+
+    async def main():
+        release = asyncio.Event()
+
+        async def hold():
+            async with limiter.slot():
+                await release.wait()
+
+        holder = asyncio.ensure_future(hold())
+        await asyncio.sleep(0)
+        waiter = asyncio.ensure_future(limiter.acquire())
+        await asyncio.sleep(0)
+
+        with pytest.raises(LimiterFullError):
+            await limiter.acquire()
+        with pytest.raises(LimiterFullError):
+            await waiter
+
+        release.set()
+        await holder
+        # The slot of the holder is free again, not handed to the waiter that gave up
+        await asyncio.wait_for(limiter.acquire(), 0.01)
+        assert limiter.active == 1
+        limiter.release()
+
+    asyncio.run(main())
+
+    assert limiter.stats()['rejected'] == 2
+    assert limiter.stats()['active'] == 0
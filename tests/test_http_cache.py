@@ -0,0 +1,50 @@
+import pytest
+from flask import Flask, jsonify
+
+from movie_collection.utils.http_cache import conditional_get
+
+@pytest.fixture
+def app():
+    """Create a Flask application with a conditional route over a controllable version."""
+    app = Flask(__name__)
+    app.config['TESTING'] = True
+    app.version = 1
+    app.calls = 0
+
+    @app.route('/items')
+    @conditional_get(lambda: app.version)
+    def items():
+        app.calls += 1
+        return jsonify({'items': []})
+
+    return app
+
+def test_conditional_get(app):
+    """Test that a matching If-None-Match is answered with a 304 without running the route."""
+    client = app.test_client()
+    response = client.get('/items')
+    assert response.status_code == 200
+    etag = response.headers['ETag']
+
+    response = client.get('/items', headers={'If-None-Match': etag})
+    assert response.status_code == 304
+    assert response.headers['ETag'] == etag
+    assert app.calls == 1
+
+def test_conditional_get_changed(app):
+    """Test that a new version or another query string gets a fresh response and ETag."""
+    client = app.test_client()
+    etag = client.get('/items').headers['ETag']
+    assert client.get('/items?details=true', headers={'If-None-Match': etag}).status_code == 200
+
+    app.version = 2
+    response = client.get('/items', headers={'If-None-Match': etag})
+    assert response.status_code == 200
+    assert response.headers['ETag'] != etag
+
+def test_conditional_get_no_version(app):
+    """Test that routes are served without an ETag when no version is available."""
+    app.version = None
+    response = app.test_client().get('/items')
+    assert response.status_code == 200
+    assert 'ETag' not in response.headers
@@ -0,0 +1,61 @@
+import asyncio
+import json
+
+import pytest
+
+from movie_collection.utils.json_stream import aiter_array_items, iter_array_items
+
+CREDITS = {
+    'id': 550,
+    'cast': [{'name': 'Edward "Ed" Norton', 'character': 'The Narrator [voice]'}] * 3,
+    'crew': [
+        {'job': 'Producer', 'name': 'Art Linson', 'popularity': 1.5e1},
+        {'job': 'Director', 'name': 'David Fincher'}
+    ]
+}
+
+def chunked(document, size):
+    """Encode a document and split it into chunks of size bytes."""
+    text = json.dumps(document, ensure_ascii=False).encode()
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+@pytest.mark.parametrize("size", [1, 2, 7, 4096])
+def test_iter_array_items(size):
+    """Test that the elements of the requested array are decoded whatever the chunk boundaries."""
+    assert list(iter_array_items(chunked(CREDITS, size), 'crew')) == CREDITS['crew']
+    assert list(iter_array_items(chunked(CREDITS, size), 'cast')) == CREDITS['cast']
+
+def test_iter_array_items_missing_field():
+    """Test that a missing or non-array field yields nothing."""
+    assert list(iter_array_items(chunked(CREDITS, 16), 'guest_stars')) == []
+    assert list(iter_array_items(chunked(CREDITS, 16), 'id')) == []
+    assert list(iter_array_items([b'{}'], 'crew')) == []
+
+def test_iter_array_items_stops_early():
+    """Test that nothing after the requested array is read."""
+    def chunks():
+        yield b'{"crew": [{"job": "Director"}], '
+        raise AssertionError("Read past the requested array.")
+
+    assert list(iter_array_items(chunks(), 'crew')) == [{'job': 'Director'}]
+
+def test_iter_array_items_malformed():
+    """Test that truncated or malformed documents raise a ValueError."""
+    with pytest.raises(ValueError):
+        list(iter_array_items([b'{"crew": [{"job": "Dir'], 'crew'))
+    with pytest.raises(ValueError):
+        list(iter_array_items([b'["crew"]'], 'crew'))
+
+@pytest.mark.parametrize("size", [1, 7, 4096])
+def test_aiter_array_items(size):
+    """Test that chunks from an async iterator are parsed the same way, stopping after the array."""
+    async def chunks(document):
+        for chunk in chunked(document, size):
+            yield chunk
+        yield b'"trailing garbage'
+
+    async def collect(key):
+        return [item async for item in aiter_array_items(chunks(CREDITS), key)]
+
+    assert asyncio.run(collect('crew')) == CREDITS['crew']
+    assert asyncio.run(collect('guest_stars')) == []
@@ -0,0 +1,29 @@
+import json
+
+from flask import Flask
+
+from movie_collection.utils import json_utils
+from movie_collection.utils.json_utils import json_response, rows_to_dicts
+
+def test_json_response():
+    """Test that a payload with tuples is encoded as JSON arrays."""
+    with Flask(__name__).app_context():
+        response = json_response({'status': 'success', 'rows': [("Test Movie", 2023)]}, 201)
+    assert response.status_code == 201
+    assert response.mimetype == 'application/json'
+    assert json.loads(response.get_data()) == {'status': 'success', 'rows': [["Test Movie", 2023]]}
+
+def test_json_response_without_orjson(mocker):
+    """Test that the standard library encoder is used when orjson is not installed."""
+    mocker.patch.object(json_utils, "orjson", None)
+    with Flask(__name__).app_context():
+        response = json_response({'name': "Amélie"})
+    assert response.get_data() == '{"name":"Am\\u00e9lie"}'.encode()
+
+def test_rows_to_dicts():
+    """Test that rows are zipped with their column names."""
+    rows = [("Test Movie", 2023), ("Other Movie", 2024)]
+    assert rows_to_dicts(('name', 'year'), rows) == [
+        {'name': "Test Movie", 'year': 2023},
+        {'name': "Other Movie", 'year': 2024}
+    ]
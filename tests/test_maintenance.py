@@ -0,0 +1,117 @@
+from contextlib import contextmanager
+import sqlite3
+import threading
+import time
+
+import pytest
+
+from movie_collection.utils.maintenance import purge_deleted_movies, rebuild_movie_stats, start_purge_scheduler
+from movie_collection.utils.migrations import upgrade
+
+######################################################
+#
+#    Fixtures
+#
+######################################################
+
+@pytest.fixture
+def movies_db(tmp_path, mocker):
+    """Create a real movies database with the schema migrations and route get_db_connection to it."""
+    db_path = tmp_path / "movies.db"
+    mocker.patch("movie_collection.utils.migrations.MIGRATIONS_PATH", "sql/migrations")
+    conn = sqlite3.connect(db_path)
+    upgrade(conn)
+    conn.close()
+
+    @contextmanager
+    def mock_get_db_connection():
+        conn = sqlite3.connect(db_path)
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    mocker.patch("movie_collection.utils.maintenance.get_db_connection", mock_get_db_connection)
+    return db_path
+
+def insert_movie(db_path, name, deleted=False, deleted_at=None, genres="Drama"):
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("""
+            INSERT INTO movies (name, year, director, genres, original_language, deleted, deleted_at)
+            VALUES (?, 2020, 'Director', ?, 'en', ?, ?)
+        """, (name, genres, deleted, deleted_at))
+
+def read_stats(db_path):
+    with sqlite3.connect(db_path) as conn:
+        return conn.execute("SELECT dimension, value, count FROM movie_stats ORDER BY dimension, value").fetchall()
+
+##########################################################
+# Purge
+##########################################################
+
+def test_purge_deleted_movies(movies_db):
+    """Test that only soft-deleted movies past the retention window are hard-deleted."""
+    insert_movie(movies_db, "Active")
+    insert_movie(movies_db, "Old Tombstone", deleted=True, deleted_at="2000-01-01 00:00:00")
+    insert_movie(movies_db, "Legacy Tombstone", deleted=True)
+    insert_movie(movies_db, "Recent Tombstone", deleted=True, deleted_at="2999-01-01 00:00:00")
+
+    result = purge_deleted_movies(retention_days=30, chunk_size=1)
+
+    assert result['rows_deleted'] == 2
+    assert result['compaction'] == "incremental_vacuum"
+    with sqlite3.connect(movies_db) as conn:
+        names = [row[0] for row in conn.execute("SELECT name FROM movies ORDER BY id")]
+    assert names == ["Active", "Recent Tombstone"]
+
+def test_purge_deleted_movies_invalid_compaction(movies_db):
+    """Test purging with an unknown compaction mode."""
+    with pytest.raises(ValueError, match="Invalid compaction mode: 'swap'"):
+        purge_deleted_movies(compact="swap")
+
+def test_purge_scheduler_runs_in_one_process(tmp_path, mocker):
+    """Test that of several schedulers sharing a lock file, only the first to take it purges."""
+    purging_threads = set()
+    mocker.patch("movie_collection.utils.maintenance.purge_deleted_movies",
+                 side_effect=lambda retention_days: purging_threads.add(threading.get_ident()))
+    lock_path = str(tmp_path / "purge.lock")
+    first = start_purge_scheduler(0.01, 30, lock_path)
+    time.sleep(0.1)
+    second = start_purge_scheduler(0.01, 30, lock_path)
+    time.sleep(0.1)
+    first.set()
+    second.set()
+
+    assert len(purging_threads) == 1
+
+
+##########################################################
+# Stats
+##########################################################
+
+def test_rebuild_movie_stats(movies_db):
+    """Test that a rebuild recomputes the same summary the triggers maintain."""
+    insert_movie(movies_db, "Active", genres="Drama, Action")
+    insert_movie(movies_db, "Other", genres="Drama")
+    insert_movie(movies_db, "Tombstone", deleted=True)
+    expected = read_stats(movies_db)
+    with sqlite3.connect(movies_db) as conn:
+        conn.execute("UPDATE movie_stats SET count = 99")
+
+    assert rebuild_movie_stats() == len(expected)
+    assert read_stats(movies_db) == expected
+    assert ("genre", "Drama", 2) in expected
+    assert ("total", "", 2) in expected
+
+
+def test_movie_stats_genres_with_special_characters(movies_db):
+    """Test that quotes, backslashes and control characters in genres are counted, not rejected."""
+    insert_movie(movies_db, "Odd", genres='Tab\there, New\nline, Say "hi", Back\\slash')
+    expected = read_stats(movies_db)
+
+    assert ("genre", "Tab\there", 1) in expected
+    assert ("genre", "New\nline", 1) in expected
+    assert ("genre", 'Say "hi"', 1) in expected
+    assert ("genre", "Back\\slash", 1) in expected
+    assert rebuild_movie_stats() == len(expected)
+    assert read_stats(movies_db) == expected
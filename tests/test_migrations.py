@@ -0,0 +1,155 @@
+import sqlite3
+
+import pytest
+
+from movie_collection.utils.migrations import get_schema_version, list_migrations, rebuild_table, upgrade
+
+
+MIGRATIONS_PATH = "sql/migrations"
+
+# The movies table as created before migrations existed
+LEGACY_SCHEMA = """
+CREATE TABLE movies (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT UNIQUE NOT NULL,
+    year INTEGER NOT NULL,
+    director TEXT NOT NULL,
+    genres TEXT NOT NULL,
+    original_language TEXT NOT NULL,
+    favorite BOOLEAN DEFAULT FALSE,
+    deleted BOOLEAN DEFAULT FALSE
+);
+"""
+
+
+@pytest.fixture
+def conn(tmp_path):
+    conn = sqlite3.connect(tmp_path / "movies.db")
+    yield conn
+    conn.close()
+
+
+def write_migrations(path, files):
+    path.mkdir()
+    for name, body in files.items():
+        (path / name).write_text(body)
+    return str(path)
+
+
+def test_list_migrations_ordered(tmp_path):
+    """Test that migrations are sorted by version and other files are ignored."""
+    path = write_migrations(tmp_path / "migrations", {
+        "0010_later.sql": "", "0002_second.py": "", "0001_first.sql": "", "README.md": ""
+    })
+    assert [m.name for m in list_migrations(path)] == ["0001_first.sql", "0002_second.py", "0010_later.sql"]
+
+
+def test_list_migrations_duplicate_version(tmp_path):
+    """Test that two migrations with the same version are rejected."""
+    path = write_migrations(tmp_path / "migrations", {"0001_a.sql": "", "1_b.sql": ""})
+    with pytest.raises(ValueError, match="share version 1"):
+        list_migrations(path)
+
+
+def test_upgrade_fresh_database(conn):
+    """Test that a new database gets every migration, and a second run applies nothing."""
+    latest = list_migrations(MIGRATIONS_PATH)[-1].version
+
+    assert upgrade(conn, path=MIGRATIONS_PATH) == latest
+    assert upgrade(conn, path=MIGRATIONS_PATH) == latest
+    assert get_schema_version(conn) == latest
+    assert conn.execute("PRAGMA auto_vacuum").fetchone() == (2,)
+    conn.execute("INSERT INTO movies (name, year, director, genres, original_language) "
+                 "VALUES ('Alien', 1979, 'Ridley Scott', 'Horror', 'en')")
+    assert conn.execute("SELECT count FROM movie_stats WHERE dimension = 'total'").fetchone() == (1,)
+
+
+def test_upgrade_adopts_legacy_database(conn):
+    """Test that a database created by the old DDL file keeps its rows through the migrations."""
+    conn.executescript(LEGACY_SCHEMA + """
+        INSERT INTO movies (name, year, director, genres, original_language, favorite)
+        VALUES ('Alien', 1979, 'Ridley Scott', 'Horror, Sci-Fi', 'en', NULL);
+        INSERT INTO movies (name, year, director, genres, original_language, deleted)
+        VALUES ('Gone', 2001, 'Someone', 'Drama', 'en', TRUE);
+        INSERT INTO movies (name, year, director, genres, original_language, deleted)
+        VALUES ('Ronin', 1998, 'John Frankenheimer', 'Action', 'en', NULL);
+    """)
+
+    upgrade(conn, path=MIGRATIONS_PATH)
+
+    assert conn.execute("SELECT id, name, favorite, deleted, deleted_at FROM movies ORDER BY id").fetchall() == [
+        (1, 'Alien', 0, 0, None), (2, 'Gone', 0, 1, None), (3, 'Ronin', 0, 0, None)
+    ]
+    # Counted once its NULL deleted flag became FALSE
+    assert conn.execute("SELECT value, count FROM movie_stats WHERE dimension = 'genre' ORDER BY value").fetchall() == [
+        ('Action', 1), ('Horror', 1), ('Sci-Fi', 1)
+    ]
+    assert conn.execute("SELECT count FROM movie_stats WHERE dimension = 'total'").fetchone() == (2,)
+    # IDs keep increasing past the rows that existed before the rebuild
+    conn.execute("DELETE FROM movies WHERE id = 2")
+    conn.execute("INSERT INTO movies (name, year, director, genres, original_language) "
+                 "VALUES ('Heat', 1995, 'Michael Mann', 'Crime', 'en')")
+    assert conn.execute("SELECT id FROM movies WHERE name = 'Heat'").fetchone() == (4,)
+
+
+def test_upgrade_stats_triggers_escape_genres(conn):
+    """Test that the stats triggers accept genres with quotes, backslashes and control characters."""
+    upgrade(conn, path=MIGRATIONS_PATH)
+
+    conn.execute("INSERT INTO movies (name, year, director, genres, original_language) "
+                 "VALUES ('Alien', 1979, 'Ridley Scott', 'Horror, Sci\tFi, \"Cult\\\"', 'en')")
+    assert conn.execute("SELECT value, count FROM movie_stats WHERE dimension = 'genre' ORDER BY value").fetchall() == [
+        ('"Cult\\"', 1), ('Horror', 1), ('Sci\tFi', 1)
+    ]
+
+
+def test_upgrade_failed_migration_rolls_back(conn, tmp_path):
+    """Test that a failing SQL migration leaves neither its changes nor its version behind."""
+    path = write_migrations(tmp_path / "migrations", {
+        "0001_ok.sql": "CREATE TABLE a (id INTEGER PRIMARY KEY);",
+        "0002_broken.sql": "CREATE TABLE b (id INTEGER PRIMARY KEY);\nINSERT INTO missing VALUES (1);",
+    })
+
+    with pytest.raises(sqlite3.OperationalError):
+        upgrade(conn, path=path)
+
+    assert get_schema_version(conn) == 1
+    tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    assert "a" in tables and "b" not in tables
+
+
+def test_rebuild_table_mirrors_concurrent_writes(conn):
+    """Test that writes made between copy batches end up in the rebuilt table."""
+    conn.executescript("""
+        CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT, size INTEGER);
+        CREATE INDEX items_by_name ON items (name);
+    """)
+    conn.executemany("INSERT INTO items (name, size) VALUES (?, ?)", [(f"item{i}", i) for i in range(10)])
+    conn.commit()
+
+    writes = iter([
+        "UPDATE items SET size = 100 WHERE id = 1",  # already copied
+        "DELETE FROM items WHERE id = 2",  # already copied
+        "UPDATE items SET size = 900 WHERE id = 9",  # not copied yet
+        "INSERT INTO items (name, size) VALUES ('late', 11)",
+    ])
+    messages = []
+
+    def report(message):
+        messages.append(message)
+        statement = next(writes, None)
+        if statement:
+            conn.execute(statement)
+            conn.commit()
+
+    rows = rebuild_table(conn, "items", "CREATE TABLE {name} (id INTEGER PRIMARY KEY, name TEXT NOT NULL, size INTEGER)",
+                         ("id", "name", "size"), batch_size=3, report=report)
+
+    assert rows == 10
+    assert conn.execute("SELECT size FROM items WHERE id IN (1, 9) ORDER BY id").fetchall() == [(100,), (900,)]
+    assert conn.execute("SELECT COUNT(*) FROM items WHERE id = 2 OR name = 'late'").fetchone() == (1,)
+    assert "NOT NULL" in conn.execute("SELECT sql FROM sqlite_master WHERE name = 'items'").fetchone()[0]
+    assert conn.execute("SELECT name FROM sqlite_master WHERE type IN ('index', 'trigger')").fetchall() == [
+        ('items_by_name',)
+    ]
+    assert messages[0] == "items: copied 3/10 rows (30%)"
@@ -1,21 +1,38 @@
+import asyncio
 from contextlib import contextmanager
+import json
 import re
 import sqlite3
 import pytest
 
+from movie_collection.models import movie_model
+
 from movie_collection.models.movie_model import (
     Movie,
     add_movie_to_list,
     delete_movie_from_list, 
+    delete_movies,
     clear_movie_list,
-    find_movie_by_name,
-    find_movie_by_year,
-    find_movie_by_language,
-    find_movie_by_director,
-    find_movie_by_genre,
+    get_catalog_version,
+    get_movie_stats,
+    afind_movie_by_name,
+    find_movies_by_names,
+    afind_movie_by_year,
+    afind_movie_by_language,
+    afind_movie_by_director,
+    afind_movie_by_genre,
     mark_movie_as_favorite,
-    list_favorite_movies
+    set_favorite,
+    set_favorites,
+    toggle_favorite,
+    toggle_favorites,
+    list_favorite_movies,
+    clear_favorites_cache,
+    clear_tmdb_caches
 )
+from movie_collection.utils.migrations import upgrade
+from movie_collection.utils.prefetch_pool import PrefetchPool
+from movie_collection.utils.tmdb_client import TMDBUnavailableError
 
 ######################################################
 #
@@ -36,6 +53,27 @@ from movie_collection.models.movie_model import (
 def normalize_whitespace(sql_query: str) -> str:
     return re.sub(r'\s+', ' ', sql_query).strip()
 
+@pytest.fixture(autouse=True)
+def clear_caches():
+    """Start every test with empty caches, since the tests count upstream calls and queries."""
+    clear_tmdb_caches()
+    clear_favorites_cache()
+
+def fake_async_tmdb(mocker, respond):
+    """
+    Fake the async TMDB client of the model: respond(path, params) returns the decoded body of
+    each request, or raises. Returns the atmdb_get and atmdb_stream mocks.
+    """
+    async def atmdb_get(path, params=None):
+        return respond(path, params or {})
+
+    async def atmdb_stream(path, key, params=None):
+        for item in respond(path, params or {}).get(key, []):
+            yield item
+
+    return (mocker.patch.object(movie_model, "atmdb_get", side_effect=atmdb_get),
+            mocker.patch.object(movie_model, "atmdb_stream", side_effect=atmdb_stream))
+
 # Mocking the database connection for tests
 @pytest.fixture
 def mock_cursor(mocker):
@@ -57,6 +95,26 @@ def mock_cursor(mocker):
 
     return mock_cursor  # Return the mock cursor so we can set expectations per test
 
+@pytest.fixture
+def movies_db(tmp_path, mocker):
+    """Create a real movies database with the schema migrations and route get_db_connection to it."""
+    db_path = tmp_path / "movies.db"
+    mocker.patch("movie_collection.utils.migrations.MIGRATIONS_PATH", "sql/migrations")
+    conn = sqlite3.connect(db_path)
+    upgrade(conn)
+    conn.close()
+
+    @contextmanager
+    def mock_get_db_connection():
+        conn = sqlite3.connect(db_path)
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    mocker.patch("movie_collection.models.movie_model.get_db_connection", mock_get_db_connection)
+    return db_path
+
 ##########################################################
 # Movie Creation Tests
 ##########################################################
@@ -159,21 +217,111 @@ def test_add_movie_default_favorite(mock_cursor):
 # Clear Catalog
 ##########################################################
 
-def test_clear_movie_list(mock_cursor, mocker):
-    """Test clearing the entire movie catalog (removes all movies)."""
+def test_clear_movie_list(mock_cursor):
+    """Test truncating the catalog in chunks while keeping the schema."""
+    mock_cursor.rowcount = 0
+
+    clear_movie_list()
+
+    expected_query = normalize_whitespace("DELETE FROM movies WHERE id IN (SELECT id FROM movies LIMIT ?)")
+    actual_query = normalize_whitespace(mock_cursor.execute.call_args_list[0][0][0])
+    assert actual_query == expected_query, "The DELETE query did not match the expected structure."
+    mock_cursor.executescript.assert_not_called()
+
+def test_clear_movie_list_chunks(mock_cursor, mocker):
+    """Test that truncating keeps deleting chunks until a partial chunk is deleted."""
+    mocker.patch("movie_collection.models.movie_model.CLEAR_CHUNK_SIZE", 2)
+    rowcounts = iter([2, 2, 1, 0])
+    mock_cursor.execute.side_effect = lambda *args: setattr(mock_cursor, "rowcount", next(rowcounts))
+
+    clear_movie_list()
+
+    # Three chunked DELETEs, then the sequence reset
+    assert mock_cursor.execute.call_count == 4
+
+def test_clear_movie_list_recreate(mock_cursor, mocker):
+    """Test recreating the movie table by dropping it and running the migrations again."""
+    mock_upgrade = mocker.patch("movie_collection.models.movie_model.upgrade_schema")
+
+    clear_movie_list(mode="recreate")
+
+    statements = [call[0][0] for call in mock_cursor.execute.call_args_list]
+    assert "DROP TABLE IF EXISTS movies" in statements
+    assert "PRAGMA user_version = 0" in statements
+    mock_upgrade.assert_called_once()
+
+def test_clear_movie_list_recreate_real_db(movies_db):
+    """Test that a recreated catalog is empty and fully migrated."""
+    add_movie_to_list("Movie Title", 2022, "Director Name", ["Drama"], "en", True)
+
+    clear_movie_list(mode="recreate")
+
+    assert list_favorite_movies() == []
+    with sqlite3.connect(movies_db) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM movies").fetchone() == (0,)
+        assert conn.execute("SELECT COUNT(*) FROM movie_stats").fetchone() == (0,)
+        assert conn.execute("PRAGMA user_version").fetchone()[0] > 0
+
+def test_clear_movie_list_invalid_mode(mock_cursor):
+    """Test clearing the catalog with an unknown mode."""
+    with pytest.raises(ValueError, match="Invalid clear mode: 'drop'"):
+        clear_movie_list(mode="drop")
 
-    # Mock the file reading
-    mocker.patch.dict('os.environ', {'SQL_CREATE_TABLE_PATH': 'sql/create_movie_table.sql'})
-    mock_open = mocker.patch('builtins.open', mocker.mock_open(read_data="The body of the create statement"))
+##########################################################
+# Catalog Version
+##########################################################
 
-    # Call the clear_database function
+def test_catalog_version_bumped_by_writes(movies_db):
+    """Test that every kind of write to the movies table bumps the catalog version."""
+    versions = [get_catalog_version()]
+    add_movie_to_list("Movie Title", 2022, "Director Name", ["Drama"], "en")
+    versions.append(get_catalog_version())
+    set_favorite("Movie Title", True)
+    versions.append(get_catalog_version())
+    delete_movie_from_list(1)
+    versions.append(get_catalog_version())
     clear_movie_list()
+    versions.append(get_catalog_version())
+    clear_movie_list(mode="recreate")
+    versions.append(get_catalog_version())
+
+    assert versions == sorted(set(versions)), f"Versions should strictly increase: {versions}"
 
-    # Ensure the file was opened using the environment variable's path
-    mock_open.assert_called_once_with('sql/create_movie_table.sql', 'r')
+def test_catalog_version_reads_only_meta(mock_cursor):
+    """Test that the catalog version is read from the meta table, not the movies table."""
+    mock_cursor.fetchone.return_value = (42,)
+    assert get_catalog_version() == 42
+    assert "movies" not in mock_cursor.execute.call_args[0][0]
 
-    # Verify that the correct SQL script was executed
-    mock_cursor.executescript.assert_called_once()
+def test_catalog_version_missing_table(mock_cursor):
+    """Test that databases without the meta table have no catalog version."""
+    mock_cursor.execute.side_effect = sqlite3.OperationalError("no such table: catalog_meta")
+    assert get_catalog_version() is None
+
+##########################################################
+# Movie Stats
+##########################################################
+
+def test_get_movie_stats(movies_db):
+    """Test that the stats follow inserts, updates and soft deletes of active movies."""
+    add_movie_to_list("Movie A", 2022, "Director A", ["Drama", "Action"], "en")
+    add_movie_to_list("Movie B", 2022, "Director B", ["Drama"], "fr")
+    add_movie_to_list("Movie C", 2023, "Director A", ["Comedy"], "en")
+    delete_movie_from_list(3)
+
+    stats = get_movie_stats()
+    assert stats['total'] == 2
+    assert stats['year'] == [(2022, 2)]
+    assert stats['genre'] == [("Drama", 2), ("Action", 1)]
+    assert stats['director'] == [("Director A", 1), ("Director B", 1)]
+    assert get_movie_stats(("language",), limit=1) == {'total': 2, 'language': [("en", 1)]}
+
+def test_get_movie_stats_invalid(mock_cursor):
+    """Test reading stats with an unknown dimension or an out of range limit."""
+    with pytest.raises(ValueError, match="Invalid stats dimension: 'rating'"):
+        get_movie_stats(("year", "rating"))
+    with pytest.raises(ValueError, match="Invalid limit: 0"):
+        get_movie_stats(limit=0)
 
 ##########################################################
 # Movie Deletion Tests
@@ -182,39 +330,27 @@ def test_clear_movie_list(mock_cursor, mocker):
 def test_delete_movie(mock_cursor):
     """Test soft deleting a movie from the catalog by movie ID."""
 
-    # Simulate that the movie exists (id = 1)
-    mock_cursor.fetchone.return_value = ([False])
+    # Simulate that the UPDATE matched the movie
+    mock_cursor.rowcount = 1
 
     # Call the delete_movie function
     delete_movie_from_list(1)
 
-    # Normalize the SQL for both queries (SELECT and UPDATE)
-    expected_select_sql = normalize_whitespace("SELECT deleted FROM movies WHERE id = ?")
-    expected_update_sql = normalize_whitespace("UPDATE movies SET deleted = TRUE WHERE id = ?")
-
-    # Access both calls to `execute()` using `call_args_list`
-    actual_select_sql = normalize_whitespace(mock_cursor.execute.call_args_list[0][0][0])
-    actual_update_sql = normalize_whitespace(mock_cursor.execute.call_args_list[1][0][0])
-
-    # Ensure the correct SQL queries were executed
-    assert actual_select_sql == expected_select_sql, "The SELECT query did not match the expected structure."
+    # The soft delete is a single conditional UPDATE
+    expected_update_sql = normalize_whitespace("UPDATE movies SET deleted = TRUE, deleted_at = CURRENT_TIMESTAMP WHERE id = ? AND deleted = FALSE")
+    assert mock_cursor.execute.call_count == 1, "Only the UPDATE query should run on success."
+    actual_update_sql = normalize_whitespace(mock_cursor.execute.call_args[0][0])
     assert actual_update_sql == expected_update_sql, "The UPDATE query did not match the expected structure."
 
-    # Ensure the correct arguments were used in both SQL queries
-    expected_select_args = (1,)
-    expected_update_args = (1,)
-
-    actual_select_args = mock_cursor.execute.call_args_list[0][0][1]
-    actual_update_args = mock_cursor.execute.call_args_list[1][0][1]
-
-    assert actual_select_args == expected_select_args, f"The SELECT query arguments did not match. Expected {expected_select_args}, got {actual_select_args}."
-    assert actual_update_args == expected_update_args, f"The UPDATE query arguments did not match. Expected {expected_update_args}, got {actual_update_args}."
+    actual_update_args = mock_cursor.execute.call_args[0][1]
+    assert actual_update_args == (1,), f"The UPDATE query arguments did not match. Expected (1,), got {actual_update_args}."
 
 
 def test_delete_movie_bad_id(mock_cursor):
     """Test error when trying to delete a non-existent movie."""
 
     # Simulate that no movie exists with the given ID
+    mock_cursor.rowcount = 0
     mock_cursor.fetchone.return_value = None
 
     # Expect a ValueError when attempting to delete a non-existent movie
@@ -225,16 +361,47 @@ def test_delete_movie_already_deleted(mock_cursor):
     """Test error when trying to delete a movie that's already marked as deleted."""
 
     # Simulate that the movie exists but is already marked as deleted
+    mock_cursor.rowcount = 0
     mock_cursor.fetchone.return_value = ([True])
 
     # Expect a ValueError when attempting to delete a movie that's already been deleted
     with pytest.raises(ValueError, match="Movie with ID 999 has already been deleted"):
         delete_movie_from_list(999)
 
+def test_delete_movies(mock_cursor):
+    """Test soft deleting many movies at once."""
+
+    # The UPDATE returns the rows it deleted, the follow-up SELECT the remaining ones that exist
+    mock_cursor.fetchall.side_effect = [[(1,), (3,)], [(2,)]]
+
+    result = delete_movies([1, 2, 3, 4, 1])
+
+    assert result == {'deleted': [1, 3], 'already_deleted': [2], 'not_found': [4]}
+    expected_update_sql = normalize_whitespace(
+        "UPDATE movies SET deleted = TRUE, deleted_at = CURRENT_TIMESTAMP WHERE id IN (?, ?, ?, ?) AND deleted = FALSE RETURNING id"
+    )
+    assert normalize_whitespace(mock_cursor.execute.call_args_list[0][0][0]) == expected_update_sql
+    assert mock_cursor.execute.call_args_list[0][0][1] == [1, 2, 3, 4]
+    assert mock_cursor.execute.call_args_list[1][0][1] == [2, 4]
+
 ##########################################################
 # Movie Search Tests
 ##########################################################
 
+def test_movie_to_dict():
+    """Test that a Movie is slotted and serializes its API fields."""
+    movie = Movie("Test Movie", 2023, "Directron", ["action"], "en")
+    assert not hasattr(movie, "__dict__")
+    assert movie.to_dict() == {
+        'name': "Test Movie",
+        'year': 2023,
+        'director': "Directron",
+        'genres': ["action"],
+        'original_language': "en"
+    }
+    assert movie == Movie("Test Movie", 2023, "Directron", ["action"], "en")
+    assert movie != Movie("Test Movie", 2023, "Directron", ["action"], "en", favorite=True)
+
 def test_movie_invalid_year():
     """Test creating a Movie with invalid year."""
     with pytest.raises(ValueError, match="Year must be greater than 1900, got 1800"):
@@ -246,285 +413,368 @@ def test_movie_invalid_year():
             original_language="en"
         )
 
+MOVIE_RESULT = {
+    'id': 1,
+    'title': 'Test Movie',
+    'release_date': '2023-01-01',
+    'original_language': 'en',
+    'genre_ids': [28],
+}
+
+def tmdb_responses(results):
+    """Answer every search and discover request with results, plus one genre and one director."""
+    def respond(path, params):
+        if path == "/genre/movie/list":
+            return {'genres': [{'id': 28, 'name': 'action'}]}
+        if path.endswith("/credits"):
+            return {'crew': [{'job': 'Director', 'name': 'Directron'}]}
+        return {'results': results}
+    return respond
+
 def test_find_movie_by_name(mocker):
     """Test searching for a movie by name."""
-    mock_response = mocker.Mock()
-    mock_response.json.return_value = {
-        'results': [{
-            'id': 1,
-            'title': 'Test Movie',
-            'release_date': '2023-01-01',
-            'original_language': 'en',
-            'genre_ids': [28],
-        }]
-    }
-    mock_genres = mocker.Mock()
-    mock_genres.json.return_value = {
-        'genres': [{
-            'id': 28,
-            'name': 'action'
-        }]
-    }
-    mock_credit = mocker.Mock()
-    mock_credit.json.return_value = {
-        'crew': [{
-            'job': 'Director',
-            'name': 'Directron'
-        }]
-    }
-    mocker.patch('requests.get', side_effect=[mock_response, mock_genres, mock_credit])
-    mocker.patch('movie_collection.models.movie_model.add_movie_to_list')
-    
-    movie = find_movie_by_name("Test Movie")
+    fake_async_tmdb(mocker, tmdb_responses([MOVIE_RESULT]))
+    mock_add = mocker.patch('movie_collection.models.movie_model.add_movie_to_list')
+
+    movie = asyncio.run(afind_movie_by_name("Test Movie"))
     assert movie.name == "Test Movie"
     assert movie.year == 2023
     assert movie.original_language == "en"
+    assert movie.director == "Directron"
+    mock_add.assert_called_once_with("Test Movie", 2023, "Directron", ["action"], "en")
+
+def test_find_movies_by_names(mocker):
+    """Test resolving many titles concurrently, in input order, with one insert for the batch."""
+    def fake_tmdb_get(path, params=None, session=None):
+        if path == "/genre/movie/list":
+            return {'genres': [{'id': 28, 'name': 'action'}]}
+        if path == "/search/movie":
+            if params['query'] == "Missing":
+                return {'results': []}
+            return {'results': [{
+                'id': params['query'],
+                'title': params['query'],
+                'release_date': '2023-01-01',
+                'original_language': 'en',
+                'genre_ids': [28]
+            }]}
+        return {'crew': [{'job': 'Director', 'name': f'Director of {path.split("/")[2]}'}]}
+
+    tmdb_get = mocker.patch('movie_collection.models.movie_model.tmdb_get', side_effect=fake_tmdb_get)
+    mocker.patch('movie_collection.models.movie_model.tmdb_stream',
+                 side_effect=lambda path, key, session=None: iter(fake_tmdb_get(path)[key]))
+    add_movies = mocker.patch('movie_collection.models.movie_model.add_movies_to_list')
+
+    results = list(find_movies_by_names(["Movie A", "Missing", "Movie B", "Movie A"], concurrency=2))
+
+    assert [name for name, _ in results] == ["Movie A", "Missing", "Movie B"]
+    assert results[0][1].director == "Director of Movie A"
+    assert results[0][1].genres == ["action"]
+    assert isinstance(results[1][1], ValueError)
+    genre_calls = [call for call in tmdb_get.call_args_list if call[0][0] == "/genre/movie/list"]
+    assert len(genre_calls) == 1, "Genres should be fetched once per batch."
+    add_movies.assert_called_once()
+    assert [movie.name for movie in add_movies.call_args[0][0]] == ["Movie A", "Movie B"]
 
 def test_find_movie_by_name_not_found(mocker):
     """Test searching for a non-existent movie."""
-    mock_response = mocker.Mock()
-    mock_response.json.return_value = {'results': []}
-    mocker.patch('requests.get', return_value=mock_response)
-    
+    fake_async_tmdb(mocker, tmdb_responses([]))
+
     with pytest.raises(ValueError, match="No movies found."):
-        find_movie_by_name("Nonexistent Movie")
+        asyncio.run(afind_movie_by_name("Nonexistent Movie"))
 
 def test_find_movie_by_year(mocker):
     """Test searching for a movie by year."""
-    mock_response = mocker.Mock()
-    mock_response.json.return_value = {
-        'results': [{
-            'id': 1,
-            'title': 'Test Movie 1',
-            'release_date': '2023-01-01',
-            'original_language': 'en',
-            'genre_ids': [28]
-        }]
-    }
-    mock_genres = mocker.Mock()
-    mock_genres.json.return_value = {
-        'genres': [{
-            'id': 28,
-            'name': 'action'
-        }]
-    }
-    mock_credit = mocker.Mock()
-    mock_credit.json.return_value = {
-        'crew': [{
-            'job': 'Director',
-            'name': 'Directron'
-        }]
-    }
-    mocker.patch('requests.get', side_effect=[mock_response, mock_genres, mock_credit])
+    atmdb_get, _ = fake_async_tmdb(mocker, tmdb_responses([dict(MOVIE_RESULT, title='Test Movie 1')]))
     mocker.patch('movie_collection.models.movie_model.add_movie_to_list')
-    
-    movie = find_movie_by_year(2023)
+
+    movie = asyncio.run(afind_movie_by_year(2023))
     assert movie.year == 2023
     assert isinstance(movie, Movie)
+    atmdb_get.assert_any_call("/discover/movie", {'primary_release_year': 2023})
 
 def test_find_movie_by_name_empty_input():
     """Test searching for a movie with empty name."""
     with pytest.raises(ValueError, match="No movies found."):
-        find_movie_by_name("")
+        asyncio.run(afind_movie_by_name(""))
+
+def test_find_movie_by_year_from_pool(mocker):
+    """Test that a prefetched movie is served without calling TMDB and falls back once the pool is drained."""
+    pool = PrefetchPool(lambda key, count: [(7, Movie("Pooled Movie", 2023, "Directron", ["action"], "en"))], size=1, low_water=0)
+    pool.register(('year', 2023))
+    pool.refill()
+    mocker.patch('movie_collection.models.movie_model.random_movie_pool', pool)
+    mock_add = mocker.patch('movie_collection.models.movie_model.add_movie_to_list')
+    atmdb_get, _ = fake_async_tmdb(mocker, tmdb_responses([]))
+
+    movie = asyncio.run(afind_movie_by_year(2023))
+    assert movie.name == "Pooled Movie"
+    mock_add.assert_called_once_with("Pooled Movie", 2023, "Directron", ["action"], "en")
+    atmdb_get.assert_not_called()
+
+    with pytest.raises(ValueError, match="No movies found for the year: '2023'."):
+        asyncio.run(afind_movie_by_year(2023))
+
+def test_start_movie_pool_skips_invalid_keys(mocker):
+    """Test that malformed MOVIE_POOL_KEYS entries are skipped instead of stopping the worker."""
+    mocker.patch.object(movie_model, "MOVIE_POOL_SIZE", 5)
+    mocker.patch.object(movie_model, "MOVIE_POOL_KEYS", "year:2020, genre:abc,year:,decade:1990,genre:-1,language:fr,year:20x0,genre: 28 ")
+    pool = mocker.Mock()
+    mocker.patch.object(movie_model, "random_movie_pool", pool)
+
+    movie_model.start_movie_pool()
+
+    assert [call.args[0] for call in pool.register.call_args_list] == [('year', 2020), ('language', 'fr'), ('genre', 28)]
+    pool.start.assert_called_once()
+
+def test_prefetch_random_movies(mocker):
+    """Test that the pool is refilled from a discover page, skipping movies that could not be stored."""
+    def fake_get(path, params=None, session=None):
+        if path == "/discover/movie":
+            return {'total_pages': 1, 'results': [MOVIE_RESULT, dict(MOVIE_RESULT, id=2, release_date='1850-01-01')]}
+        return tmdb_responses([])(path, params)
+    mocker.patch('movie_collection.models.movie_model.tmdb_get', side_effect=fake_get)
+    mocker.patch('movie_collection.models.movie_model.tmdb_stream',
+                 side_effect=lambda path, key, session=None: iter(fake_get(path)[key]))
+
+    movies = movie_model._prefetch_random_movies(('year', 2023), 5)
+
+    assert [(movie_id, movie.name, movie.director) for movie_id, movie in movies] == [(1, "Test Movie", "Directron")]
+
+def test_find_movie_by_year_samples_pages(mocker):
+    """Test that later lookups pick random pages, fetching unseen pages alongside the credits."""
+    def respond(path, params):
+        if path == "/discover/movie":
+            return {'total_pages': 3, 'results': [dict(MOVIE_RESULT, title=f"Page {params.get('page', 1)}")]}
+        return tmdb_responses([])(path, params)
+    atmdb_get, _ = fake_async_tmdb(mocker, respond)
+    mocker.patch('movie_collection.models.movie_model.add_movie_to_list')
+    mocker.patch('movie_collection.models.movie_model.random.randint', return_value=3)
+
+    assert asyncio.run(afind_movie_by_year(2023)).name == "Page 1"
+    assert asyncio.run(afind_movie_by_year(2023)).name == "Page 1", "The unseen page is fetched for the next lookup."
+    assert asyncio.run(afind_movie_by_year(2023)).name == "Page 3"
+    discover_pages = [call.args[1].get('page', 1) for call in atmdb_get.call_args_list if call.args[0] == "/discover/movie"]
+    assert discover_pages == [1, 3]
 
 def test_find_movie_by_year_not_found(mocker):
     """Test searching for a movie in a year with no results."""
-    mock_response = mocker.Mock()
-    mock_response.json.return_value = {'results': []}
-    mocker.patch('requests.get', return_value=mock_response)
-    
-    with pytest.raises(ValueError, match="No movies found for the year: '1800'."):
-        find_movie_by_year(1800)
+    fake_async_tmdb(mocker, tmdb_responses([]))
+
+    with pytest.raises(ValueError, match="No movies found for the year: '2023'."):
+        asyncio.run(afind_movie_by_year(2023))
 
 def test_find_movie_by_year_invalid_type():
     """Test searching for a movie with invalid year type."""
     with pytest.raises(ValueError, match="Year must be an integer"):
-        find_movie_by_year("2023")
+        asyncio.run(afind_movie_by_year("2023"))
+
+def test_find_movie_by_year_invalid_value(mocker):
+    """Test searching for a movie with invalid year value, without calling TMDB."""
+    atmdb_get, _ = fake_async_tmdb(mocker, tmdb_responses([]))
 
-def test_find_movie_by_year_invalid_value():
-    """Test searching for a movie with invalid year value."""
     with pytest.raises(ValueError, match="No movies found for the year: '1800'."):
-        find_movie_by_year(1800)
+        asyncio.run(afind_movie_by_year(1800))
+    atmdb_get.assert_not_called()
 
 def test_search_movie_by_language(mocker):
     """Test searching for a movie by language."""
-    mock_response = mocker.Mock()
-    mock_response.json.return_value = {
-        'results': [{
-            'id': 2,
-            'title': 'Test Movie 2',
-            'release_date': '2023-01-01',
-            'original_language': 'fr',
-            'genre_ids': [28]
-        }]
-    }
-    mock_genres = mocker.Mock()
-    mock_genres.json.return_value = {
-        'genres': [{
-            'id': 28,
-            'name': 'action'
-        }]
-    }
-    mock_credit = mocker.Mock()
-    mock_credit.json.return_value = {
-        'crew': [{
-            'job': 'Director',
-            'name': 'Directron'
-        }]
-    }
-    mocker.patch('requests.get', side_effect=[mock_response, mock_genres, mock_credit])
+    fake_async_tmdb(mocker, tmdb_responses([dict(MOVIE_RESULT, id=2, title='Test Movie 2', original_language='fr')]))
     mocker.patch('movie_collection.models.movie_model.add_movie_to_list')
-    
-    movie = find_movie_by_language("fr")
-    
-    # Access the first result from the 'results' list
-    result = mock_response.json()['results'][0]
-    
-    assert movie.original_language == result['original_language']
+
+    movie = asyncio.run(afind_movie_by_language("fr"))
+
+    assert movie.original_language == "fr"
     assert isinstance(movie, Movie)
 
 def test_search_movie_by_language_empty_input():
     """Test searching for a movie with empty language code."""
     with pytest.raises(ValueError, match="Language code cannot be empty"):
-        find_movie_by_language("")
+        asyncio.run(afind_movie_by_language(""))
 
 def test_search_movie_by_director(mocker):
     """Test searching for a movie by director."""
-    mock_response = mocker.Mock()
-    mock_response.json.return_value = {
-        'results': [{
-            'id': 1,
-            'name': 'Test Director'
-        }]
-    }
-    mock_credits = mocker.Mock()
-    mock_credits.json.return_value = {
-        'crew': [{
-            'id': 3,
-            'job': 'Director',
-            'title': 'Test Movie 3',
-            'release_date': '2023-01-01',
-            'original_language': 'en',
-            'genre_ids': [28]
-        }]
-    }
-    mock_genres = mocker.Mock()
-    mock_genres.json.return_value = {
-        'genres': [{
-            'id': 28,
-            'name': 'action'
-        }]
-    }
-    mocker.patch('requests.get', side_effect = [mock_response, mock_credits, mock_genres])
+    def respond(path, params):
+        if path == "/search/person":
+            return {'results': [{'id': 1, 'name': 'Test Director'}]}
+        if path == "/person/1/movie_credits":
+            return {'crew': [dict(MOVIE_RESULT, id=3, title='Test Movie 3', job='Director')]}
+        return tmdb_responses([])(path, params)
+    atmdb_get, atmdb_stream = fake_async_tmdb(mocker, respond)
     mocker.patch('movie_collection.models.movie_model.add_movie_to_list')
-    
-    movie = find_movie_by_director("Test Director")
+
+    movie = asyncio.run(afind_movie_by_director("Test Director"))
     assert movie.director == "Test Director"
     assert isinstance(movie, Movie)
 
+    movie = asyncio.run(afind_movie_by_director("  test   director "))
+    assert movie.name == "Test Movie 3"
+    assert movie.genres == ["action"]
+    assert atmdb_get.call_count + atmdb_stream.call_count == 3, "Repeat searches should be served from the caches."
+
 def test_search_movie_by_director_empty_input():
     """Test searching for a movie with empty director name."""
     with pytest.raises(ValueError, match="Director not found."):
-        find_movie_by_director("")
+        asyncio.run(afind_movie_by_director(""))
 
 def test_search_movie_by_director_not_found(mocker):
     """Test searching for a non-existent director."""
-    mock_response = mocker.Mock()
-    mock_response.json.return_value = {'results': []}
-    mocker.patch('requests.get', return_value=mock_response)
-    
+    fake_async_tmdb(mocker, tmdb_responses([]))
+
     with pytest.raises(ValueError, match="Director not found."):
-        find_movie_by_director("Nonexistent Director")
+        asyncio.run(afind_movie_by_director("Nonexistent Director"))
 
 def test_search_movie_by_director_no_movies(mocker):
     """Test searching for a director with no movies."""
-    mock_response = mocker.Mock()
-    mock_response.json.return_value = {
-        'results': [{
-            'id': 1,
-            'name': 'Test Director'
-        }]
-    }
-    mock_credits = mocker.Mock()
-    mock_credits.json.return_value = {'crew': []}
-    mocker.patch('requests.get', side_effect=[mock_response, mock_credits])
-    
+    def respond(path, params):
+        if path == "/search/person":
+            return {'results': [{'id': 1, 'name': 'Test Director'}]}
+        return {'crew': []}
+    fake_async_tmdb(mocker, respond)
+
     with pytest.raises(ValueError, match="No movies found with the director 'Test Director'."):
-        find_movie_by_director("Test Director")
+        asyncio.run(afind_movie_by_director("Test Director"))
+
+def test_afind_movie_by_director_streams_credits(mocker):
+    """Test that the async director search parses the credits as they stream in, stopping at the first director."""
+    import asyncio
+    import httpx
+
+    from movie_collection.utils import tmdb_client
+
+    credits = json.dumps({
+        'cast': [{'name': 'Someone'}] * 50,
+        'crew': [
+            {'job': 'Producer', 'title': 'Other', 'original_language': 'en'},
+            {'job': 'Director', 'title': 'Test Movie 3', 'release_date': '2023-01-01',
+             'original_language': 'en', 'genre_ids': [28]}
+        ]
+    }).encode()
+    chunks_read = []
+
+    async def credits_body():
+        for i in range(0, len(credits), 64):
+            chunks_read.append(i)
+            yield credits[i:i + 64]
+
+    def handler(request):
+        if request.url.path.endswith("/search/person"):
+            return httpx.Response(200, json={'results': [{'id': 1}]})
+        if request.url.path.endswith("/movie_credits"):
+            return httpx.Response(200, content=credits_body())
+        return httpx.Response(200, json={'genres': [{'id': 28, 'name': 'action'}]})
+
+    add_movie = mocker.patch('movie_collection.models.movie_model.add_movie_to_list')
+    atmdb_get = mocker.spy(movie_model, "atmdb_get")
+
+    async def main():
+        mocker.patch.object(tmdb_client, "get_async_client",
+                            return_value=httpx.AsyncClient(transport=httpx.MockTransport(handler)))
+        return await movie_model.afind_movie_by_director("Test Director")
+
+    movie = asyncio.run(main())
+
+    assert movie.name == "Test Movie 3" and movie.genres == ["action"]
+    add_movie.assert_called_once_with("Test Movie 3", 2023, "Test Director", ["action"], "en")
+    assert len(chunks_read) == -(-len(credits) // 64), "The body should be read to the end to free the connection."
+    assert all(not call.args[0].endswith("credits") for call in atmdb_get.call_args_list)
 
 def test_search_movie_by_genre(mocker):
     """Test searching for a movie by genre ID."""
-    mock_response = mocker.Mock()
-    mock_response.json.return_value = {
-        'results': [{
-            'id': 4,
-            'title': 'Test Movie 4',
-            'release_date': '2023-01-01',
-            'original_language': 'en',
-            'genre_ids': [28]
-        }]
-    }
-    mock_genres = mocker.Mock()
-    mock_genres.json.return_value = {
-        'genres': [{
-            'id': 28,
-            'name': 'action'
-        }]
-    }
-    mock_credit = mocker.Mock()
-    mock_credit.json.return_value = {
-        'crew': [{
-            'job': 'Director',
-            'name': 'Directron'
-        }]
-    }
-    mocker.patch('requests.get', side_effect=[mock_response, mock_genres, mock_credit])
+    atmdb_get, _ = fake_async_tmdb(mocker, tmdb_responses([dict(MOVIE_RESULT, id=4, title='Test Movie 4')]))
     mocker.patch('movie_collection.models.movie_model.add_movie_to_list')
-    
-    movie = find_movie_by_genre(28)  # Action genre ID
+
+    movie = asyncio.run(afind_movie_by_genre(28))  # Action genre ID
     assert isinstance(movie, Movie)
+    assert movie.genres == ["action"]
+    atmdb_get.assert_any_call("/discover/movie", {'with_genres': 28})
 
 def test_search_movie_by_genre_invalid_id():
     """Test searching for a movie with invalid genre ID."""
     with pytest.raises(ValueError, match="No movies found with the genre with ID '-1'"):
-        find_movie_by_genre(-1)
+        asyncio.run(afind_movie_by_genre(-1))
 
 def test_mark_movie_as_favorite(mock_cursor):
     """Test marking a movie as favorite."""
-    # Simulate the movie existing in the database
-    mock_cursor.fetchone.return_value = (1,)  # Movie with ID 1 exists
+    # Simulate the UPDATE matching the movie
+    mock_cursor.rowcount = 1
 
     # Call the function
     mark_movie_as_favorite("Test Movie")
 
-    # Verify the SELECT query to check for the movie
-    expected_select_query = "SELECT id FROM movies WHERE name = ?"
-    actual_select_query = normalize_whitespace(mock_cursor.execute.call_args_list[0][0][0])
-    assert actual_select_query == normalize_whitespace(expected_select_query)
-
-    # Verify the UPDATE query to mark the movie as favorite
+    # Verify the single UPDATE query to mark the movie as favorite
     expected_update_query = "UPDATE movies SET favorite = TRUE WHERE name = ?"
-    actual_update_query = normalize_whitespace(mock_cursor.execute.call_args_list[1][0][0])
+    assert mock_cursor.execute.call_count == 1
+    actual_update_query = normalize_whitespace(mock_cursor.execute.call_args[0][0])
     assert actual_update_query == normalize_whitespace(expected_update_query)
 
-    # Verify the arguments for the queries
-    assert mock_cursor.execute.call_args_list[0][0][1] == ("Test Movie",)  # SELECT args
-    assert mock_cursor.execute.call_args_list[1][0][1] == ("Test Movie",)  # UPDATE args
+    # Verify the arguments for the query
+    assert mock_cursor.execute.call_args[0][1] == ("Test Movie",)
 
 
 def test_mark_movie_as_favorite_movie_not_found(mock_cursor):
     """Test marking a movie as favorite when the movie does not exist."""
-    # Simulate the movie not existing in the database
-    mock_cursor.fetchone.return_value = None  # No result for SELECT
+    # Simulate the UPDATE matching no row
+    mock_cursor.rowcount = 0
 
     # Expect a ValueError
     with pytest.raises(ValueError, match="Movie with name 'Nonexistent Movie' not found."):
         mark_movie_as_favorite("Nonexistent Movie")
 
-    # Verify the SELECT query was executed
-    expected_query = "SELECT id FROM movies WHERE name = ?"
-    actual_query = normalize_whitespace(mock_cursor.execute.call_args[0][0])
-    assert actual_query == normalize_whitespace(expected_query)
+def test_set_favorites(mock_cursor, mocker):
+    """Test marking many movies as favorite with chunked UPDATEs."""
+    mocker.patch("movie_collection.models.movie_model.SQL_IN_CHUNK_SIZE", 2)
+    mock_cursor.fetchall.side_effect = [[("Movie 1", 1)], [("Movie 3", 1)]]
+
+    result = set_favorites(["Movie 1", "Movie 2", "Movie 3"], True)
+
+    assert result == {'updated': ["Movie 1", "Movie 3"], 'not_found': ["Movie 2"]}
+    assert mock_cursor.execute.call_count == 2, "One UPDATE should run per chunk."
+    expected_query = "UPDATE movies SET favorite = TRUE WHERE name IN (?, ?) RETURNING name, favorite"
+    assert normalize_whitespace(mock_cursor.execute.call_args_list[0][0][0]) == expected_query
+
+def test_set_favorite_clear_by_id(mock_cursor):
+    """Test clearing the favorite status of a movie by ID."""
+    mock_cursor.rowcount = 1
+
+    set_favorite(7, False)
+
+    expected_query = "UPDATE movies SET favorite = FALSE WHERE id = ?"
+    assert normalize_whitespace(mock_cursor.execute.call_args[0][0]) == expected_query
+    assert mock_cursor.execute.call_args[0][1] == (7,)
+
+def test_set_favorite_movie_not_found(mock_cursor):
+    """Test clearing the favorite status of a movie that does not exist."""
+    mock_cursor.rowcount = 0
+
+    with pytest.raises(ValueError, match="Movie with ID 7 not found."):
+        set_favorite(7, False)
+
+def test_toggle_favorite(mock_cursor):
+    """Test toggling the favorite status of a movie in one statement."""
+    mock_cursor.fetchone.return_value = (1,)
+
+    assert toggle_favorite("Test Movie") is True
+
+    expected_query = "UPDATE movies SET favorite = NOT favorite WHERE name = ? RETURNING favorite"
+    assert normalize_whitespace(mock_cursor.execute.call_args[0][0]) == expected_query
+
+def test_toggle_favorite_movie_not_found(mock_cursor):
+    """Test toggling the favorite status of a movie that does not exist."""
+    mock_cursor.fetchone.return_value = None
+
+    with pytest.raises(ValueError, match="Movie with name 'Nonexistent Movie' not found."):
+        toggle_favorite("Nonexistent Movie")
+
+def test_toggle_favorites(mock_cursor):
+    """Test toggling many movies by ID and name, with one UPDATE per key type."""
+    mock_cursor.fetchall.side_effect = [[(1, 0), (2, 1)], [("Movie 3", 1)]]
+
+    result = toggle_favorites([1, 2, "Movie 3", "Movie 4"])
+
+    assert result == {'favorite': [2, "Movie 3"], 'not_favorite': [1], 'not_found': ["Movie 4"]}
+    expected_query = "UPDATE movies SET favorite = NOT favorite WHERE id IN (?, ?) RETURNING id, favorite"
+    assert normalize_whitespace(mock_cursor.execute.call_args_list[0][0][0]) == expected_query
 
 def test_list_favorite_movies(mock_cursor):
     """Test retrieving all favorite movies."""
@@ -543,6 +793,37 @@ def test_list_favorite_movies(mock_cursor):
     assert favorite_movies == ["Test Movie 1", "Test Movie 2"]
 
 
+def test_list_favorite_movies_cached(movies_db, mocker):
+    """Test that favorites are served from memory until this or another process writes."""
+    add_movie_to_list("Movie Title", 2022, "Director Name", ["Drama"], "en", favorite=True)
+    query = mocker.spy(movie_model, "_query_favorite_movies")
+
+    assert list_favorite_movies() == ["Movie Title"]
+    assert list_favorite_movies() == ["Movie Title"]
+    assert query.call_count == 1
+
+    set_favorite("Movie Title", False)
+    assert list_favorite_movies() == []
+
+    # A write by another process is seen through the catalog version
+    with sqlite3.connect(movies_db) as conn:
+        conn.execute("UPDATE movies SET favorite = TRUE")
+    assert list_favorite_movies() == ["Movie Title"]
+    assert query.call_count == 3
+
+def test_list_favorite_movies_bounded_staleness(movies_db, mocker):
+    """Test that the catalog version is not checked while entries are younger than the staleness bound."""
+    mocker.patch.object(movie_model._favorites_cache, "max_staleness", 60)
+    assert list_favorite_movies() == []
+    with sqlite3.connect(movies_db) as conn:
+        conn.execute("""
+            INSERT INTO movies (name, year, director, genres, original_language, favorite)
+            VALUES ('Movie Title', 2022, 'Director Name', 'Drama', 'en', TRUE)
+        """)
+    assert list_favorite_movies() == [], "Writes by other processes may be seen late."
+    add_movie_to_list("Other Title", 2022, "Director Name", ["Drama"], "en", favorite=True)
+    assert list_favorite_movies() == ["Movie Title", "Other Title"], "Writes by this process are seen at once."
+
 def test_list_favorite_movies_empty(mock_cursor):
     """Test retrieving favorite movies when no favorites exist."""
     # Simulate no favorite movies in the database
@@ -554,3 +835,42 @@ def test_list_favorite_movies_empty(mock_cursor):
     # Verify the result
     assert favorite_movies == []
 
+
+##########################################################
+# TMDB Outage Fallback Tests
+##########################################################
+
+def test_search_falls_back_to_catalog_when_tmdb_unavailable(movies_db, mocker):
+    """Test that searches serve a matching catalog movie, marked stale, while TMDB is unavailable."""
+    add_movie_to_list("The 100% Movie", 2010, "Jane Doe", ["Drama", "Science Fiction"], "fr", favorite=True)
+    def unavailable(path, params):
+        raise TMDBUnavailableError("Circuit tmdb is open")
+    fake_async_tmdb(mocker, unavailable)
+
+    movie = asyncio.run(afind_movie_by_name("100%"))
+    assert movie.stale and movie.favorite
+    assert movie.genres == ["Drama", "Science Fiction"]
+    assert asyncio.run(afind_movie_by_year(2010)).name == "The 100% Movie"
+    assert asyncio.run(afind_movie_by_language("fr")).stale
+    assert asyncio.run(afind_movie_by_director("jane  doe")).stale
+
+    with pytest.raises(TMDBUnavailableError):
+        asyncio.run(afind_movie_by_name("10_%"))
+    with pytest.raises(TMDBUnavailableError):
+        asyncio.run(afind_movie_by_year(2011))
+
+def test_search_by_genre_falls_back_with_expired_genres(movies_db, mocker):
+    """Test that the genre fallback resolves the genre name from an expired genres cache."""
+    add_movie_to_list("Movie Title", 2010, "Jane Doe", ["Science Fiction", "Drama"], "en")
+    mocker.patch.object(movie_model._genres_cache, "ttl", -1)
+    movie_model._genres_cache.set('genres', {878: "Science Fiction", 99: "Documentary"})
+    mocker.patch("movie_collection.models.movie_model.tmdb_get", side_effect=TMDBUnavailableError("TMDB answered 502"))
+    def unavailable(path, params):
+        raise TMDBUnavailableError("TMDB answered 502")
+    fake_async_tmdb(mocker, unavailable)
+
+    assert movie_model.get_genres() == {878: "Science Fiction", 99: "Documentary"}
+    assert asyncio.run(movie_model.aget_genres()) == {878: "Science Fiction", 99: "Documentary"}
+    assert asyncio.run(afind_movie_by_genre(878)).name == "Movie Title"
+    with pytest.raises(TMDBUnavailableError):
+        asyncio.run(afind_movie_by_genre(99))
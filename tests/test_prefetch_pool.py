@@ -0,0 +1,121 @@
+import pytest
+
+from movie_collection.utils import prefetch_pool
+from movie_collection.utils.prefetch_pool import PrefetchPool
+
+
+class FakeClock:
+    """Stands in for time.monotonic, advanced by hand."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(mocker):
+    clock = FakeClock()
+    mocker.patch.object(prefetch_pool.time, "monotonic", clock)
+    return clock
+
+def make_pool(size=4, low_water=1, max_keys=2, **kwargs):
+    """Create a pool whose items are numbered per key, recording every fetch."""
+    fetches = []
+
+    def fetch(key, count):
+        fetches.append((key, count))
+        return [(i, f"{key}-{i}") for i in range(count)]
+
+    return PrefetchPool(fetch, size=size, low_water=low_water, max_keys=max_keys, **kwargs), fetches
+
+def test_draw_miss_registers_key():
+    """Test that a draw for an unknown key misses and registers the key for the next refill."""
+    pool, fetches = make_pool()
+    assert pool.draw("2020") is None
+    pool.refill()
+    assert fetches == [("2020", 4)]
+    assert pool.draw("2020") == "2020-0"
+    assert pool.stats()['hits'] == 1 and pool.stats()['misses'] == 1
+
+def test_refill_on_low_water():
+    """Test that only keys at or below the low-water mark are topped up to the pool size."""
+    pool, fetches = make_pool()
+    pool.register("2020")
+    pool.register("2021")
+    pool.refill()
+    for _ in range(3):
+        pool.draw("2020")
+    fetches.clear()
+    pool.refill()
+    assert fetches == [("2020", 3)]
+    assert pool.stats()['keys'] == {"2020": 4, "2021": 4}
+
+def test_max_keys():
+    """Test that no more than max_keys keys are kept warm, and registered keys are never evicted."""
+    pool, _ = make_pool(max_keys=1)
+    pool.register("2020")
+    pool.register("2021")
+    pool.draw("2022")
+    assert list(pool.stats()['keys']) == ["2020"]
+
+def test_least_recently_drawn_key_makes_room():
+    """Test that a new key evicts the least recently drawn key that was added by a draw."""
+    pool, _ = make_pool(max_keys=3)
+    pool.register("pinned")
+    pool.draw("2020")
+    pool.draw("2021")
+    pool.draw("2020")
+    pool.draw("2022")
+    assert sorted(pool.stats()['keys']) == ["2020", "2022", "pinned"]
+    assert pool.stats()['evicted'] == 1
+
+def test_idle_keys_dropped(clock):
+    """Test that keys added by a draw are dropped once idle, registered keys are kept."""
+    pool, _ = make_pool(max_keys=3, idle_seconds=60)
+    pool.register("pinned")
+    pool.draw("2020")
+    pool.draw("2021")
+    clock.now += 30
+    pool.draw("2021")
+    clock.now += 31
+    pool.refill()
+    assert sorted(pool.stats()['keys']) == ["2021", "pinned"]
+
+def test_empty_refills_back_off(clock):
+    """Test that a key whose refills bring nothing is retried after a doubling interval."""
+    fetches = []
+
+    def fetch(key, count):
+        fetches.append(key)
+        return []
+
+    pool = PrefetchPool(fetch, size=4, low_water=1, refill_interval=30, max_backoff=100)
+    pool.register("1800")
+    pool.refill()
+    pool.refill()
+    assert fetches == ["1800"], "The key should not be fetched again right away."
+    clock.now += 60
+    pool.refill()
+    assert len(fetches) == 2
+    clock.now += 100
+    pool.refill()
+    clock.now += 99
+    pool.refill()
+    assert len(fetches) == 3, "The wait should be capped at max_backoff."
+
+def test_refill_skips_duplicates():
+    """Test that an item already pooled for a key is not pooled again."""
+    batches = iter([[(1, "a"), (2, "b"), (1, "a")], [(2, "b"), (3, "c")]])
+    pool = PrefetchPool(lambda key, count: next(batches), size=4, low_water=3)
+    pool.register("2020")
+    pool.refill()
+    pool.refill()
+    assert [pool.draw("2020") for _ in range(4)] == ["a", "b", "c", None]
+
+def test_disabled_pool():
+    """Test that a pool of size 0 never serves or registers anything."""
+    pool, _ = make_pool(size=0)
+    assert pool.draw("2020") is None
+    assert pool.stats()['keys'] == {}
@@ -0,0 +1,50 @@
+import pytest
+
+from movie_collection.utils import rate_limiter
+from movie_collection.utils.rate_limiter import SlidingWindowLimiter
+
+@pytest.fixture
+def clock(mocker):
+    """Replace the monotonic clock used by the limiter with a controllable one."""
+    now = [1000.0]
+    mocker.patch.object(rate_limiter.time, "monotonic", side_effect=lambda: now[0])
+    return now
+
+def test_hit_within_limit(clock):
+    """Test that attempts up to the limit are allowed."""
+    limiter = SlidingWindowLimiter(limit=3, window_seconds=60)
+    assert [limiter.hit("testuser") for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert limiter.stats()['allowed'] == 3
+
+def test_hit_over_limit(clock):
+    """Test that attempts over the limit are rejected with the time left in the window."""
+    limiter = SlidingWindowLimiter(limit=2, window_seconds=60)
+    limiter.hit("testuser")
+    clock[0] += 10
+    limiter.hit("testuser")
+    assert limiter.hit("testuser") == pytest.approx(50.0)
+    assert limiter.hit("otheruser") == 0.0, "Other keys should not be affected."
+    assert limiter.stats()['rejected'] == 1
+
+def test_hit_window_slides(clock):
+    """Test that an attempt is allowed again once the oldest hit leaves the window."""
+    limiter = SlidingWindowLimiter(limit=2, window_seconds=60)
+    limiter.hit("testuser")
+    clock[0] += 30
+    limiter.hit("testuser")
+    clock[0] += 31
+    assert limiter.hit("testuser") == 0.0
+    assert limiter.hit("testuser") > 0
+
+def test_idle_keys_evicted(clock):
+    """Test that keys idle for a whole window are evicted."""
+    limiter = SlidingWindowLimiter(limit=2, window_seconds=60, evict_interval=30)
+    limiter.hit("testuser")
+    clock[0] += 61
+    limiter.hit("otheruser")
+    assert limiter.stats()['tracked_keys'] == 1
+
+def test_invalid_limit():
+    """Test that a non-positive limit is rejected."""
+    with pytest.raises(ValueError, match="Limit must be a positive integer, got 0"):
+        SlidingWindowLimiter(limit=0, window_seconds=60)
@@ -0,0 +1,85 @@
+import json
+
+import pytest
+
+from movie_collection.utils.readiness import ReadinessMonitor
+from movie_collection.utils import sql_utils
+
+
+def failing_check():
+    raise Exception("down")
+
+
+def test_not_ready_before_first_check():
+    """Test that probes fail until the first round of checks has finished."""
+    monitor = ReadinessMonitor({'db': lambda: None})
+
+    ready, body = monitor.status()
+
+    assert not ready
+    assert json.loads(body) == {'status': 'starting'}
+
+
+def test_critical_check_decides_readiness():
+    """Test that only failing critical checks make the service not ready."""
+    monitor = ReadinessMonitor({'db': lambda: {'size': 5}, 'tmdb': failing_check}, critical={'db'})
+    monitor.run_checks()
+    ready, body = monitor.status()
+    report = json.loads(body)
+
+    assert ready
+    assert report['checks']['db']['ok'] and report['checks']['db']['size'] == 5
+    assert report['checks']['tmdb'] == {
+        'ok': False, 'error': 'down', 'critical': False, 'duration_ms': report['checks']['tmdb']['duration_ms']
+    }
+
+    monitor.critical.add('tmdb')
+    monitor.run_checks()
+    assert monitor.status()[0] is False
+
+
+def test_stale_result_is_not_ready(mocker):
+    """Test that a result older than max_age no longer counts, e.g. if the thread died."""
+    clock = mocker.patch("movie_collection.utils.readiness.time.monotonic", return_value=100.0)
+    monitor = ReadinessMonitor({'db': lambda: None}, interval=1.0)
+    monitor.run_checks()
+    assert monitor.status()[0]
+
+    clock.return_value = 104.0
+    ready, body = monitor.status()
+
+    assert not ready
+    assert json.loads(body) == {'status': 'stale', 'age_seconds': 4.0}
+
+
+def test_ready_route_serves_cached_status(mocker):
+    """Test that /api/ready answers 503 with the cached body when not ready."""
+    import app
+
+    mocker.patch.object(app.readiness_monitor, "status", return_value=(False, b'{"status": "not ready"}'))
+
+    response = app.create_app({'TESTING': True}).test_client().get('/api/ready')
+
+    assert response.status_code == 503
+    assert response.get_json() == {'status': 'not ready'}
+
+
+def test_check_table_exists_binds_name(tmp_path, mocker):
+    """Test that table names are looked up as parameters, never formatted into SQL."""
+    mocker.patch.object(sql_utils, "MOVIES_DATABASE_URL", f"sqlite:///{tmp_path / 'movies.db'}")
+    with sql_utils.get_db_connection() as conn:
+        conn.execute("CREATE TABLE movies (id INTEGER PRIMARY KEY)")
+        conn.commit()
+
+    sql_utils.check_table_exists("movies")
+    with pytest.raises(Exception, match="no such table: movies; DROP TABLE movies"):
+        sql_utils.check_table_exists("movies; DROP TABLE movies")
+    sql_utils.check_table_exists("movies")
+
+
+def test_check_pool_capacity_saturated(mocker):
+    """Test that a pool with every connection checked out fails the check."""
+    mocker.patch.object(sql_utils, "get_pool_status", return_value={'size': 5, 'checked_out': 15, 'capacity': 15})
+
+    with pytest.raises(Exception, match="saturated: 15 of 15"):
+        sql_utils.check_pool_capacity()
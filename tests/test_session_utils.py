@@ -0,0 +1,120 @@
+import asyncio
+import threading
+
+import pytest
+from flask import Flask, jsonify
+
+from movie_collection.utils import session_utils
+from movie_collection.utils.session_utils import (
+    averify_session_token,
+    issue_session_token,
+    login_required,
+    revoke_session_token,
+    verify_session_token
+)
+
+@pytest.fixture
+def app():
+    """Create a Flask application with a single protected route."""
+    app = Flask(__name__)
+    app.config['TESTING'] = True
+
+    @app.route('/protected')
+    @login_required
+    def protected():
+        from flask import g
+        return jsonify({'username': g.username})
+
+    return app
+
+##########################################################
+# Token Verification
+##########################################################
+
+def test_verify_session_token():
+    """Test that an issued token verifies back to its username."""
+    token = issue_session_token("testuser")
+    assert verify_session_token(token) == "testuser"
+
+def test_verify_session_token_tampered():
+    """Test that a token with a modified payload is rejected."""
+    token = issue_session_token("testuser")
+    _, signature = token.split(".")
+    forged = issue_session_token("admin").split(".")[0] + "." + signature
+    with pytest.raises(ValueError, match="Invalid session token"):
+        verify_session_token(forged)
+    with pytest.raises(ValueError, match="Invalid session token"):
+        verify_session_token("not-a-token")
+
+def test_verify_session_token_expired(mocker):
+    """Test that an expired token is rejected."""
+    mocker.patch.object(session_utils, "SESSION_TTL_SECONDS", -1)
+    token = issue_session_token("testuser")
+    with pytest.raises(ValueError, match="Session token has expired"):
+        verify_session_token(token)
+
+def test_revoke_session_token():
+    """Test that a revoked token is rejected while other tokens still verify."""
+    token = issue_session_token("testuser")
+    other = issue_session_token("testuser")
+    revoke_session_token(token)
+    with pytest.raises(ValueError, match="Session token has been revoked"):
+        verify_session_token(token)
+    assert verify_session_token(other) == "testuser"
+
+def test_verify_session_token_generation():
+    """Test that tokens from another session generation, or of a user that no longer exists, are rejected."""
+    generations = {"testuser": 2}
+    token = issue_session_token("testuser", 2)
+    assert verify_session_token(token, generations.get) == "testuser"
+
+    generations["testuser"] = 3
+    with pytest.raises(ValueError, match="Session token has been revoked"):
+        verify_session_token(token, generations.get)
+    del generations["testuser"]
+    with pytest.raises(ValueError, match="Session token has been revoked"):
+        verify_session_token(token, generations.get)
+
+def test_averify_session_token_looks_up_generation_off_the_loop():
+    """Test that the async check runs the generation lookup on the database threads, not on the event loop."""
+    lookup_threads = []
+
+    def get_generation(username):
+        lookup_threads.append(threading.current_thread())
+        return {"testuser": 2}.get(username)
+
+    async def verify(token):
+        return threading.current_thread(), await averify_session_token(token, get_generation)
+
+    loop_thread, username = asyncio.run(verify(issue_session_token("testuser", 2)))
+    assert username == "testuser"
+    assert lookup_threads and lookup_threads[0] is not loop_thread
+    with pytest.raises(ValueError, match="Session token has been revoked"):
+        asyncio.run(verify(issue_session_token("testuser", 1)))
+
+def test_login_required_checks_generation(app):
+    """Test that login_required checks tokens against the generation lookup of the application."""
+    app.extensions['session_generations'] = {"testuser": 1}.get
+    client = app.test_client()
+
+    current = issue_session_token("testuser", 1)
+    ended = issue_session_token("testuser", 0)
+    assert client.get('/protected', headers={'Authorization': f'Bearer {current}'}).status_code == 200
+    assert client.get('/protected', headers={'Authorization': f'Bearer {ended}'}).status_code == 401
+
+##########################################################
+# login_required
+##########################################################
+
+def test_login_required_valid_token(app):
+    """Test that a protected route accepts a valid bearer token."""
+    token = issue_session_token("testuser")
+    response = app.test_client().get('/protected', headers={'Authorization': f'Bearer {token}'})
+    assert response.status_code == 200
+    assert response.get_json() == {'username': 'testuser'}
+
+def test_login_required_missing_token(app):
+    """Test that a protected route rejects requests without a token."""
+    response = app.test_client().get('/protected')
+    assert response.status_code == 401
+    assert response.get_json() == {'error': 'Invalid session token'}
@@ -0,0 +1,73 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import threading
+
+import pytest
+
+from movie_collection.utils.single_flight import SingleFlight
+
+
+def test_concurrent_calls_share_one_call():
+    """Test that threads asking for the same key while it is in flight share its result."""
+    flight = SingleFlight()
+    release = threading.Event()
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        release.wait(5)
+        return {'results': [1, 2]}
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        futures = [pool.submit(flight.do, "key", fetch) for _ in range(8)]
+        while flight.shared < 7:
+            pass
+        release.set()
+        results = [future.result() for future in futures]
+
+    assert len(calls) == 1
+    assert all(result is results[0] for result in results)
+    assert flight.stats() == {'calls': 1, 'shared': 7, 'in_flight': 0}
+
+
+def test_exception_reaches_every_waiter_and_is_not_kept():
+    """Test that a failed call fails its waiters, and the next call runs afresh."""
+    flight = SingleFlight()
+    release = threading.Event()
+
+    def failing():
+        release.wait(5)
+        raise ValueError("upstream down")
+
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        futures = [pool.submit(flight.do, "key", failing) for _ in range(3)]
+        while flight.shared < 2:
+            pass
+        release.set()
+        for future in futures:
+            with pytest.raises(ValueError, match="upstream down"):
+                future.result()
+
+    assert flight.do("key", lambda: "recovered") == "recovered"
+
+
+def test_async_calls_share_one_task():
+    """Test that coroutines awaiting the same key share one task, even if one is cancelled."""
+    flight = SingleFlight()
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return "result"
+
+    async def main():
+        first = asyncio.ensure_future(flight.ado("key", fetch))
+        others = [asyncio.ensure_future(flight.ado("key", fetch)) for _ in range(4)]
+        await asyncio.sleep(0)
+        first.cancel()
+        return await asyncio.gather(*others)
+
+    assert asyncio.run(main()) == ["result"] * 4
+    assert len(calls) == 1
+    assert flight.stats()['in_flight'] == 0
@@ -0,0 +1,48 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+
+# Import time of app.py, including everything it imports; override for slower machines
+STARTUP_IMPORT_BUDGET_MS = float(os.getenv("STARTUP_IMPORT_BUDGET_MS", "1500"))
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture(scope="module")
+def startup(tmp_path_factory):
+    """Import app.py in a fresh interpreter under -X importtime, from an empty directory."""
+    workdir = tmp_path_factory.mktemp("startup")
+    env = dict(os.environ, PYTHONPATH=REPO_ROOT, DB_PATH=str(workdir / "movies.db"))
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import sys, app; print(' '.join(sys.modules))"],
+        cwd=workdir, env=env, capture_output=True, text=True, check=True
+    )
+
+    # Lines look like "import time:       self [us] |  cumulative [us] | module"
+    cumulative_us = {}
+    for line in result.stderr.splitlines():
+        fields = line[len("import time:"):].split("|")
+        if line.startswith("import time:") and len(fields) == 3 and fields[1].strip().isdigit():
+            cumulative_us[fields[2].strip()] = int(fields[1])
+
+    return {
+        'workdir': workdir,
+        'modules': set(result.stdout.split()),
+        'import_ms': cumulative_us['app'] / 1000
+    }
+
+
+def test_import_time_within_budget(startup):
+    """Test that importing the application stays within the startup budget."""
+    assert startup['import_ms'] < STARTUP_IMPORT_BUDGET_MS, (
+        f"Importing app took {startup['import_ms']:.0f}ms, over the {STARTUP_IMPORT_BUDGET_MS:.0f}ms budget"
+    )
+
+
+def test_import_defers_clients_and_files(startup):
+    """Test that importing the application neither loads the TMDB client library nor touches the disk."""
+    assert "requests" not in startup['modules']
+    assert list(startup['workdir'].iterdir()) == []
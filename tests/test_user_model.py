@@ -20,11 +20,13 @@ def app():
     app.config['TESTING'] = True
     
     # Import and register your routes
-    from app import create_account, login, update_password
+    from app import create_account, create_accounts, login, logout, update_password
     
     # Register the routes
     app.add_url_rule('/create-account', 'create_account', create_account, methods=['POST'])
+    app.add_url_rule('/create-accounts', 'create_accounts', create_accounts, methods=['POST'])
     app.add_url_rule('/login', 'login', login, methods=['POST'])
+    app.add_url_rule('/logout', 'logout', logout, methods=['POST'])
     app.add_url_rule('/update-password', 'update_password', update_password, methods=['POST'])
     
     return app
@@ -33,6 +35,7 @@ def app():
 def session(app):
     """Create a new database session for testing."""
     db.init_app(app)
+    Users.clear_credential_cache()
     with app.app_context():
         db.create_all()
         yield db.session
@@ -58,6 +61,60 @@ def test_create_duplicate_user(session, sample_user):
     with pytest.raises(ValueError, match="User with username 'testuser' already exists"):
         Users.create_user(**sample_user)
 
+def test_create_users(session):
+    """Test creating users in bulk with per-user results."""
+    Users.create_user("existing", "pass")
+    results = Users.create_users(
+        [("user1", "pass1"), ("existing", "pass"), ("user2", "pass2"), ("user1", "again"), ("user3", "")],
+        chunk_size=2
+    )
+    assert [result['status'] for result in results] == ['created', 'conflict', 'created', 'conflict', 'invalid']
+    assert session.query(Users).count() == 3, "Only the new, valid users should be inserted."
+    assert Users.check_password("user2", "pass2") is True
+
+def test_create_users_invalid_types(session):
+    """Test that non-string usernames and passwords are marked invalid before anything is inserted."""
+    results = Users.create_users([("user1", 123), (["user2"], "pass"), (None, "pass"), ("user3", "pass3")])
+    assert [result['status'] for result in results] == ['invalid', 'invalid', 'invalid', 'created']
+    assert session.query(Users).count() == 1
+
+def test_create_users_concurrent_conflict(session, mocker):
+    """Test that a username created by another request after the lookup becomes a conflict, not an error."""
+    from sqlalchemy.exc import IntegrityError
+
+    def racing_insert(chunk):
+        Users.create_user("user2", "theirs")
+        raise IntegrityError("INSERT INTO users", {}, Exception("UNIQUE constraint failed: users.username"))
+
+    mocker.patch.object(Users, "_insert_user_chunk", side_effect=racing_insert)
+    results = Users.create_users([("user1", "pass1"), ("user2", "pass2"), ("user3", "pass3")])
+
+    assert [result['status'] for result in results] == ['created', 'conflict', 'created']
+    assert session.query(Users).count() == 3
+    assert Users.check_password("user2", "theirs") is True
+
+def test_create_accounts_route(app, session, mocker):
+    """Test the bulk account creation route."""
+    mocker.patch("movie_collection.utils.session_utils.ADMIN_TOKEN", "secret")
+    response = app.test_client().post('/create-accounts', headers={'X-Admin-Token': 'secret'}, json={'accounts': [
+        {'username': 'user1', 'password': 'pass1'},
+        {'username': 'user1', 'password': 'pass2'}
+    ]})
+    assert response.status_code == 200
+    assert response.get_json()['created'] == 1
+    assert response.get_json()['results'][1] == {'username': 'user1', 'status': 'conflict'}
+
+def test_create_accounts_route_requires_admin_token(app, session, mocker):
+    """Test that bulk account creation is refused without the admin token, or when none is configured."""
+    accounts = {'accounts': [{'username': 'user1', 'password': 'pass1'}]}
+    client = app.test_client()
+
+    assert client.post('/create-accounts', json=accounts).status_code == 403
+    mocker.patch("movie_collection.utils.session_utils.ADMIN_TOKEN", "secret")
+    assert client.post('/create-accounts', json=accounts).status_code == 401
+    assert client.post('/create-accounts', headers={'X-Admin-Token': 'guess'}, json=accounts).status_code == 401
+    assert session.query(Users).count() == 0
+
 ##########################################################
 # User Authentication
 ##########################################################
@@ -77,6 +134,15 @@ def test_check_password_user_not_found(session):
     with pytest.raises(ValueError, match="User nonexistentuser not found"):
         Users.check_password("nonexistentuser", "password")
 
+def test_check_password_cached(session, sample_user, mocker):
+    """Test that repeated password checks are served from the credential cache."""
+    Users.create_user(**sample_user)
+    assert Users.check_password(sample_user["username"], sample_user["password"]) is True
+    execute = mocker.spy(session, "execute")
+    assert Users.check_password(sample_user["username"], sample_user["password"]) is True
+    assert Users.check_password(sample_user["username"], "wrongpassword") is False
+    assert execute.call_count == 0, "Cached checks should not query the database."
+
 ##########################################################
 # Update Password
 ##########################################################
@@ -88,7 +154,107 @@ def test_update_password(session, sample_user):
     Users.update_password(sample_user["username"], new_password)
     assert Users.check_password(sample_user["username"], new_password) is True, "Password should be updated successfully."
 
+def test_update_password_invalidates_cache(session, sample_user):
+    """Test that the old password stops working once it has been cached and then changed."""
+    Users.create_user(**sample_user)
+    assert Users.check_password(sample_user["username"], sample_user["password"]) is True
+    Users.update_password(sample_user["username"], "newpass")
+    assert Users.check_password(sample_user["username"], sample_user["password"]) is False
+    assert Users.check_password(sample_user["username"], "newpass") is True
+
 def test_update_password_user_not_found(session):
     """Test updating the password for a non-existent user."""
     with pytest.raises(ValueError, match="User nonexistentuser not found"):
-        Users.update_password("nonexistentuser", "newpass")
\ No newline at end of file
+        Users.update_password("nonexistentuser", "newpass")
+
+def test_login_returns_session_token(app, session, sample_user):
+    """Test that a successful login returns a verifiable session token."""
+    from movie_collection.utils.session_utils import verify_session_token
+
+    Users.create_user(**sample_user)
+    response = app.test_client().post('/login', json=sample_user)
+    assert response.status_code == 200
+    assert verify_session_token(response.get_json()['token']) == sample_user["username"]
+
+def test_sessions_end_in_every_worker(app, session, sample_user, mocker):
+    """Test that logout and password changes end every session, beyond this worker's revocation list."""
+    from movie_collection.utils import session_utils
+
+    mocker.patch.dict(session_utils._revoked_tokens, clear=True)
+    Users.create_user(**sample_user)
+    client = app.test_client()
+
+    def login():
+        return client.post('/login', json=sample_user).get_json()['token']
+
+    def verify(token):
+        return session_utils.verify_session_token(token, Users.get_session_generation)
+
+    token, other = login(), login()
+    assert client.post('/logout', headers={'Authorization': f'Bearer {token}'}).status_code == 200
+    # As seen by another worker, which never saw the logout
+    session_utils._revoked_tokens.clear()
+    Users.clear_credential_cache()
+    for ended in (token, other):
+        with pytest.raises(ValueError, match="Session token has been revoked"):
+            verify(ended)
+
+    token = login()
+    assert verify(token) == sample_user["username"]
+    Users.update_password(sample_user["username"], "newpass")
+    with pytest.raises(ValueError, match="Session token has been revoked"):
+        verify(token)
+
+def test_upgrade_schema_adds_session_generation(app):
+    """Test that a users table created before session generations gets the column, defaulting to 0."""
+    from sqlalchemy import text
+
+    db.init_app(app)
+    with app.app_context():
+        with db.engine.begin() as conn:
+            conn.execute(text("DROP TABLE IF EXISTS users"))
+            conn.execute(text("CREATE TABLE users (id INTEGER PRIMARY KEY, username VARCHAR(80) UNIQUE NOT NULL, "
+                              "salt VARCHAR(32) NOT NULL, password VARCHAR(64) NOT NULL)"))
+            conn.execute(text("INSERT INTO users (username, salt, password) VALUES ('old', 'salt', 'hash')"))
+        try:
+            Users.upgrade_schema()
+            Users.upgrade_schema()
+            assert Users.get_session_generation("old") == 0
+        finally:
+            Users.clear_credential_cache()
+            db.session.remove()
+            db.drop_all()
+
+def test_login_throttled(app, session, sample_user, mocker):
+    """Test that failed login attempts over the per-user limit block the next ones before checking the password."""
+    from app import login_user_limiter
+
+    mocker.patch.object(login_user_limiter, "limit", 1)
+    login_user_limiter.reset(sample_user["username"])
+    check_password = mocker.spy(Users, "check_password")
+    Users.create_user(**sample_user)
+
+    client = app.test_client()
+    assert client.post('/login', json=sample_user).status_code == 200
+    assert client.post('/login', json=sample_user).status_code == 200, "Successful logins should not add up."
+    wrong = {'username': sample_user["username"], 'password': "wrongpassword"}
+    assert client.post('/login', json=wrong).status_code == 401
+    response = client.post('/login', json=sample_user)
+    assert response.status_code == 429
+    assert 'Retry-After' in response.headers
+    assert check_password.call_count == 3, "Throttled attempts should not check the password."
+    login_user_limiter.reset(sample_user["username"])
+
+def test_login_throttled_per_forwarded_ip(mocker):
+    """Test that behind trusted proxies the per-IP limit applies to the client named in X-Forwarded-For."""
+    import app as app_module
+
+    mocker.patch.object(app_module, "TRUSTED_PROXY_COUNT", 1)
+    hit = mocker.spy(app_module.login_ip_limiter, "hit")
+    mocker.patch.object(Users, "check_password", return_value=False)
+
+    client = app_module.create_app().test_client()
+    response = client.post('/login', json={'username': "someone", 'password': "pass"},
+                           headers={'X-Forwarded-For': "203.0.113.7"})
+    assert response.status_code == 401
+    hit.assert_called_once_with("203.0.113.7")